@@ -1,23 +1,42 @@
 """CLI entrypoint for the data-fetcher package."""
 
+import asyncio
 import logging
+import queue
 import sys
+import threading
 import time as time_module
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import typer
 
 from data_fetcher.providers.binance_archive import (
     BINANCE_SPOT_ARCHIVE_START,
+    DEFAULT_DECODE_WORKERS,
+    DEFAULT_DOWNLOAD_WORKERS,
+    ArchiveHTTPClient,
+    ArchiveIngestResult,
+    create_decode_pool,
     ingest_binance_archives,
     parse_date_bound,
 )
+from data_fetcher.models import Gap, SourceEstimate, SymbolListing
+from data_fetcher.planner import plan_sync
 from data_fetcher.providers.crypto import (
+    AsyncCryptoDataFetcher,
     CryptoDataFetcher,
     DEFAULT_EXCHANGE,
+    RateLimiter,
+    plan_gap_windows,
+    probe_earliest_timestamps,
+    resolve_listings,
 )
-from data_fetcher.storage.sqlite import SQLiteStore
+from data_fetcher.storage.sqlite import TIMEFRAME_MS, SQLiteStore, can_derive
 
 logger = logging.getLogger(__name__)
 
@@ -160,10 +179,15 @@ def symbols(
         "--format",
         help="Output format: table or symbols",
     ),
+    refresh_markets: bool = typer.Option(
+        False,
+        "--refresh-markets",
+        help="Download exchange market metadata instead of using the local cache",
+    ),
 ) -> None:
     """List available symbols from an exchange."""
     try:
-        fetcher = CryptoDataFetcher(exchange_id=exchange)
+        fetcher = CryptoDataFetcher(exchange_id=exchange, refresh_markets=refresh_markets)
         results = fetcher.get_symbols(
             quote=quote,
             active_only=active_only,
@@ -261,10 +285,36 @@ def start_dates(
         "-n",
         help="Maximum number of symbols to check when discovering (0 = unlimited)",
     ),
+    use_async: bool = typer.Option(
+        False,
+        "--async",
+        help="Probe symbols concurrently with ccxt.async_support",
+    ),
+    workers: int = typer.Option(
+        8,
+        "--workers",
+        help="Symbols probed concurrently (requests in flight with --async)",
+    ),
+    db_path: Optional[str] = typer.Option(
+        None,
+        "--db-path",
+        "-d",
+        help="SQLite database whose listing catalog caches probe results",
+    ),
+    refresh_listings: bool = typer.Option(
+        False,
+        "--refresh-listings",
+        help="Probe again even when the listing catalog has an entry",
+    ),
+    refresh_markets: bool = typer.Option(
+        False,
+        "--refresh-markets",
+        help="Download exchange market metadata instead of using the local cache",
+    ),
 ) -> None:
     """Show earliest available OHLCV start dates for symbols."""
     try:
-        fetcher = CryptoDataFetcher(exchange_id=exchange)
+        fetcher = CryptoDataFetcher(exchange_id=exchange, refresh_markets=refresh_markets)
     except Exception as e:
         typer.echo(f"Error loading exchange {exchange}: {e}", err=True)
         raise typer.Exit(code=1)
@@ -290,12 +340,52 @@ def start_dates(
     print(header)
     print("-" * len(header))
 
+    def probe(batch: List[str]) -> Dict[str, Tuple[Optional[int], str]]:
+        if use_async:
+            return asyncio.run(
+                _probe_earliest_async(
+                    exchange, batch, timeframe, max_concurrency=workers, refresh_markets=refresh_markets
+                )
+            )
+        return probe_earliest_timestamps(
+            exchange, batch, timeframe, workers=workers, fetcher=fetcher
+        )
+
+    if db_path is None:
+        earliest = probe(symbol_list)
+    else:
+        listings = resolve_listings(
+            SQLiteStore(db_path),
+            exchange,
+            symbol_list,
+            timeframe,
+            refresh=refresh_listings,
+            probe=probe,
+        )
+        earliest = {sym: (item.earliest_ms, item.method) for sym, item in listings.items()}
+
     for sym in symbol_list:
-        ts, method = fetcher.fetch_earliest_timestamp(sym, timeframe)
+        ts, method = earliest[sym]
         start = fetcher.exchange.iso8601(ts) if ts is not None else "N/A"
         print(f"{exchange:<12} {sym:<20} {timeframe:<10} {start:<25} {method:<14}")
 
 
+async def _probe_earliest_async(
+    exchange: str,
+    symbol_list: List[str],
+    timeframe: str,
+    max_concurrency: int,
+    refresh_markets: bool = False,
+) -> Dict[str, Tuple[Optional[int], str]]:
+    async with AsyncCryptoDataFetcher(
+        exchange, max_concurrency=max_concurrency, refresh_markets=refresh_markets
+    ) as fetcher:
+        results = await asyncio.gather(
+            *(fetcher.fetch_earliest_timestamp(sym, timeframe) for sym in symbol_list)
+        )
+    return dict(zip(symbol_list, results))
+
+
 @app.command()
 def fetch(
     exchange: str = typer.Option(DEFAULT_EXCHANGE, "--exchange", "-e", help="CCXT exchange ID"),
@@ -311,11 +401,36 @@ def fetch(
     limit_symbols: int = typer.Option(0, "--limit-symbols", "-n", help="Max symbols to fetch (0 = unlimited)"),
     max_requests_per_symbol: Optional[int] = typer.Option(None, "--max-requests-per-symbol", help="Max API requests per symbol"),
     sleep_seconds: float = typer.Option(0.12, "--sleep-seconds", help="Seconds to wait between API requests"),
-    workers: int = typer.Option(1, "--workers", help="Number of concurrent workers (reserved for future use)"),
-    fail_fast: bool = typer.Option(False, "--fail-fast", help="Stop on first error (reserved for future use)"),
+    workers: int = typer.Option(1, "--workers", help="Number of symbols fetched concurrently"),
+    fail_fast: bool = typer.Option(False, "--fail-fast", help="Stop on the first symbol that errors"),
+    use_async: bool = typer.Option(
+        False,
+        "--async",
+        help="Fetch with ccxt.async_support; --workers bounds requests in flight",
+    ),
+    commit_every: int = typer.Option(
+        1,
+        "--commit-every",
+        help="Insert and commit fetched candles every N pages",
+    ),
+    refresh_markets: bool = typer.Option(
+        False,
+        "--refresh-markets",
+        help="Download exchange market metadata instead of using the local cache",
+    ),
+    bulk_load: bool = typer.Option(
+        False,
+        "--bulk-load",
+        help="On databases not yet migrated, stage inserts and rebuild secondary indexes once at the end",
+    ),
+    integer_encoding: bool = typer.Option(
+        False,
+        "--integer-encoding",
+        help="Store new series as integers scaled by their price/amount precision (smaller database)",
+    ),
 ) -> None:
     """Fetch OHLCV data for one or more symbols into a SQLite database."""
-    store = SQLiteStore(db_path)
+    store = SQLiteStore(db_path, integer_encoding=integer_encoding)
 
     symbol_list: List[str] = []
     if symbols:
@@ -327,9 +442,9 @@ def fetch(
                 if line and not line.startswith("#"):
                     symbol_list.append(line)
 
+    fetcher = CryptoDataFetcher(exchange_id=exchange, refresh_markets=refresh_markets)
     if not symbol_list:
         typer.echo("No symbols specified, discovering from exchange...")
-        fetcher = CryptoDataFetcher(exchange_id=exchange)
         discovered = fetcher.get_symbols(quote=quote, active_only=True, spot_only=True)
         symbol_list = [r["symbol"] for r in discovered]
         if limit_symbols > 0:
@@ -338,8 +453,9 @@ def fetch(
     if not symbol_list:
         typer.echo("No symbols to fetch.")
         raise typer.Exit(code=0)
+    if integer_encoding:
+        _register_market_precision(store, fetcher, exchange, symbol_list)
 
-    fetcher = CryptoDataFetcher(exchange_id=exchange)
     now_ms = int(time_module.time() * 1000)
 
     since_ms: Optional[int] = None
@@ -360,70 +476,461 @@ def fetch(
         parsed = fetcher.exchange.parse8601(f"{until}T00:00:00Z")
         until_ms = int(parsed) if parsed is not None else None
 
+    workers = max(1, workers)
     typer.echo(f"Fetching {len(symbol_list)} symbols on {exchange} [{timeframe}]")
+    if workers > 1:
+        typer.echo(f"Using {workers} workers")
 
-    for i, sym in enumerate(symbol_list):
-        typer.echo(f"\n[{i+1}/{len(symbol_list)}] {sym}")
+    writer = _FetchWriter(
+        store, fetcher, exchange, timeframe, total=len(symbol_list), fail_fast=fail_fast
+    )
+    listings = store.get_listings(exchange, timeframe, symbol_list) if since_ms is None else {}
 
+    # Store reads happen here, before any worker starts, and --overwrite
+    # deletes run in the writer, so the main thread stays the only SQLite
+    # writer.
+    jobs = []
+    for sym in symbol_list:
+        lines: List[str] = []
         local_max_ms = store.get_max_timestamp(exchange, sym, timeframe)
 
         if overwrite and local_max_ms is not None:
-            deleted = store.delete_for_key(exchange, sym, timeframe)
-            typer.echo(f"  Deleted {deleted} existing rows (--overwrite)")
+            writer.overwrite(sym)
             local_max_ms = None
 
         effective_since = since_ms
         if resume and local_max_ms is not None:
             effective_since = local_max_ms + 1
-            typer.echo(f"  Resuming from timestamp {effective_since}")
+            lines.append(f"  Resuming from timestamp {effective_since}")
+
+        listing = listings.get(sym)
+        if effective_since is None and listing is not None:
+            if listing.earliest_ms is None:
+                lines.append("  Could not determine earliest timestamp (cached), skipping.")
+                writer.report(_SymbolOutcome(symbol=sym, lines=lines, skipped=True))
+                continue
+            effective_since = listing.earliest_ms
+            lines.append(f"  Earliest data: {effective_since} ({listing.method}, cached)")
+
+        jobs.append((sym, effective_since, lines))
+
+    fetch_kwargs = dict(
+        timeframe=timeframe,
+        until_ms=until_ms,
+        max_requests=max_requests_per_symbol,
+        sleep_seconds=sleep_seconds,
+        commit_every=max(1, commit_every),
+    )
+    with store.bulk_load(drop_indexes=True) if bulk_load else nullcontext():
+        if use_async:
+            _run_jobs_async(writer, exchange, jobs, workers, fetch_kwargs, refresh_markets=refresh_markets)
+        elif workers == 1:
+            for i, (sym, effective_since, lines) in enumerate(jobs):
+                # Sleep between symbols (per-request pacing is handled inside fetch_ohlcv)
+                if i > 0 and sleep_seconds > 0:
+                    time_module.sleep(sleep_seconds)
+                outcome = _run_symbol_job(
+                    fetcher, sym, effective_since, lines, writer.write_pages, **fetch_kwargs
+                )
+                writer.report(outcome)
+                if writer.failed:
+                    break
+        else:
+            _run_jobs_threaded(writer, fetcher, exchange, jobs, workers, fetch_kwargs)
+
+    if writer.failed:
+        raise typer.Exit(code=1)
+
+    typer.echo("\nDone.")
+
+
+@dataclass
+class _SymbolPages:
+    """Candles from one or more consecutive pages, ready to be inserted."""
+
+    symbol: str
+    candles: List[List[float]]
+
+
+@dataclass
+class _SymbolOutcome:
+    """Final report for one symbol, sent after all of its pages."""
+
+    symbol: str
+    lines: List[str]
+    candles_fetched: int = 0
+    skipped: bool = False
+    cancelled: bool = False
+    error: Optional[str] = None
+    #: ``(earliest_ms, method)`` when the job probed the listing date itself.
+    probe: Optional[Tuple[Optional[int], str]] = None
+
 
+class _FetchWriter:
+    """Single-threaded sink for fetch workers.
+
+    Every insert and every progress line goes through here on the main
+    thread, so there is one SQLite writer no matter how many workers run,
+    and each symbol's report is printed as one block. Symbols marked with
+    :meth:`overwrite` lose their stored rows only when their first page or
+    report arrives, so an interrupted run keeps the symbols it never reached.
+    """
+
+    def __init__(
+        self,
+        store: SQLiteStore,
+        fetcher: CryptoDataFetcher,
+        exchange: str,
+        timeframe: str,
+        total: int,
+        fail_fast: bool,
+    ):
+        self.store = store
+        self.fetcher = fetcher
+        self.exchange = exchange
+        self.timeframe = timeframe
+        self.total = total
+        self.fail_fast = fail_fast
+        self.failed = False
+        self._reported = 0
+        self._inserted: Dict[str, int] = {}
+        self._overwrite: Set[str] = set()
+        self._deleted: Dict[str, int] = {}
+
+    def overwrite(self, symbol: str) -> None:
+        """Delete ``symbol``'s stored rows before its first write."""
+        self._overwrite.add(symbol)
+
+    def _delete_overwritten(self, symbol: str) -> None:
+        if symbol in self._overwrite:
+            self._overwrite.discard(symbol)
+            self._deleted[symbol] = self.store.delete_for_key(self.exchange, symbol, self.timeframe)
+
+    def write_pages(self, pages: _SymbolPages) -> None:
+        self._delete_overwritten(pages.symbol)
+        rows = _candles_to_rows(self.fetcher, self.exchange, pages.symbol, self.timeframe, pages.candles)
+        inserted = self.store.insert_ohlcv(rows)
+        self._inserted[pages.symbol] = self._inserted.get(pages.symbol, 0) + inserted
+
+    def report(self, outcome: _SymbolOutcome) -> None:
+        if outcome.cancelled:
+            return
+        self._delete_overwritten(outcome.symbol)
+        if outcome.probe is not None:
+            earliest_ms, method = outcome.probe
+            self.store.upsert_listings([
+                SymbolListing(
+                    exchange=self.exchange,
+                    symbol=outcome.symbol,
+                    timeframe=self.timeframe,
+                    earliest_ms=earliest_ms,
+                    method=method,
+                    probed_at_ms=int(time_module.time() * 1000),
+                )
+            ])
+        self._reported += 1
+        typer.echo(f"\n[{self._reported}/{self.total}] {outcome.symbol}")
+        if outcome.symbol in self._deleted:
+            typer.echo(f"  Deleted {self._deleted.pop(outcome.symbol)} existing rows (--overwrite)")
+        for line in outcome.lines:
+            typer.echo(line)
+
+        inserted = self._inserted.pop(outcome.symbol, 0)
+        if outcome.error is not None:
+            if outcome.candles_fetched:
+                typer.echo(f"  Inserted {inserted} rows before the error")
+            typer.echo(f"  Error: {outcome.error}", err=True)
+            if self.fail_fast:
+                self.failed = True
+            return
+
+        if outcome.skipped:
+            return
+        if not outcome.candles_fetched:
+            typer.echo("  No data returned.")
+            return
+        typer.echo(f"  Inserted {inserted} rows ({outcome.candles_fetched} candles fetched)")
+
+
+def _run_symbol_job(
+    fetcher: CryptoDataFetcher,
+    sym: str,
+    effective_since: Optional[int],
+    lines: List[str],
+    emit: Callable[[_SymbolPages], None],
+    *,
+    timeframe: str,
+    until_ms: Optional[int],
+    max_requests: Optional[int],
+    sleep_seconds: float,
+    commit_every: int,
+    stop: Optional[threading.Event] = None,
+) -> _SymbolOutcome:
+    """Fetch one symbol, handing candles to ``emit`` every ``commit_every`` pages.
+
+    Once ``stop`` is set, no further page is requested and the symbol
+    reports as cancelled after its fetched pages.
+    """
+    outcome = _SymbolOutcome(symbol=sym, lines=lines)
+    try:
         if effective_since is None:
             earliest_ts, method = fetcher.fetch_earliest_timestamp(sym, timeframe)
-            if earliest_ts is not None:
-                effective_since = earliest_ts
-                typer.echo(f"  Earliest data: {earliest_ts} ({method})")
-            else:
-                typer.echo("  Could not determine earliest timestamp, skipping.")
-                continue
+            outcome.probe = (earliest_ts, method)
+            if earliest_ts is None:
+                lines.append("  Could not determine earliest timestamp, skipping.")
+                outcome.skipped = True
+                return outcome
+            effective_since = earliest_ts
+            lines.append(f"  Earliest data: {earliest_ts} ({method})")
 
-        candles = fetcher.fetch_ohlcv(
+        pending: List[List[float]] = []
+        pages = fetcher.iter_ohlcv_pages(
             symbol=sym,
             timeframe=timeframe,
             since=effective_since,
             until=until_ms,
-            max_requests=max_requests_per_symbol,
+            max_requests=max_requests,
             sleep_seconds=sleep_seconds,
         )
+        for page_number, page in enumerate(pages, start=1):
+            pending.extend(page)
+            outcome.candles_fetched += len(page)
+            if page_number % commit_every == 0:
+                emit(_SymbolPages(sym, pending))
+                pending = []
+            if stop is not None and stop.is_set():
+                outcome.cancelled = True
+                break
+        if pending:
+            emit(_SymbolPages(sym, pending))
+    except Exception as exc:
+        outcome.error = str(exc)
+    return outcome
+
+
+async def _run_symbol_job_async(
+    fetcher: AsyncCryptoDataFetcher,
+    sym: str,
+    effective_since: Optional[int],
+    lines: List[str],
+    emit: Callable[[_SymbolPages], Awaitable[None]],
+    *,
+    timeframe: str,
+    until_ms: Optional[int],
+    max_requests: Optional[int],
+    sleep_seconds: float,
+    commit_every: int,
+    stop: Optional[threading.Event] = None,
+) -> _SymbolOutcome:
+    """Async version of :func:`_run_symbol_job`.
+
+    ``emit`` is awaited. Once ``stop`` is set, no further page is requested
+    and the symbol reports as cancelled after its fetched pages.
+    """
+    outcome = _SymbolOutcome(symbol=sym, lines=lines)
+    try:
+        if effective_since is None:
+            earliest_ts, method = await fetcher.fetch_earliest_timestamp(sym, timeframe)
+            outcome.probe = (earliest_ts, method)
+            if earliest_ts is None:
+                lines.append("  Could not determine earliest timestamp, skipping.")
+                outcome.skipped = True
+                return outcome
+            effective_since = earliest_ts
+            lines.append(f"  Earliest data: {earliest_ts} ({method})")
 
-        if not candles:
-            typer.echo("  No data returned.")
-            continue
+        pending: List[List[float]] = []
+        page_number = 0
+        pages = fetcher.iter_ohlcv_pages(
+            symbol=sym,
+            timeframe=timeframe,
+            since=effective_since,
+            until=until_ms,
+            max_requests=max_requests,
+            sleep_seconds=sleep_seconds,
+        )
+        async for page in pages:
+            page_number += 1
+            pending.extend(page)
+            outcome.candles_fetched += len(page)
+            if page_number % commit_every == 0:
+                await emit(_SymbolPages(sym, pending))
+                pending = []
+            if stop is not None and stop.is_set():
+                outcome.cancelled = True
+                break
+        if pending:
+            await emit(_SymbolPages(sym, pending))
+    except Exception as exc:
+        outcome.error = str(exc)
+    return outcome
+
+
+def _drain_events(
+    writer: _FetchWriter,
+    events: "queue.Queue[Union[_SymbolPages, _SymbolOutcome]]",
+    total: int,
+    stop: threading.Event,
+    running: Callable[[], bool],
+) -> None:
+    """Write pages and reports from ``events`` until every job has reported.
 
-        rows = []
-        for c in candles:
-            ms = int(c[0])
-            ts_iso = fetcher.exchange.iso8601(ms)
-            rows.append((
-                ms,
-                ts_iso,
-                exchange,
-                sym,
-                timeframe,
-                float(c[1]),
-                float(c[2]),
-                float(c[3]),
-                float(c[4]),
-                float(c[5]),
-            ))
+    If writing fails or is interrupted, ``stop`` is set and events are
+    discarded while ``running`` reports producers still alive, so none is
+    left blocked on the full queue; the error is then re-raised.
+    """
+    remaining = total
+    try:
+        while remaining:
+            event = events.get()
+            if isinstance(event, _SymbolPages):
+                writer.write_pages(event)
+                continue
+            remaining -= 1
+            writer.report(event)
+            if writer.failed:
+                # Jobs that have not started yet report back as cancelled.
+                stop.set()
+    except BaseException:
+        stop.set()
+        while running():
+            try:
+                events.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        raise
+
+
+def _run_jobs_threaded(
+    writer: _FetchWriter,
+    fetcher: CryptoDataFetcher,
+    exchange: str,
+    jobs: List[Tuple[str, Optional[int], List[str]]],
+    workers: int,
+    fetch_kwargs: Dict,
+) -> None:
+    """Fetch symbols on a thread pool; each thread owns its own exchange client."""
+    rate_limiter = RateLimiter.for_exchange(fetcher.exchange)
+    local = threading.local()
+    # Bounded so a slow writer pushes back on fetching instead of buffering.
+    events: "queue.Queue[Union[_SymbolPages, _SymbolOutcome]]" = queue.Queue(maxsize=workers * 2)
+    stop = threading.Event()
+
+    def worker(sym: str, effective_since: Optional[int], lines: List[str]) -> None:
+        if stop.is_set():
+            events.put(_SymbolOutcome(symbol=sym, lines=lines, cancelled=True))
+            return
+        worker_fetcher = getattr(local, "fetcher", None)
+        if worker_fetcher is None:
+            try:
+                worker_fetcher = CryptoDataFetcher(exchange_id=exchange, rate_limiter=rate_limiter)
+            except Exception as exc:
+                events.put(_SymbolOutcome(symbol=sym, lines=lines, error=str(exc)))
+                return
+            local.fetcher = worker_fetcher
+        events.put(
+            _run_symbol_job(worker_fetcher, sym, effective_since, lines, events.put, stop=stop, **fetch_kwargs)
+        )
 
-        inserted = store.insert_ohlcv(rows)
-        typer.echo(f"  Inserted {inserted} rows ({len(candles)} candles fetched)")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(worker, *job) for job in jobs]
+        _drain_events(writer, events, len(jobs), stop, lambda: not all(f.done() for f in futures))
 
-        # Sleep between symbols (per-request pacing is handled inside fetch_ohlcv)
-        if sleep_seconds > 0 and i < len(symbol_list) - 1:
-            time_module.sleep(sleep_seconds)
 
-    typer.echo("\nDone.")
+def _run_jobs_async(
+    writer: _FetchWriter,
+    exchange: str,
+    jobs: List[Tuple[str, Optional[int], List[str]]],
+    max_concurrency: int,
+    fetch_kwargs: Dict,
+    refresh_markets: bool = False,
+) -> None:
+    """Fetch every symbol on one event loop running in a background thread.
+
+    Pages come back through a bounded queue, so the calling thread stays the
+    SQLite writer. Puts wait on a worker thread, so a lagging writer holds
+    back only the symbols with pages to hand over, not the event loop. At
+    most ``max_concurrency`` symbols run at once; once a failure stops the
+    run, waiting symbols report as cancelled and running ones stop after
+    their current page.
+    """
+    events: "queue.Queue[Union[_SymbolPages, _SymbolOutcome]]" = queue.Queue(
+        maxsize=max(2, max_concurrency * 2)
+    )
+    stop = threading.Event()
+    errors: List[BaseException] = []
+
+    async def put(event: Union[_SymbolPages, _SymbolOutcome]) -> None:
+        await asyncio.to_thread(events.put, event)
+
+    async def run_job(
+        fetcher: AsyncCryptoDataFetcher, slots: asyncio.Semaphore, sym: str, effective_since, lines
+    ) -> None:
+        async with slots:
+            if stop.is_set():
+                await put(_SymbolOutcome(symbol=sym, lines=lines, cancelled=True))
+                return
+            outcome = await _run_symbol_job_async(
+                fetcher, sym, effective_since, lines, put, stop=stop, **fetch_kwargs
+            )
+            # Stop before the slot passes on, not once the writer catches up.
+            if outcome.error is not None and writer.fail_fast:
+                stop.set()
+            await put(outcome)
+
+    async def run_all() -> None:
+        pending = list(jobs)
+        try:
+            async with AsyncCryptoDataFetcher(
+                exchange, max_concurrency=max_concurrency, refresh_markets=refresh_markets
+            ) as fetcher:
+                slots = asyncio.Semaphore(max(1, max_concurrency))
+                tasks = [run_job(fetcher, slots, *job) for job in pending]
+                pending = []
+                await asyncio.gather(*tasks)
+        except Exception as exc:
+            errors.append(exc)
+            for sym, _, lines in pending:
+                await put(_SymbolOutcome(symbol=sym, lines=lines, cancelled=True))
+
+    loop_thread = threading.Thread(target=asyncio.run, args=(run_all(),), daemon=True)
+    loop_thread.start()
+    _drain_events(writer, events, len(jobs), stop, loop_thread.is_alive)
+    loop_thread.join()
+    if errors:
+        raise errors[0]
+
+
+def _register_market_precision(
+    store: SQLiteStore, fetcher: CryptoDataFetcher, exchange: str, symbol_list: List[str]
+) -> None:
+    for sym in symbol_list:
+        store.set_market_precision(exchange, sym, *fetcher.get_precision_decimals(sym))
+
+
+def _candles_to_rows(
+    fetcher: CryptoDataFetcher,
+    exchange: str,
+    sym: str,
+    timeframe: str,
+    candles: List[List[float]],
+) -> List[tuple]:
+    rows = []
+    for c in candles:
+        ms = int(c[0])
+        rows.append((
+            ms,
+            fetcher.exchange.iso8601(ms),
+            exchange,
+            sym,
+            timeframe,
+            float(c[1]),
+            float(c[2]),
+            float(c[3]),
+            float(c[4]),
+            float(c[5]),
+        ))
+    return rows
 
 
 @app.command()
@@ -443,8 +950,34 @@ def bulk_fetch(
         "--include-daily-current-month/--monthly-only",
         help="Use daily ZIPs to fill the current month after monthly archive files",
     ),
+    refresh_markets: bool = typer.Option(
+        False,
+        "--refresh-markets",
+        help="Download exchange market metadata instead of using the local cache",
+    ),
+    download_workers: int = typer.Option(
+        DEFAULT_DOWNLOAD_WORKERS,
+        "--download-workers",
+        help="Archive files downloaded at once over pooled connections",
+    ),
+    decode_workers: int = typer.Option(
+        DEFAULT_DECODE_WORKERS,
+        "--decode-workers",
+        help="Worker processes decoding archive ZIPs (1 = decode on the writer thread)",
+    ),
+    bulk_load: bool = typer.Option(
+        False,
+        "--bulk-load",
+        help="On databases not yet migrated, drop secondary indexes and rebuild them once at the end",
+    ),
+    integer_encoding: bool = typer.Option(
+        False,
+        "--integer-encoding",
+        help="Store new series as integers scaled by the decimals of their data (smaller database)",
+    ),
 ) -> None:
     """Bulk ingest Binance public archive OHLCV ZIPs into SQLite."""
+    fetcher: Optional[CryptoDataFetcher] = None
     symbol_list: List[str] = []
     if symbols:
         symbol_list.extend(s.strip() for s in symbols.split(",") if s.strip())
@@ -453,7 +986,7 @@ def bulk_fetch(
 
     if not symbol_list:
         typer.echo("No symbols specified, discovering active Binance spot symbols...")
-        fetcher = CryptoDataFetcher(exchange_id="binance")
+        fetcher = CryptoDataFetcher(exchange_id="binance", refresh_markets=refresh_markets)
         discovered = fetcher.get_symbols(quote=quote, active_only=True, spot_only=True)
         symbol_list = [r["symbol"] for r in discovered]
 
@@ -475,10 +1008,11 @@ def bulk_fetch(
         typer.echo("--until must be on or after --since", err=True)
         raise typer.Exit(code=1)
 
-    store = SQLiteStore(db_path)
+    store = SQLiteStore(db_path, integer_encoding=integer_encoding)
 
     if timeframe == "1M":
         _bulk_fetch_sparse_timeframe(
+            fetcher=fetcher or CryptoDataFetcher(exchange_id="binance", refresh_markets=refresh_markets),
             store=store,
             symbol_list=symbol_list,
             timeframe=timeframe,
@@ -496,35 +1030,72 @@ def bulk_fetch(
 
     total_inserted = 0
     total_seen = 0
-    for i, sym in enumerate(symbol_list):
-        typer.echo(f"\n[{i+1}/{len(symbol_list)}] {sym}")
-        try:
-            result = ingest_binance_archives(
-                store=store,
-                symbol=sym,
-                timeframe=timeframe,
-                since=since_date,
-                until=until_date,
-                cache_dir=Path(cache_dir).expanduser(),
-                resume=resume,
-                include_daily_current_month=include_daily_current_month,
-            )
-        except Exception as exc:
-            typer.echo(f"  Error: {exc}", err=True)
-            continue
+    # One client and one download pool serve every symbol, so keep-alive
+    # connections carry over from one symbol to the next.
+    client = ArchiveHTTPClient()
+    download_pool = ThreadPoolExecutor(max_workers=max(1, download_workers))
+    decode_pool = create_decode_pool(decode_workers) if decode_workers > 1 else None
+    try:
+        # Archive batches are large, so version 1 databases always merge
+        # them through the staging table; --bulk-load also defers the
+        # secondary indexes. Later versions insert them directly.
+        with store.bulk_load(drop_indexes=bulk_load):
+            for i, sym in enumerate(symbol_list):
+                typer.echo(f"\n[{i+1}/{len(symbol_list)}] {sym}")
+                try:
+                    result = ingest_binance_archives(
+                        store=store,
+                        symbol=sym,
+                        timeframe=timeframe,
+                        since=since_date,
+                        until=until_date,
+                        cache_dir=Path(cache_dir).expanduser(),
+                        resume=resume,
+                        include_daily_current_month=include_daily_current_month,
+                        download_workers=download_workers,
+                        client=client,
+                        decode_workers=decode_workers,
+                        decode_pool=decode_pool,
+                        download_pool=download_pool,
+                    )
+                except Exception as exc:
+                    typer.echo(f"  Error: {exc}", err=True)
+                    continue
+
+                total_inserted += result.rows_inserted
+                total_seen += result.candles_seen
+                typer.echo(
+                    "  "
+                    f"Inserted {result.rows_inserted} rows "
+                    f"({result.candles_seen} candles, "
+                    f"{result.files_downloaded} downloaded, "
+                    f"{result.files_cached} cached, "
+                    f"{result.files_missing} missing, "
+                    f"{result.files_skipped} skipped)"
+                )
+                if result.candles_seen:
+                    typer.echo(f"  {_format_stage_throughput(result, download_workers, decode_workers)}")
+    finally:
+        download_pool.shutdown(wait=True, cancel_futures=True)
+        client.close()
+        if decode_pool is not None:
+            decode_pool.shutdown()
+    typer.echo(f"\nDone. Inserted {total_inserted} rows from {total_seen} candles.")
 
-        total_inserted += result.rows_inserted
-        total_seen += result.candles_seen
-        typer.echo(
-            "  "
-            f"Inserted {result.rows_inserted} rows "
-            f"({result.candles_seen} candles, "
-            f"{result.files_downloaded} downloaded, "
-            f"{result.files_cached} cached, "
-            f"{result.files_missing} missing)"
-        )
 
-    typer.echo(f"\nDone. Inserted {total_inserted} rows from {total_seen} candles.")
+def _format_stage_throughput(result: ArchiveIngestResult, download_workers: int, decode_workers: int) -> str:
+    """Describe what each ingest stage sustains with all of its workers busy.
+
+    The stage with the lowest rate is the pipeline's bottleneck.
+    """
+
+    def rate(amount: float, busy_seconds: float, workers: int) -> float:
+        return amount * max(1, workers) / busy_seconds if busy_seconds > 0 else 0.0
+
+    download = rate(result.download_bytes / 1_000_000, result.download_seconds, download_workers)
+    decode = rate(result.candles_seen, result.decode_seconds, decode_workers)
+    write = rate(result.candles_seen, result.write_seconds, 1)
+    return f"Throughput: download {download:.1f} MB/s, decode {decode:,.0f} candles/s, write {write:,.0f} rows/s"
 
 
 def _parse_exchange_bound(fetcher: CryptoDataFetcher, value: str, now_ms: int) -> Optional[int]:
@@ -540,6 +1111,7 @@ def _parse_exchange_bound(fetcher: CryptoDataFetcher, value: str, now_ms: int) -
 
 def _bulk_fetch_sparse_timeframe(
     *,
+    fetcher: CryptoDataFetcher,
     store: SQLiteStore,
     symbol_list: List[str],
     timeframe: str,
@@ -553,7 +1125,6 @@ def _bulk_fetch_sparse_timeframe(
     candle interval, that turns into roughly one HTTP file per candle, while
     CCXT can usually retrieve the whole series in a single request.
     """
-    fetcher = CryptoDataFetcher(exchange_id="binance")
     now_ms = int(time_module.time() * 1000)
     since_ms = _parse_exchange_bound(fetcher, since, now_ms)
     until_ms = _parse_exchange_bound(fetcher, until, now_ms)
@@ -564,6 +1135,9 @@ def _bulk_fetch_sparse_timeframe(
         "monthly candles"
     )
 
+    def probe(batch: List[str]) -> Dict[str, Tuple[Optional[int], str]]:
+        return {sym: fetcher.fetch_earliest_timestamp(sym, timeframe) for sym in batch}
+
     total_inserted = 0
     total_seen = 0
     for i, sym in enumerate(symbol_list):
@@ -576,12 +1150,12 @@ def _bulk_fetch_sparse_timeframe(
             typer.echo(f"  Resuming from timestamp {effective_since}")
 
         if effective_since is None:
-            earliest_ts, method = fetcher.fetch_earliest_timestamp(sym, timeframe)
-            if earliest_ts is None:
+            listing = resolve_listings(store, "binance", [sym], timeframe, probe=probe)[sym]
+            if listing.earliest_ms is None:
                 typer.echo("  Could not determine earliest timestamp, skipping.")
                 continue
-            effective_since = earliest_ts
-            typer.echo(f"  Earliest data: {earliest_ts} ({method})")
+            effective_since = listing.earliest_ms
+            typer.echo(f"  Earliest data: {effective_since} ({listing.method})")
 
         candles = fetcher.fetch_ohlcv(
             symbol=sym,
@@ -595,24 +1169,7 @@ def _bulk_fetch_sparse_timeframe(
             typer.echo("  No data returned.")
             continue
 
-        rows = []
-        for candle in candles:
-            ms = int(candle[0])
-            rows.append(
-                (
-                    ms,
-                    fetcher.exchange.iso8601(ms),
-                    "binance",
-                    sym,
-                    timeframe,
-                    float(candle[1]),
-                    float(candle[2]),
-                    float(candle[3]),
-                    float(candle[4]),
-                    float(candle[5]),
-                )
-            )
-
+        rows = _candles_to_rows(fetcher, "binance", sym, timeframe, candles)
         inserted = store.insert_ohlcv(rows)
         total_inserted += inserted
         total_seen += len(candles)
@@ -662,28 +1219,425 @@ def validate(
     db_path: str = typer.Option("data/crypto_ohlcv.db", "--db-path", "-d", help="Path to SQLite database"),
     exchange: Optional[str] = typer.Option(None, "--exchange", "-e", help="Filter by exchange"),
     timeframe: Optional[str] = typer.Option(None, "--timeframe", "-t", help="Filter by timeframe"),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", help="Series validated in parallel processes (default: one per CPU)"
+    ),
 ) -> None:
     """Validate OHLCV data integrity in the SQLite database."""
     store = SQLiteStore(db_path)
-    results = store.validate(exchange=exchange, timeframe=timeframe)
-
-    if not results:
-        typer.echo("No data to validate.")
-        raise typer.Exit(code=0)
-
     header = (
         f"{'symbol':<20} {'rows':<8} {'dup':<6} {'null':<6} {'bad_price':<10} "
         f"{'bad_vol':<8} {'gap':<6} {'max_gap':<8} {'status':<8}"
     )
-    print(header)
-    print("-" * len(header))
-    for r in results:
+
+    validated = 0
+    for r in store.iter_validate(exchange=exchange, timeframe=timeframe, workers=workers):
+        if not validated:
+            print(header)
+            print("-" * len(header))
+        validated += 1
         print(
             f"{r.symbol:<20} {r.rows:<8} {r.duplicate_count:<6} {r.null_count:<6} "
             f"{r.non_positive_price_count:<10} {r.non_positive_volume_count:<8} "
             f"{r.gap_count:<6} {r.largest_gap_bars:<8} {r.status:<8}"
         )
 
+    if not validated:
+        typer.echo("No data to validate.")
+
+
+@app.command()
+def repair(
+    db_path: str = typer.Option("data/crypto_ohlcv.db", "--db-path", "-d", help="Path to SQLite database"),
+    exchange: Optional[str] = typer.Option(None, "--exchange", "-e", help="Filter by exchange"),
+    symbols: Optional[str] = typer.Option(None, "--symbols", "-s", help="Comma-separated symbol list"),
+    timeframe: Optional[str] = typer.Option(None, "--timeframe", "-t", help="Filter by timeframe"),
+    source: str = typer.Option("api", "--source", help="Refetch gaps from: api or archive (Binance only)"),
+    cache_dir: Path = typer.Option("data/archive_cache", "--cache-dir", help="Directory for downloaded archive ZIPs"),
+    sleep_seconds: float = typer.Option(0.12, "--sleep-seconds", help="Seconds to wait between API requests"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Print the repair plan without fetching"),
+) -> None:
+    """Refetch only the candles missing between stored candles."""
+    if source not in {"api", "archive"}:
+        typer.echo("Invalid --source. Use 'api' or 'archive'.", err=True)
+        raise typer.Exit(code=1)
+
+    store = SQLiteStore(db_path)
+    symbol_filter = {s.strip() for s in symbols.split(",") if s.strip()} if symbols else None
+    series = [
+        inv
+        for inv in store.get_inventory(exchange=exchange, timeframe=timeframe)
+        if symbol_filter is None or inv.symbol in symbol_filter
+    ]
+
+    fetchers: Dict[str, CryptoDataFetcher] = {}
+    total_gaps = 0
+    total_closed = 0
+    for inv in series:
+        gaps = store.find_gaps(inv.exchange, inv.symbol, inv.timeframe)
+        if not gaps:
+            continue
+        total_gaps += len(gaps)
+        windows = plan_gap_windows(gaps, inv.timeframe)
+        missing = sum(gap.missing_bars for gap in gaps)
+        typer.echo(
+            f"\n{inv.exchange} {inv.symbol} [{inv.timeframe}]: {len(gaps)} gaps, "
+            f"{missing} missing bars, {len(windows)} fetch windows"
+        )
+        if dry_run:
+            for gap in gaps:
+                typer.echo(f"  {_format_gap(gap)}")
+            continue
+
+        use_archive = source == "archive" and inv.exchange == "binance"
+        if source == "archive" and not use_archive:
+            typer.echo("  Archive ZIPs are Binance-only, using the exchange API")
+        try:
+            if use_archive:
+                _repair_from_archive(store, inv.symbol, inv.timeframe, windows, Path(cache_dir).expanduser())
+            else:
+                if inv.exchange not in fetchers:
+                    fetchers[inv.exchange] = CryptoDataFetcher(exchange_id=inv.exchange)
+                _repair_from_api(
+                    store,
+                    fetchers[inv.exchange],
+                    inv.exchange,
+                    inv.symbol,
+                    inv.timeframe,
+                    windows,
+                    sleep_seconds,
+                )
+        except Exception as exc:
+            typer.echo(f"  Error: {exc}", err=True)
+
+        remaining = store.find_gaps(
+            inv.exchange,
+            inv.symbol,
+            inv.timeframe,
+            start_ms=gaps[0].after_ms,
+            end_ms=gaps[-1].before_ms,
+        )
+        for gap in gaps:
+            left = sum(
+                r.missing_bars for r in remaining
+                if gap.after_ms <= r.after_ms and r.before_ms <= gap.before_ms
+            )
+            if left == 0:
+                status = "closed"
+                total_closed += 1
+            elif left < gap.missing_bars:
+                status = f"{gap.missing_bars - left} filled, {left} still missing"
+            else:
+                status = "still missing (no data returned)"
+            typer.echo(f"  {_format_gap(gap)}  {status}")
+
+    if total_gaps == 0:
+        typer.echo("No gaps found.")
+    elif not dry_run:
+        typer.echo(f"\nDone. Closed {total_closed} of {total_gaps} gaps.")
+
+
+def _format_gap(gap: Gap) -> str:
+    interval_ms = SQLiteStore._guess_interval_ms(gap.timeframe)
+    first = _iso8601_utc(gap.after_ms + interval_ms)
+    last = _iso8601_utc(gap.before_ms - interval_ms)
+    return f"{first} .. {last}  {gap.missing_bars} bars"
+
+
+def _iso8601_utc(milliseconds: int) -> str:
+    return datetime.fromtimestamp(milliseconds / 1000, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _repair_from_api(
+    store: SQLiteStore,
+    fetcher: CryptoDataFetcher,
+    exchange: str,
+    sym: str,
+    timeframe: str,
+    windows: List[Tuple[int, int]],
+    sleep_seconds: float,
+) -> None:
+    """Fetch each repair window through CCXT and insert the candles."""
+    interval_ms = SQLiteStore._guess_interval_ms(timeframe)
+    for i, (since_ms, until_ms) in enumerate(windows):
+        if i > 0 and sleep_seconds > 0:
+            time_module.sleep(sleep_seconds)
+        candles = fetcher.fetch_ohlcv(
+            symbol=sym,
+            timeframe=timeframe,
+            since=since_ms,
+            until=until_ms,
+            limit=min(1000, (until_ms - since_ms) // interval_ms + 1),
+            sleep_seconds=sleep_seconds,
+        )
+        store.insert_ohlcv(_candles_to_rows(fetcher, exchange, sym, timeframe, candles))
+
+
+def _repair_from_archive(
+    store: SQLiteStore,
+    sym: str,
+    timeframe: str,
+    windows: List[Tuple[int, int]],
+    cache_dir: Path,
+) -> None:
+    """Re-ingest the Binance archive days covering each repair window."""
+    for since_ms, until_ms in windows:
+        ingest_binance_archives(
+            store=store,
+            symbol=sym,
+            timeframe=timeframe,
+            since=datetime.fromtimestamp(since_ms / 1000, tz=timezone.utc).date(),
+            until=datetime.fromtimestamp(until_ms / 1000, tz=timezone.utc).date(),
+            cache_dir=cache_dir,
+            resume=False,
+            decode_workers=1,
+        )
+
+
+@app.command()
+def derive(
+    db_path: str = typer.Option("data/crypto_ohlcv.db", "--db-path", "-d", help="Path to SQLite database"),
+    exchange: Optional[str] = typer.Option(None, "--exchange", "-e", help="Filter by exchange"),
+    symbols: Optional[str] = typer.Option(None, "--symbols", "-s", help="Comma-separated symbol list"),
+    base: str = typer.Option("1m", "--base", help="Stored timeframe to aggregate from"),
+    targets: str = typer.Option("5m,15m,1h,4h,1d", "--targets", help="Comma-separated timeframes to build"),
+) -> None:
+    """Build higher timeframes locally from a stored base timeframe."""
+    target_list = [t.strip() for t in targets.split(",") if t.strip()]
+    invalid = [t for t in target_list if not can_derive(base, t)]
+    if invalid:
+        typer.echo(f"Cannot derive {', '.join(invalid)} from {base} candles", err=True)
+        raise typer.Exit(code=1)
+
+    # Build small targets first so each larger one aggregates the coarsest
+    # finished timeframe instead of rescanning the base series.
+    target_list.sort(key=lambda t: TIMEFRAME_MS[t])
+    sources = {}
+    for i, target in enumerate(target_list):
+        candidates = [base] + target_list[:i]
+        sources[target] = max(
+            (c for c in candidates if can_derive(c, target)),
+            key=lambda c: TIMEFRAME_MS[c],
+        )
+
+    store = SQLiteStore(db_path)
+    symbol_filter = {s.strip() for s in symbols.split(",") if s.strip()} if symbols else None
+    series = [
+        inv
+        for inv in store.get_inventory(exchange=exchange, timeframe=base)
+        if symbol_filter is None or inv.symbol in symbol_filter
+    ]
+    if not series:
+        typer.echo(f"No {base} data to derive from.")
+        raise typer.Exit(code=0)
+
+    total_inserted = 0
+    for i, inv in enumerate(series, start=1):
+        counts = []
+        for target in target_list:
+            inserted = store.derive_timeframe(inv.exchange, inv.symbol, sources[target], target)
+            total_inserted += inserted
+            counts.append(f"{target} +{inserted}")
+        typer.echo(f"[{i}/{len(series)}] {inv.exchange} {inv.symbol}: {', '.join(counts)}")
+
+    typer.echo(f"\nDone. Inserted {total_inserted} rows.")
+
+
+@app.command()
+def sync(
+    exchange: str = typer.Option(DEFAULT_EXCHANGE, "--exchange", "-e", help="Exchange ID"),
+    symbols: Optional[str] = typer.Option(None, "--symbols", "-s", help="Comma-separated symbol list"),
+    symbols_file: Optional[Path] = typer.Option(None, "--symbols-file", "-f", help="File with one symbol per line"),
+    quote: Optional[str] = typer.Option(None, "--quote", "-q", help="Filter by quote currency (auto-discover)"),
+    timeframe: str = typer.Option("1h", "--timeframe", "-t", help="Candle timeframe"),
+    since: str = typer.Option("earliest", "--since", help="Start: 'earliest', 'YYYY-MM-DD', or ms timestamp"),
+    until: str = typer.Option("now", "--until", help="End: 'now', 'YYYY-MM-DD', or ms timestamp"),
+    db_path: str = typer.Option("data/crypto_ohlcv.db", "--db-path", "-d", help="Path to SQLite database"),
+    cache_dir: Path = typer.Option("data/archive_cache", "--cache-dir", help="Directory for downloaded archive ZIPs"),
+    resume: bool = typer.Option(True, "--resume/--no-resume", help="Continue after the last stored candle"),
+    download_workers: int = typer.Option(
+        DEFAULT_DOWNLOAD_WORKERS,
+        "--download-workers",
+        help="Archive files downloaded at once over pooled connections",
+    ),
+    sleep_seconds: float = typer.Option(0.12, "--sleep-seconds", help="Seconds to wait between API requests"),
+    refresh_markets: bool = typer.Option(
+        False,
+        "--refresh-markets",
+        help="Download exchange market metadata instead of using the local cache",
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Print the chosen plan per symbol without fetching"),
+    integer_encoding: bool = typer.Option(
+        False,
+        "--integer-encoding",
+        help="Store new series as integers scaled by their price/amount precision (smaller database)",
+    ),
+) -> None:
+    """Sync symbols through whichever of archive ZIPs and the API is estimated fastest."""
+    if timeframe not in TIMEFRAME_MS:
+        typer.echo(f"Unsupported timeframe: {timeframe}", err=True)
+        raise typer.Exit(code=1)
+
+    fetcher = CryptoDataFetcher(exchange_id=exchange, refresh_markets=refresh_markets)
+    symbol_list: List[str] = []
+    if symbols:
+        symbol_list.extend(s.strip() for s in symbols.split(",") if s.strip())
+    if symbols_file:
+        symbol_list.extend(_read_symbol_file(symbols_file))
+    if not symbol_list:
+        typer.echo(f"No symbols specified, discovering active {exchange} spot symbols...")
+        discovered = fetcher.get_symbols(quote=quote, active_only=True, spot_only=True)
+        symbol_list = [r["symbol"] for r in discovered]
+    if not symbol_list:
+        typer.echo("No symbols to sync.")
+        raise typer.Exit(code=0)
+
+    now_ms = int(time_module.time() * 1000)
+    since_ms = _parse_exchange_bound(fetcher, since, now_ms)
+    until_ms = _parse_exchange_bound(fetcher, until, now_ms)
+    if until_ms is None:
+        typer.echo("Invalid --until bound", err=True)
+        raise typer.Exit(code=1)
+    if since_ms is not None and until_ms < since_ms:
+        typer.echo("--until must be on or after --since", err=True)
+        raise typer.Exit(code=1)
+
+    store = SQLiteStore(db_path, integer_encoding=integer_encoding)
+    if integer_encoding:
+        _register_market_precision(store, fetcher, exchange, symbol_list)
+
+    def probe(batch: List[str]) -> Dict[str, Tuple[Optional[int], str]]:
+        return {sym: fetcher.fetch_earliest_timestamp(sym, timeframe) for sym in batch}
+
+    typer.echo(f"Syncing {len(symbol_list)} {exchange} symbols [{timeframe}]")
+    client = ArchiveHTTPClient() if exchange == "binance" and not dry_run else None
+    download_pool = ThreadPoolExecutor(max_workers=max(1, download_workers)) if client is not None else None
+    decode_pool = create_decode_pool() if client is not None and DEFAULT_DECODE_WORKERS > 1 else None
+    total_inserted = 0
+    try:
+        for i, sym in enumerate(symbol_list):
+            typer.echo(f"\n[{i+1}/{len(symbol_list)}] {sym}")
+
+            start_ms = since_ms
+            local_max_ms = store.get_max_timestamp(exchange, sym, timeframe)
+            if resume and local_max_ms is not None:
+                start_ms = max(start_ms or 0, local_max_ms + 1)
+            if start_ms is None:
+                listing = resolve_listings(store, exchange, [sym], timeframe, probe=probe)[sym]
+                if listing.earliest_ms is None:
+                    typer.echo("  Could not determine earliest timestamp, skipping.")
+                    continue
+                start_ms = listing.earliest_ms
+            if start_ms > until_ms:
+                typer.echo("  Up to date.")
+                continue
+
+            plan = plan_sync(
+                exchange,
+                sym,
+                timeframe,
+                start_ms,
+                until_ms,
+                download_workers=download_workers,
+                sleep_seconds=sleep_seconds,
+                store=store,
+                resume=resume,
+            )
+            typer.echo(f"  Range: {_iso8601_utc(plan.since_ms)} .. {_iso8601_utc(until_ms)}")
+            for estimate in plan.estimates:
+                marker = "*" if estimate is plan.chosen else " "
+                typer.echo(f"  {marker} {_format_estimate(estimate)}")
+            if dry_run:
+                continue
+
+            inserted = 0
+            try:
+                api_since_ms = start_ms
+                if plan.chosen.archive_until is not None:
+                    result = ingest_binance_archives(
+                        store=store,
+                        symbol=sym,
+                        timeframe=timeframe,
+                        since=datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc).date(),
+                        until=plan.chosen.archive_until,
+                        cache_dir=Path(cache_dir).expanduser(),
+                        resume=resume,
+                        download_workers=download_workers,
+                        client=client,
+                        decode_pool=decode_pool,
+                        download_pool=download_pool,
+                    )
+                    inserted += result.rows_inserted
+                    # The API picks up the unpublished tail after the last
+                    # archived candle, whatever the archives actually held.
+                    archived_max_ms = store.get_max_timestamp(exchange, sym, timeframe)
+                    if archived_max_ms is not None:
+                        api_since_ms = max(api_since_ms, archived_max_ms + 1)
+                if api_since_ms <= until_ms:
+                    candles = fetcher.fetch_ohlcv(
+                        symbol=sym,
+                        timeframe=timeframe,
+                        since=api_since_ms,
+                        until=until_ms,
+                        limit=1000,
+                        sleep_seconds=sleep_seconds,
+                    )
+                    candles = [c for c in candles if int(c[0]) <= until_ms]
+                    inserted += store.insert_ohlcv(_candles_to_rows(fetcher, exchange, sym, timeframe, candles))
+            except Exception as exc:
+                typer.echo(f"  Error: {exc}", err=True)
+                continue
+
+            total_inserted += inserted
+            typer.echo(f"  Inserted {inserted} rows via {plan.chosen.source}")
+    finally:
+        if download_pool is not None:
+            download_pool.shutdown(wait=True, cancel_futures=True)
+        if client is not None:
+            client.close()
+        if decode_pool is not None:
+            decode_pool.shutdown()
+    if not dry_run:
+        typer.echo(f"\nDone. Inserted {total_inserted} rows.")
+
+
+def _format_estimate(estimate: SourceEstimate) -> str:
+    text = (
+        f"{estimate.source:<12} {estimate.requests} requests, "
+        f"{estimate.bytes / 1_000_000:.1f} MB, ~{estimate.seconds:.1f}s"
+    )
+    if estimate.archive_until is not None:
+        text += f" (archives through {estimate.archive_until})"
+    return text
+
+
+@app.command()
+def migrate(
+    db_path: str = typer.Option("data/crypto_ohlcv.db", "--db-path", "-d", help="Path to SQLite database"),
+    chunk_rows: int = typer.Option(500_000, "--chunk-rows", help="Rows copied per transaction"),
+    vacuum: bool = typer.Option(True, "--vacuum/--no-vacuum", help="Return freed pages to the filesystem afterwards"),
+) -> None:
+    """Upgrade a database to the current storage schema in place."""
+    if not Path(db_path).expanduser().exists():
+        typer.echo(f"Database not found: {db_path}", err=True)
+        raise typer.Exit(code=1)
+
+    store = SQLiteStore(db_path)
+    size_before = Path(store.db_path).stat().st_size
+    typer.echo(f"{store.db_path}: schema v{store.schema_version}")
+
+    def progress(copied: int, total: int) -> None:
+        typer.echo(f"  Copied {copied}/{total} rows")
+
+    if not store.migrate(chunk_rows=max(1, chunk_rows), vacuum=vacuum, progress=progress):
+        typer.echo("Already on the current schema.")
+        return
+    size_after = Path(store.db_path).stat().st_size
+    typer.echo(
+        f"Done. Migrated to schema v{store.schema_version}: "
+        f"{size_before / 1_000_000:.1f} MB -> {size_after / 1_000_000:.1f} MB"
+    )
+
 
 @app.command("export-prices")
 def export_prices(
@@ -772,6 +1726,10 @@ crypto_app.command("fetch")(fetch)
 crypto_app.command("bulk-fetch")(bulk_fetch)
 crypto_app.command("inventory")(inventory)
 crypto_app.command("validate")(validate)
+crypto_app.command("repair")(repair)
+crypto_app.command("derive")(derive)
+crypto_app.command("sync")(sync)
+crypto_app.command("migrate")(migrate)
 crypto_app.command("export-prices")(export_prices)
 app.add_typer(crypto_app, name="crypto")
 app.add_typer(alpaca_app, name="alpaca")
@@ -1,7 +1,10 @@
 """Data models for OHLCV data."""
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional
+
+import numpy as np
 
 
 @dataclass
@@ -28,6 +31,7 @@ class InventoryRow:
     rows: int
     first_datetime_utc: Optional[str] = None
     last_datetime_utc: Optional[str] = None
+    last_insert_ms: Optional[int] = None
 
 
 @dataclass
@@ -47,3 +51,74 @@ class ValidationResult:
     first_datetime_utc: Optional[str] = None
     last_datetime_utc: Optional[str] = None
     status: str = "PASS"
+
+
+@dataclass
+class SymbolListing:
+    """Cached earliest-candle probe result for a exchange/symbol/timeframe."""
+    exchange: str
+    symbol: str
+    timeframe: str
+    earliest_ms: Optional[int]
+    method: str
+    probed_at_ms: int
+
+
+@dataclass
+class Gap:
+    """Missing candles between two stored candles of a exchange/symbol/timeframe."""
+    exchange: str
+    symbol: str
+    timeframe: str
+    after_ms: int  # last stored candle before the gap
+    before_ms: int  # first stored candle after the gap
+    missing_bars: int
+
+
+@dataclass
+class ArchiveFile:
+    """Manifest entry for an archive ZIP whose candles have been ingested."""
+    exchange: str
+    symbol: str
+    timeframe: str
+    granularity: str  # monthly or daily
+    period: str  # YYYY-MM or YYYY-MM-DD
+    size_bytes: int
+    sha256: str
+    rows: int
+    ingested_at_ms: int
+
+
+@dataclass
+class SourceEstimate:
+    """Estimated cost of covering a range with one source mix."""
+    source: str  # api or archive+api
+    requests: int
+    bytes: int
+    seconds: float
+    archive_until: Optional[date] = None  # last UTC day read from archives
+
+
+@dataclass
+class SyncPlan:
+    """Cost estimates for syncing a symbol/timeframe range and the cheapest of them."""
+    symbol: str
+    timeframe: str
+    since_ms: int
+    until_ms: int
+    estimates: List[SourceEstimate] = field(default_factory=list)
+    chosen: Optional[SourceEstimate] = None
+
+
+@dataclass
+class PriceMatrix:
+    """One price field of several symbols aligned on a timeframe grid.
+
+    ``values`` has one row per entry of ``milliseconds`` (candle open
+    times, ascending) and one column per entry of ``symbols``.
+    """
+    milliseconds: np.ndarray
+    symbols: List[str]
+    values: np.ndarray
+    field: str
+    timeframe: str
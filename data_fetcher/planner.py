@@ -0,0 +1,161 @@
+"""Choose between Binance archive ZIPs and the klines API for a sync.
+
+The planner estimates requests, bytes and wall time for each way of
+covering a symbol's range and picks the cheapest. Archives cover completed
+months and days; the API always covers the unpublished recent tail.
+"""
+
+import math
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Set, Tuple
+
+from data_fetcher.models import SourceEstimate, SyncPlan
+from data_fetcher.providers.binance_archive import (
+    ARCHIVE_TIMEFRAMES,
+    _period_end_ms,
+    _periods_for_range,
+    period_label,
+)
+from data_fetcher.storage.sqlite import TIMEFRAME_MS, SQLiteStore
+
+#: Candles returned by one klines API request.
+API_PAGE_LIMIT = 1000
+
+#: Round-trip time of one klines API request, before any pacing sleep.
+API_LATENCY_SECONDS = 0.2
+
+#: JSON size of one candle in a klines API response.
+API_BYTES_PER_CANDLE = 70
+
+#: Time to first byte of one archive ZIP download.
+ARCHIVE_LATENCY_SECONDS = 0.3
+
+#: Compressed size of one candle in an archive ZIP, plus fixed overhead per file.
+ARCHIVE_BYTES_PER_CANDLE = 45
+ARCHIVE_BYTES_PER_FILE = 1024
+
+#: Sustained archive download throughput across all workers.
+ARCHIVE_BYTES_PER_SECOND = 20_000_000
+
+#: Time to decode one archive candle.
+ARCHIVE_DECODE_SECONDS_PER_CANDLE = 2e-6
+
+
+def _bars(start_ms: int, end_ms: int, timeframe: str) -> int:
+    """Return the number of candles opening in ``[start_ms, end_ms]``."""
+    if end_ms < start_ms:
+        return 0
+    return (end_ms - start_ms) // TIMEFRAME_MS[timeframe] + 1
+
+
+def _day_start_ms(day: date) -> int:
+    return int(datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def estimate_api(bars: int, sleep_seconds: float = 0.0) -> SourceEstimate:
+    """Estimate paginating ``bars`` candles through the klines API."""
+    requests = math.ceil(bars / API_PAGE_LIMIT)
+    return SourceEstimate(
+        source="api",
+        requests=requests,
+        bytes=bars * API_BYTES_PER_CANDLE,
+        seconds=requests * (API_LATENCY_SECONDS + sleep_seconds),
+    )
+
+
+def estimate_archive(files: int, bars: int, download_workers: int) -> SourceEstimate:
+    """Estimate downloading and decoding ``files`` archive ZIPs holding ``bars`` candles."""
+    size = files * ARCHIVE_BYTES_PER_FILE + bars * ARCHIVE_BYTES_PER_CANDLE
+    seconds = (
+        math.ceil(files / max(1, download_workers)) * ARCHIVE_LATENCY_SECONDS
+        + size / ARCHIVE_BYTES_PER_SECOND
+        + bars * ARCHIVE_DECODE_SECONDS_PER_CANDLE
+    )
+    return SourceEstimate(source="archive", requests=files, bytes=size, seconds=seconds)
+
+
+def plan_sync(
+    exchange: str,
+    symbol: str,
+    timeframe: str,
+    since_ms: int,
+    until_ms: int,
+    download_workers: int = 8,
+    sleep_seconds: float = 0.0,
+    today: Optional[date] = None,
+    store: Optional[SQLiteStore] = None,
+    resume: bool = True,
+) -> SyncPlan:
+    """Estimate an API-only sync and, on Binance, an archive-plus-API-tail sync.
+
+    The hybrid plan reads archive files for every completed day in range
+    (monthly ZIPs for completed months, daily ZIPs for the current month)
+    and paginates the API only from today onwards. It is only offered for
+    timeframes in :data:`ARCHIVE_TIMEFRAMES`.
+
+    With ``store``, both plans start at the symbol's cached listing date,
+    files in the archive manifest (with ``resume``) cost nothing, and
+    candles of files in the missing-archive cache are charged to the API,
+    as :func:`ingest_binance_archives` will skip them.
+    """
+    if timeframe not in TIMEFRAME_MS:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+
+    first_month: Optional[date] = None
+    skip: Set[Tuple[str, str]] = set()
+    missing: Set[Tuple[str, str]] = set()
+    if store is not None:
+        listing_ms = store.get_listing_start(exchange, symbol)
+        if listing_ms is not None:
+            since_ms = max(since_ms, listing_ms)
+            listed = datetime.fromtimestamp(listing_ms / 1000, tz=timezone.utc).date()
+            first_month = date(listed.year, listed.month, 1)
+        if exchange == "binance" and timeframe in ARCHIVE_TIMEFRAMES:
+            missing = store.get_missing_archives(exchange, symbol, timeframe)
+            if resume:
+                skip = set(store.get_archive_manifest(exchange, symbol, timeframe))
+
+    plan = SyncPlan(symbol=symbol, timeframe=timeframe, since_ms=since_ms, until_ms=until_ms)
+    plan.estimates.append(estimate_api(_bars(since_ms, until_ms, timeframe), sleep_seconds))
+    plan.chosen = plan.estimates[0]
+    if exchange != "binance" or timeframe not in ARCHIVE_TIMEFRAMES:
+        return plan
+
+    today = today or datetime.now(timezone.utc).date()
+    since_day = datetime.fromtimestamp(since_ms / 1000, tz=timezone.utc).date()
+    until_day = datetime.fromtimestamp(until_ms / 1000, tz=timezone.utc).date()
+    archive_until = min(until_day, today - timedelta(days=1))
+    if archive_until < since_day:
+        return plan
+
+    tail_start_ms = _day_start_ms(archive_until + timedelta(days=1))
+    files = archive_bars = missing_bars = 0
+    for granularity, period in _periods_for_range(
+        since_day, archive_until, include_daily_current_month=True, first_month=first_month
+    ):
+        label = (granularity, period_label(period, granularity))
+        if label in skip:
+            continue
+        bars = _bars(
+            max(since_ms, _day_start_ms(period)),
+            min(tail_start_ms, _period_end_ms(period, granularity)) - 1,
+            timeframe,
+        )
+        if label in missing:
+            missing_bars += bars
+        else:
+            files += 1
+            archive_bars += bars
+    archive = estimate_archive(files, archive_bars, download_workers)
+    tail = estimate_api(missing_bars + _bars(tail_start_ms, until_ms, timeframe), sleep_seconds)
+    plan.estimates.append(
+        SourceEstimate(
+            source="archive+api",
+            requests=archive.requests + tail.requests,
+            bytes=archive.bytes + tail.bytes,
+            seconds=archive.seconds + tail.seconds,
+            archive_until=archive_until,
+        )
+    )
+    plan.chosen = min(plan.estimates, key=lambda e: e.seconds)
+    return plan
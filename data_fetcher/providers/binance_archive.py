@@ -2,16 +2,30 @@
 
 from __future__ import annotations
 
-import csv
+import hashlib
+import http.client
+import io
 import logging
+import multiprocessing
+import os
+import shutil
+import threading
+import time
 import zipfile
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Iterator, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from urllib.error import HTTPError, URLError
-from urllib.request import urlretrieve
+from urllib.parse import urlencode, urljoin, urlsplit
+from xml.etree import ElementTree
 
+import numpy as np
+import pandas as pd
+
+from data_fetcher.models import ArchiveFile
 from data_fetcher.storage.sqlite import SQLiteStore
 
 logger = logging.getLogger(__name__)
@@ -19,6 +33,24 @@ logger = logging.getLogger(__name__)
 BINANCE_ARCHIVE_BASE_URL = "https://data.binance.vision/data/spot"
 BINANCE_SPOT_ARCHIVE_START = date(2017, 1, 1)
 
+#: S3 bucket listing behind data.binance.vision.
+BINANCE_ARCHIVE_LISTING_URL = "https://s3-ap-northeast-1.amazonaws.com/data.binance.vision"
+
+#: Timeframes the archive publishes under their ccxt names. Monthly candles
+#: are published as ``1mo``, not ``1M``.
+ARCHIVE_TIMEFRAMES = frozenset(
+    {"1m", "3m", "5m", "15m", "30m", "1h", "2h", "4h", "6h", "8h", "12h", "1d", "3d", "1w"}
+)
+
+#: Archive files downloaded at once for one symbol.
+DEFAULT_DOWNLOAD_WORKERS = 8
+
+#: Worker processes decoding archive ZIPs; 1 decodes on the writer thread.
+DEFAULT_DECODE_WORKERS = os.cpu_count() or 1
+
+#: Decoded files each decode worker may hold ahead of the SQLite writer.
+DECODE_BACKLOG_PER_WORKER = 2
+
 
 @dataclass
 class ArchiveIngestResult:
@@ -28,8 +60,14 @@ class ArchiveIngestResult:
     files_downloaded: int = 0
     files_missing: int = 0
     files_cached: int = 0
+    files_skipped: int = 0
     candles_seen: int = 0
     rows_inserted: int = 0
+    # Busy seconds summed over each stage's workers.
+    download_bytes: int = 0
+    download_seconds: float = 0.0
+    decode_seconds: float = 0.0
+    write_seconds: float = 0.0
 
 
 def binance_archive_symbol(symbol: str) -> str:
@@ -64,15 +102,35 @@ def _days(start: date, end: date) -> Iterator[date]:
         current += timedelta(days=1)
 
 
-def archive_filename(symbol_id: str, timeframe: str, period: date, granularity: str) -> str:
-    """Return the expected Binance archive ZIP filename."""
+def period_label(period: date, granularity: str) -> str:
+    """Return the period part of an archive filename (YYYY-MM or YYYY-MM-DD)."""
     if granularity == "monthly":
-        suffix = period.strftime("%Y-%m")
-    elif granularity == "daily":
-        suffix = period.strftime("%Y-%m-%d")
+        return period.strftime("%Y-%m")
+    if granularity == "daily":
+        return period.strftime("%Y-%m-%d")
+    raise ValueError(f"Unsupported archive granularity: {granularity}")
+
+
+def _period_end_ms(period: date, granularity: str) -> int:
+    """Return the exclusive end of an archive period in epoch milliseconds."""
+    if granularity == "monthly":
+        end = date(period.year + period.month // 12, period.month % 12 + 1, 1)
     else:
-        raise ValueError(f"Unsupported archive granularity: {granularity}")
-    return f"{symbol_id}-{timeframe}-{suffix}.zip"
+        end = period + timedelta(days=1)
+    return int(datetime.combine(end, datetime.min.time(), tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def archive_filename(symbol_id: str, timeframe: str, period: date, granularity: str) -> str:
+    """Return the expected Binance archive ZIP filename."""
+    return f"{symbol_id}-{timeframe}-{period_label(period, granularity)}.zip"
 
 
 def archive_url(symbol_id: str, timeframe: str, period: date, granularity: str) -> str:
@@ -104,7 +162,109 @@ def local_archive_path(
     )
 
 
-def _download_archive(url: str, destination: Path) -> str:
+class ArchiveHTTPClient:
+    """Keep-alive HTTPS client shared by archive download threads.
+
+    Every thread keeps one persistent connection per host, so a pool of
+    download threads reuses a few TLS sessions instead of opening a new
+    one per ZIP file. Connections only outlive a download pool when the
+    pool does, so callers ingesting many symbols should share one pool as
+    well as the client.
+    """
+
+    def __init__(self, timeout: float = 60.0, max_redirects: int = 3):
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self._lock = threading.Lock()
+        self._connections: Dict[threading.Thread, Dict[Tuple[str, str], http.client.HTTPConnection]] = {}
+
+    def _connection(self, scheme: str, host: str) -> http.client.HTTPConnection:
+        with self._lock:
+            connections = self._connections.setdefault(threading.current_thread(), {})
+        conn = connections.get((scheme, host))
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = conn_class(host, timeout=self.timeout)
+            connections[(scheme, host)] = conn
+        return conn
+
+    def _get(self, url: str) -> http.client.HTTPResponse:
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        conn = self._connection(parts.scheme, parts.netloc)
+        try:
+            conn.request("GET", path)
+            return conn.getresponse()
+        except (http.client.HTTPException, OSError):
+            # The server may have closed the idle keep-alive connection;
+            # retry once on a fresh one.
+            conn.close()
+        try:
+            conn.request("GET", path)
+            return conn.getresponse()
+        except (http.client.HTTPException, OSError) as exc:
+            conn.close()
+            raise URLError(exc) from exc
+
+    def _open(self, url: str) -> Optional[http.client.HTTPResponse]:
+        """Follow redirects and return the 200 response, or None on HTTP 404."""
+        for _ in range(self.max_redirects + 1):
+            response = self._get(url)
+            if response.status in (301, 302, 303, 307, 308):
+                response.read()
+                url = urljoin(url, response.getheader("Location", ""))
+                continue
+            break
+
+        if response.status != 200:
+            response.read()
+            if response.status == 404:
+                return None
+            raise HTTPError(url, response.status, response.reason, response.headers, None)
+        return response
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Return the body of ``url``, or None on HTTP 404."""
+        response = self._open(url)
+        return None if response is None else response.read()
+
+    def download(self, url: str, destination: Path) -> bool:
+        """Stream ``url`` into ``destination``; return False on HTTP 404.
+
+        The body is written to a ``.part`` file that is renamed on success,
+        so an interrupted download never looks like a cached archive.
+        """
+        response = self._open(url)
+        if response is None:
+            return False
+
+        partial = destination.with_name(destination.name + ".part")
+        try:
+            with open(partial, "wb") as f:
+                shutil.copyfileobj(response, f, 1024 * 1024)
+            os.replace(partial, destination)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        return True
+
+    def close_exited_threads(self) -> None:
+        """Close the connections of threads that have exited, e.g. a shut-down pool's."""
+        with self._lock:
+            exited = [thread for thread in self._connections if not thread.is_alive()]
+            for thread in exited:
+                for conn in self._connections.pop(thread).values():
+                    conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            for connections in self._connections.values():
+                for conn in connections.values():
+                    conn.close()
+            self._connections.clear()
+
+
+def _download_archive(url: str, destination: Path, client: ArchiveHTTPClient) -> str:
     """Download an archive file if available.
 
     Returns one of: downloaded, cached, missing.
@@ -113,62 +273,146 @@ def _download_archive(url: str, destination: Path) -> str:
         return "cached"
 
     destination.parent.mkdir(parents=True, exist_ok=True)
-    try:
-        urlretrieve(url, destination)
-        if destination.stat().st_size == 0:
-            destination.unlink(missing_ok=True)
-            return "missing"
-        return "downloaded"
-    except HTTPError as exc:
+    if not client.download(url, destination):
+        return "missing"
+    if destination.stat().st_size == 0:
         destination.unlink(missing_ok=True)
-        if exc.code == 404:
-            return "missing"
-        raise
-    except URLError:
-        destination.unlink(missing_ok=True)
-        raise
+        return "missing"
+    return "downloaded"
+
 
+def _timed_download(url: str, destination: Path, client: ArchiveHTTPClient) -> Tuple[str, float]:
+    started = time.perf_counter()
+    status = _download_archive(url, destination, client)
+    return status, time.perf_counter() - started
 
-def _iter_zip_klines(path: Path) -> Iterator[Tuple[int, float, float, float, float, float]]:
-    """Yield OHLCV tuples from a Binance kline ZIP."""
+
+#: Leading kline CSV columns: open time, open, high, low, close, volume.
+KLINE_COLUMNS = ["milliseconds", "open", "high", "low", "price", "volume"]
+
+
+def _read_zip_klines(path: Path) -> pd.DataFrame:
+    """Decode a Binance kline ZIP into an OHLCV frame with the C CSV parser.
+
+    Header lines and malformed rows are dropped. ``milliseconds`` is int64
+    and the price/volume columns are float64.
+    """
     with zipfile.ZipFile(path) as zf:
         names = [name for name in zf.namelist() if not name.endswith("/")]
         if not names:
-            return
-        with zf.open(names[0]) as raw:
-            reader = csv.reader(line.decode("utf-8") for line in raw)
-            for row in reader:
-                if len(row) < 6:
-                    continue
-                try:
-                    yield (
-                        int(row[0]),
-                        float(row[1]),
-                        float(row[2]),
-                        float(row[3]),
-                        float(row[4]),
-                        float(row[5]),
-                    )
-                except ValueError:
-                    continue
+            return pd.DataFrame({column: [] for column in KLINE_COLUMNS})
+        data = zf.read(names[0])
+
+    # Newer archive files start with a header line; skipping it up front
+    # keeps every column on the parser's fast numeric path.
+    has_header = bool(data) and not data[:1].isdigit()
+    frame = pd.read_csv(
+        io.BytesIO(data),
+        header=None,
+        skiprows=1 if has_header else 0,
+        usecols=range(len(KLINE_COLUMNS)),
+        names=KLINE_COLUMNS,
+        engine="c",
+    )
 
+    for column in KLINE_COLUMNS:
+        if not pd.api.types.is_numeric_dtype(frame[column]):
+            frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    frame = frame.dropna()
+    return frame.astype({"milliseconds": np.int64, **{c: np.float64 for c in KLINE_COLUMNS[1:]}})
 
-def _iso8601_from_ms(milliseconds: int) -> str:
-    return (
-        datetime.fromtimestamp(milliseconds / 1000, tz=timezone.utc)
-        .isoformat()
-        .replace("+00:00", "Z")
+
+def _iso8601_array(milliseconds: np.ndarray) -> np.ndarray:
+    """Format epoch milliseconds as ISO 8601 UTC strings like ``2024-01-01T00:00:00Z``.
+
+    Timestamps with a sub-second part keep microsecond precision.
+    """
+    instants = milliseconds.astype("datetime64[ms]")
+    whole_seconds = np.datetime_as_string(instants, unit="s")
+    if (milliseconds % 1000 != 0).any():
+        fractional = np.datetime_as_string(instants, unit="us")
+        whole_seconds = np.where(milliseconds % 1000 == 0, whole_seconds, fractional)
+    return np.char.add(whole_seconds, "Z")
+
+
+@dataclass
+class _DecodedArchive:
+    klines: pd.DataFrame
+    timestamps: np.ndarray
+    complete: bool
+    size_bytes: int
+    sha256: str
+    seconds: float
+
+
+def _decode_archive(path: Path, bound_since_ms: int, since_ms: int, until_ms: int) -> _DecodedArchive:
+    """Decode, clip and checksum one archive ZIP; runs in a decode worker process."""
+    started = time.perf_counter()
+    klines = _read_zip_klines(path)
+    milliseconds = klines["milliseconds"].to_numpy()
+    # Files cut by the caller's since/until bounds are not recorded,
+    # so a later run with wider bounds still reads them.
+    complete = bool(((milliseconds >= bound_since_ms) & (milliseconds <= until_ms)).all())
+    in_range = (milliseconds >= since_ms) & (milliseconds <= until_ms)
+    if not in_range.all():
+        klines = klines[in_range]
+        milliseconds = milliseconds[in_range]
+    return _DecodedArchive(
+        klines=klines,
+        timestamps=_iso8601_array(milliseconds),
+        complete=complete,
+        size_bytes=path.stat().st_size,
+        sha256=_sha256(path),
+        seconds=time.perf_counter() - started,
     )
 
 
+def create_decode_pool(workers: int = DEFAULT_DECODE_WORKERS) -> ProcessPoolExecutor:
+    """Return a process pool for :func:`ingest_binance_archives` to decode ZIPs in.
+
+    Workers are spawned rather than forked: the ingesting process already
+    runs download threads, whose locks a fork could copy mid-use.
+    """
+    return ProcessPoolExecutor(max_workers=max(1, workers), mp_context=multiprocessing.get_context("spawn"))
+
+
+def first_archive_month(symbol_id: str, timeframe: str, client: ArchiveHTTPClient) -> Optional[date]:
+    """Return the first month with a monthly archive ZIP, from the bucket listing.
+
+    Keys are listed in lexical order, so the first ZIP is the listing month.
+    A symbol without monthly files yet starts in the current month. Returns
+    None when the listing is unavailable.
+    """
+    prefix = f"data/spot/monthly/klines/{symbol_id}/{timeframe}/"
+    query = urlencode({"prefix": prefix, "max-keys": 2})
+    try:
+        body = client.get(f"{BINANCE_ARCHIVE_LISTING_URL}?{query}")
+        if body is None:
+            return None
+        root = ElementTree.fromstring(body)
+    except (HTTPError, URLError, ElementTree.ParseError) as exc:
+        logger.debug("Archive listing for %s %s unavailable: %s", symbol_id, timeframe, exc)
+        return None
+
+    for element in root.iter():
+        if element.tag.endswith("Key") and element.text and element.text.endswith(".zip"):
+            suffix = element.text[: -len(".zip")].rsplit("-", 2)
+            return date(int(suffix[-2]), int(suffix[-1]), 1)
+    today = datetime.now(timezone.utc).date()
+    return date(today.year, today.month, 1)
+
+
 def _periods_for_range(
     start: date,
     end: date,
     include_daily_current_month: bool,
+    first_month: Optional[date] = None,
 ) -> List[Tuple[str, date]]:
     today = datetime.now(timezone.utc).date()
     current_month = date(today.year, today.month, 1)
     periods: List[Tuple[str, date]] = []
+    if first_month is not None:
+        start = max(start, first_month)
 
     for month in _month_starts(start, end):
         if include_daily_current_month and month >= current_month:
@@ -194,58 +438,199 @@ def ingest_binance_archives(
     resume: bool = True,
     include_daily_current_month: bool = True,
     chunk_size: int = 10_000,
+    download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    client: Optional[ArchiveHTTPClient] = None,
+    decode_workers: int = DEFAULT_DECODE_WORKERS,
+    decode_pool: Optional[Executor] = None,
+    download_pool: Optional[Executor] = None,
 ) -> ArchiveIngestResult:
-    """Download Binance archive ZIPs and insert their candles into SQLite."""
+    """Download Binance archive ZIPs and insert their candles into SQLite.
+
+    Ingestion runs as three overlapping stages. Files are downloaded in
+    ``download_pool``, or in a private pool of ``download_workers`` threads
+    when omitted, over ``client`` (a private :class:`ArchiveHTTPClient`
+    when omitted) into the cache directory. Pass both to keep connections
+    alive from one symbol to the next.
+    Finished files are decoded in ``decode_pool``, or in a private pool of
+    ``decode_workers`` processes when omitted and there is more than one
+    file; with one worker they are decoded on the calling thread. The
+    calling thread is the single writer: it inserts decoded files in period
+    order, batching at least ``chunk_size`` rows per transaction, and stops
+    queueing decodes once ``DECODE_BACKLOG_PER_WORKER`` files per worker are
+    waiting so memory stays bounded. Each stage's busy time is reported on
+    the result.
+
+    Every ingested file is recorded in the store's archive manifest once its
+    rows are committed. With ``resume``, files already in the manifest and
+    periods that end before the latest stored candle are skipped without
+    being downloaded or opened.
+
+    Planning starts at the symbol's first month when it is known, either
+    from cached listing dates or, for a symbol with no local data, from the
+    archive bucket listing. Files that return 404 go into the store's
+    negative cache and are not requested again until it expires.
+    """
     result = ArchiveIngestResult(symbol=symbol)
     symbol_id = binance_archive_symbol(symbol)
 
-    local_max_ms: Optional[int] = None
-    if resume:
-        local_max_ms = store.get_max_timestamp("binance", symbol, timeframe)
+    stored_max_ms = store.get_max_timestamp("binance", symbol, timeframe)
+    local_max_ms = stored_max_ms if resume else None
 
-    since_ms = int(datetime.combine(since, datetime.min.time(), tzinfo=timezone.utc).timestamp() * 1000)
+    bound_since_ms = int(datetime.combine(since, datetime.min.time(), tzinfo=timezone.utc).timestamp() * 1000)
     until_ms = int(datetime.combine(until, datetime.max.time(), tzinfo=timezone.utc).timestamp() * 1000)
+    since_ms = bound_since_ms
     if local_max_ms is not None:
         since_ms = max(since_ms, local_max_ms + 1)
 
-    rows: List[Tuple] = []
-    for granularity, period in _periods_for_range(since, until, include_daily_current_month):
-        path = local_archive_path(cache_dir, symbol_id, timeframe, period, granularity)
-        status = _download_archive(
-            archive_url(symbol_id, timeframe, period, granularity),
-            path,
-        )
-        if status == "missing":
-            result.files_missing += 1
-            continue
-        if status == "downloaded":
-            result.files_downloaded += 1
-        elif status == "cached":
-            result.files_cached += 1
-
-        for ms, open_, high, low, close, volume in _iter_zip_klines(path):
-            if ms < since_ms or ms > until_ms:
-                continue
-            result.candles_seen += 1
-            rows.append(
-                (
-                    ms,
-                    _iso8601_from_ms(ms),
-                    "binance",
-                    symbol,
-                    timeframe,
-                    open_,
-                    high,
-                    low,
-                    close,
-                    volume,
+    owns_client = client is None
+    if client is None:
+        client = ArchiveHTTPClient()
+    owns_download_pool = download_pool is None
+    if download_pool is None:
+        download_pool = ThreadPoolExecutor(max_workers=max(1, download_workers))
+    owns_decode_pool = False
+    downloads: List[Future] = []
+    try:
+        first_month: Optional[date] = None
+        listing_ms = store.get_listing_start("binance", symbol)
+        if listing_ms is not None:
+            listed = datetime.fromtimestamp(listing_ms / 1000, tz=timezone.utc).date()
+            first_month = date(listed.year, listed.month, 1)
+        elif stored_max_ms is None:
+            first_month = first_archive_month(symbol_id, timeframe, client)
+
+        skip = store.get_missing_archives("binance", symbol, timeframe)
+        if resume:
+            skip |= set(store.get_archive_manifest("binance", symbol, timeframe))
+        periods = []
+        for granularity, period in _periods_for_range(since, until, include_daily_current_month, first_month):
+            if (granularity, period_label(period, granularity)) in skip or (
+                resume and local_max_ms is not None and _period_end_ms(period, granularity) <= local_max_ms + 1
+            ):
+                result.files_skipped += 1
+            else:
+                periods.append((granularity, period))
+        paths = [
+            local_archive_path(cache_dir, symbol_id, timeframe, period, granularity)
+            for granularity, period in periods
+        ]
+
+        # Downloads land in the cache directory, so they may run ahead of
+        # decoding without holding anything in memory.
+        downloads = [
+            download_pool.submit(
+                _timed_download,
+                archive_url(symbol_id, timeframe, period, granularity),
+                path,
+                client,
+            )
+            for (granularity, period), path in zip(periods, paths)
+        ]
+
+        if decode_pool is None and decode_workers > 1 and len(periods) > 1:
+            decode_pool = create_decode_pool(min(decode_workers, len(periods)))
+            owns_decode_pool = True
+        backlog = max(1, decode_workers if decode_pool is not None else 1) * DECODE_BACKLOG_PER_WORKER
+
+        rows: List[Tuple] = []
+        ingested: List[ArchiveFile] = []
+        missing: List[Tuple[str, str, int]] = []
+
+        def flush() -> None:
+            nonlocal rows, ingested
+            started = time.perf_counter()
+            if rows:
+                result.rows_inserted += store.insert_ohlcv(rows)
+            store.record_archive_files(ingested)
+            result.write_seconds += time.perf_counter() - started
+            rows, ingested = [], []
+
+        def write(granularity: str, period: date, decoding: Future) -> None:
+            decoded: _DecodedArchive = decoding.result()
+            result.decode_seconds += decoded.seconds
+            started = time.perf_counter()
+            klines = decoded.klines
+            count = len(klines)
+            result.candles_seen += count
+            rows.extend(
+                zip(
+                    klines["milliseconds"].tolist(),
+                    decoded.timestamps.tolist(),
+                    ["binance"] * count,
+                    [symbol] * count,
+                    [timeframe] * count,
+                    klines["open"].tolist(),
+                    klines["high"].tolist(),
+                    klines["low"].tolist(),
+                    klines["price"].tolist(),
+                    klines["volume"].tolist(),
                 )
             )
+            if decoded.complete:
+                ingested.append(
+                    ArchiveFile(
+                        exchange="binance",
+                        symbol=symbol,
+                        timeframe=timeframe,
+                        granularity=granularity,
+                        period=period_label(period, granularity),
+                        size_bytes=decoded.size_bytes,
+                        sha256=decoded.sha256,
+                        rows=count,
+                        ingested_at_ms=int(time.time() * 1000),
+                    )
+                )
+            result.write_seconds += time.perf_counter() - started
+            # Flush on file boundaries so manifest entries are only written
+            # once all of their rows are committed.
             if len(rows) >= chunk_size:
-                result.rows_inserted += store.insert_ohlcv(rows)
-                rows = []
-
-    if rows:
-        result.rows_inserted += store.insert_ohlcv(rows)
+                flush()
+
+        # Files are written in period order so an interrupted run never
+        # leaves a later period stored ahead of an earlier one, which
+        # resume would otherwise treat as covered.
+        pending: deque = deque()
+        for (granularity, period), path, download in zip(periods, paths, downloads):
+            status, seconds = download.result()
+            result.download_seconds += seconds
+            if status == "missing":
+                result.files_missing += 1
+                missing.append(
+                    (granularity, period_label(period, granularity), _period_end_ms(period, granularity))
+                )
+                continue
+            if status == "downloaded":
+                result.files_downloaded += 1
+                result.download_bytes += path.stat().st_size
+            elif status == "cached":
+                result.files_cached += 1
+
+            if decode_pool is not None:
+                decoding = decode_pool.submit(_decode_archive, path, bound_since_ms, since_ms, until_ms)
+            else:
+                decoding = Future()
+                decoding.set_result(_decode_archive(path, bound_since_ms, since_ms, until_ms))
+            pending.append((granularity, period, decoding))
+            while len(pending) >= backlog:
+                write(*pending.popleft())
+
+        while pending:
+            write(*pending.popleft())
+        flush()
+        store.record_missing_archives("binance", symbol, timeframe, missing)
+    finally:
+        if owns_download_pool:
+            download_pool.shutdown(wait=True, cancel_futures=True)
+            # Its threads are gone, so their connections would never be reused.
+            client.close_exited_threads()
+        else:
+            # Leave the shared pool idle for the next call.
+            for download in downloads:
+                download.cancel()
+            wait(downloads)
+        if owns_decode_pool:
+            decode_pool.shutdown(wait=True, cancel_futures=True)
+        if owns_client:
+            client.close()
 
     return result
@@ -1,30 +1,344 @@
 """Crypto OHLCV data provider using CCXT."""
 
+import asyncio
 import ccxt
+import json
 import logging
-from typing import Dict, List, Optional, Tuple, Union
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from data_fetcher.models import Gap, SymbolListing
+
+if TYPE_CHECKING:
+    from data_fetcher.storage.sqlite import SQLiteStore
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_EXCHANGE = "binance"
 
 
-def create_exchange(exchange_id: str = DEFAULT_EXCHANGE) -> ccxt.Exchange:
+#: Directory holding one ``load_markets`` payload per exchange id.
+MARKETS_CACHE_DIR = Path("data/markets_cache")
+
+#: Cached market metadata older than this is downloaded again.
+MARKETS_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+def _markets_cache_path(cache_dir: Path, exchange_id: str) -> Path:
+    return Path(cache_dir).expanduser() / f"{exchange_id}_markets.json"
+
+
+def read_markets_cache(
+    exchange_id: str,
+    cache_dir: Path = MARKETS_CACHE_DIR,
+    ttl_seconds: float = MARKETS_CACHE_TTL_SECONDS,
+) -> Optional[Tuple[Dict, Optional[Dict]]]:
+    """Return cached ``(markets, currencies)`` or None when missing, stale or unreadable."""
+    path = _markets_cache_path(cache_dir, exchange_id)
+    try:
+        if time.time() - path.stat().st_mtime > ttl_seconds:
+            return None
+        with open(path) as f:
+            payload = json.load(f)
+        return payload["markets"], payload.get("currencies")
+    except (OSError, ValueError, KeyError) as exc:
+        if not isinstance(exc, FileNotFoundError):
+            logger.warning("Ignoring unreadable markets cache %s: %s", path, exc)
+        return None
+
+
+def write_markets_cache(exchange, exchange_id: str, cache_dir: Path = MARKETS_CACHE_DIR) -> None:
+    """Save an exchange's loaded markets and currencies for :func:`read_markets_cache`.
+
+    The file is replaced atomically, so concurrent readers never see a
+    partial payload. Write failures are logged and otherwise ignored.
+    """
+    path = _markets_cache_path(cache_dir, exchange_id)
+    try:
+        payload = json.dumps({"markets": exchange.markets, "currencies": exchange.currencies})
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=path.parent, prefix=f".{exchange_id}_", suffix=".tmp", delete=False
+        ) as f:
+            f.write(payload)
+        os.replace(f.name, path)
+    except (OSError, TypeError, ValueError) as exc:
+        logger.warning("Could not write markets cache %s: %s", path, exc)
+
+
+def _apply_cached_markets(
+    exchange,
+    exchange_id: str,
+    cache_dir: Optional[Path],
+    refresh_markets: bool,
+) -> bool:
+    """Load cached markets into ``exchange``; return False when it needs ``load_markets``."""
+    if cache_dir is None or refresh_markets:
+        return False
+    cached = read_markets_cache(exchange_id, cache_dir)
+    if cached is None:
+        return False
+    markets, currencies = cached
+    exchange.set_markets(markets, currencies)
+    return True
+
+
+def create_exchange(
+    exchange_id: str = DEFAULT_EXCHANGE,
+    refresh_markets: bool = False,
+    markets_cache_dir: Optional[Path] = MARKETS_CACHE_DIR,
+) -> ccxt.Exchange:
+    """Create a CCXT exchange with its markets loaded.
+
+    Markets come from the on-disk cache in ``markets_cache_dir`` while it is
+    younger than :data:`MARKETS_CACHE_TTL_SECONDS`. Otherwise, or with
+    ``refresh_markets``, they are downloaded and the cache is rewritten.
+    Pass ``markets_cache_dir=None`` to skip the cache entirely.
+    """
     exchange_class = getattr(ccxt, exchange_id, None)
     if exchange_class is None:
         raise ValueError(f"Unknown CCXT exchange: {exchange_id}")
     exchange = exchange_class()
-    exchange.load_markets()
+    if not _apply_cached_markets(exchange, exchange_id, markets_cache_dir, refresh_markets):
+        exchange.load_markets()
+        if markets_cache_dir is not None:
+            write_markets_cache(exchange, exchange_id, markets_cache_dir)
     return exchange
 
 
+#: Earliest ``since`` the probe search will consider.
+PROBE_SEARCH_FLOOR_MS = 1262304000000  # 2010-01-01T00:00:00Z
+
+#: Candles requested per search probe. Exchanges that only answer within a
+#: ``since + limit`` window can end the search earlier with a wider window.
+PROBE_LIMIT = 500
+
+Candles = List[List[Union[int, float]]]
+
+#: A probe plan yields ``(since, limit)`` requests and is sent back each
+#: response (``None`` when the request raised). It returns the earliest
+#: timestamp and the method that found it.
+ProbePlan = Generator[Tuple[int, int], Optional[Candles], Tuple[Optional[int], str]]
+
+
+def precision_decimals(value: Optional[Union[int, float]], precision_mode: int) -> Optional[int]:
+    """Return the decimal places of a CCXT market precision value.
+
+    ``TICK_SIZE`` exchanges report the increment (``0.01``) and
+    ``DECIMAL_PLACES`` exchanges the count (``2``); significant-digit
+    precision has no fixed number of decimals and returns ``None``.
+    """
+    if value is None:
+        return None
+    if precision_mode == ccxt.DECIMAL_PLACES:
+        return max(0, int(value))
+    if precision_mode == ccxt.TICK_SIZE:
+        return max(0, -Decimal(str(value)).normalize().as_tuple().exponent)
+    return None
+
+
+def _candle_spacing_ms(timeframe: str) -> Tuple[int, int]:
+    """Return the minimum and maximum distance between consecutive candles."""
+    interval_ms = int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+    if timeframe.endswith("M"):
+        # Calendar months are 28 to 31 days long; CCXT counts 30.
+        months = max(1, interval_ms // 2_592_000_000)
+        return months * 28 * 86400_000, months * 31 * 86400_000
+    return interval_ms, interval_ms
+
+
+def _earliest_timestamp_probes(
+    now_ms: int,
+    timeframe: str,
+    max_probes: int,
+) -> ProbePlan:
+    """Plan the requests used to find a symbol's first candle.
+
+    The plan does no I/O itself so the sync and async fetchers share it.
+    The search assumes candles are contiguous after listing, so a response
+    whose first candle starts a whole interval after ``since`` holds the
+    listing candle. It gallops back from ``now_ms`` with doubling steps
+    until it has seen data (``hi``) and an empty window before it (``lo``),
+    then bisects ``lo < earliest <= hi`` down to one candle. That takes
+    O(log n) requests and returns an exact timestamp for ``timeframe``.
+    """
+    # Strategy 1: try since=0 with limit=1
+    candles = yield 0, 1
+    if candles:
+        ts = int(candles[0][0])
+        if ts < now_ms - 86400_000 * 90:
+            return ts, "since_zero"
+
+    # Strategy 2: exponential then binary search over since
+    min_spacing, max_spacing = _candle_spacing_ms(timeframe)
+    lo: Optional[int] = None
+    hi: Optional[int] = None
+    step = max_spacing * PROBE_LIMIT
+    probes = 0
+
+    while probes < max_probes:
+        if lo is not None and hi is not None:
+            if hi - lo <= min_spacing:
+                return hi, "binary_search"
+            since = lo + (hi - lo) // 2
+        else:
+            since = max(PROBE_SEARCH_FLOOR_MS, (hi if hi is not None else now_ms) - step)
+            step *= 2
+
+        candles = yield since, PROBE_LIMIT
+        probes += 1
+        if candles is None:
+            # The request raised; retry the same bounds on the next probe.
+            continue
+
+        first = next((int(c[0]) for c in candles if int(c[0]) >= since), None)
+        if first is None:
+            if hi is not None:
+                lo = since
+            elif since <= PROBE_SEARCH_FLOOR_MS:
+                return None, "failed"
+            # Before any data is seen an empty window may just mean the
+            # market was delisted, so it does not bound the search yet.
+            continue
+
+        if first - since >= max_spacing:
+            return first, "binary_search"
+        hi = first if hi is None else min(hi, first)
+        if lo is None and since <= PROBE_SEARCH_FLOOR_MS:
+            return hi, "binary_search"
+
+    return None, "failed"
+
+
+def _next_page(
+    candles: Optional[Candles],
+    since: Optional[int],
+    until: Optional[int],
+    limit: int,
+) -> Tuple[Candles, Optional[int]]:
+    """Apply the pagination rules to one response page.
+
+    Returns the candles to keep and the ``since`` of the next request, or
+    ``None`` when pagination is finished.
+    """
+    if not candles:
+        return [], None
+
+    # Filter out candles beyond until before extending
+    if until is not None:
+        candles = [c for c in candles if int(c[0]) <= until]
+    if not candles:
+        return [], None
+
+    last_ts = int(candles[-1][0])
+
+    # Stop if since didn't advance
+    if since is not None and last_ts <= since:
+        return candles, None
+
+    # Stop if we've reached the until bound
+    if until is not None and last_ts >= until:
+        return candles, None
+
+    # If fewer than limit returned, this is the last page
+    if len(candles) < limit:
+        return candles, None
+
+    return candles, last_ts + 1
+
+
+def plan_gap_windows(gaps: List[Gap], timeframe: str, limit: int = 1000) -> List[Tuple[int, int]]:
+    """Merge gaps into the fewest inclusive ``(since, until)`` fetch windows.
+
+    Neighbouring gaps share a window as long as it spans at most ``limit``
+    candles, so each window normally costs a single request. Candles that
+    are already stored inside a merged window are ignored on insert.
+    """
+    min_spacing, _ = _candle_spacing_ms(timeframe)
+    windows: List[Tuple[int, int]] = []
+    for gap in sorted(gaps, key=lambda g: g.after_ms):
+        since, until = gap.after_ms + 1, gap.before_ms - 1
+        if windows and (until - windows[-1][0]) // min_spacing < limit:
+            windows[-1] = (windows[-1][0], until)
+        else:
+            windows.append((since, until))
+    return windows
+
+
+class RateLimiter:
+    """Thread-safe request pacer shared by several fetchers.
+
+    Each call to :meth:`wait` reserves the next request slot, so N workers
+    sharing one limiter together stay within a single exchange budget
+    instead of each applying the CCXT per-instance throttle.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = max(0.0, interval_seconds)
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    @classmethod
+    def for_exchange(cls, exchange: ccxt.Exchange) -> "RateLimiter":
+        """Build a limiter from ``exchange.rateLimit`` (milliseconds)."""
+        rate_limit_ms = getattr(exchange, "rateLimit", 0)
+        if not isinstance(rate_limit_ms, (int, float)):
+            rate_limit_ms = 0
+        return cls(rate_limit_ms / 1000)
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval_seconds
+        if delay > 0:
+            time.sleep(delay)
+
+
 class CryptoDataFetcher:
     """Crypto data fetcher wrapping a CCXT exchange for OHLCV retrieval."""
 
-    def __init__(self, exchange_id: str = DEFAULT_EXCHANGE):
+    def __init__(
+        self,
+        exchange_id: str = DEFAULT_EXCHANGE,
+        rate_limiter: Optional[RateLimiter] = None,
+        refresh_markets: bool = False,
+    ):
         self.exchange_id = exchange_id
-        self.exchange = create_exchange(exchange_id)
+        self.exchange = create_exchange(exchange_id, refresh_markets=refresh_markets)
         self._markets: Dict = self.exchange.markets
+        self.rate_limiter = rate_limiter
+        if rate_limiter is not None:
+            # The shared limiter replaces CCXT's per-instance throttle.
+            self.exchange.enableRateLimit = False
+
+    def _request_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: Optional[int],
+        limit: int,
+    ) -> List[List[Union[int, float]]]:
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait()
+        return self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
 
     def get_markets(self) -> Dict:
         return self._markets
@@ -61,40 +375,34 @@ class CryptoDataFetcher:
             })
         return results
 
+    def get_precision_decimals(self, symbol: str) -> Tuple[Optional[int], Optional[int]]:
+        """Return the price and amount decimal places of a market, where known."""
+        precision = self._markets.get(symbol, {}).get("precision", {})
+        mode = self.exchange.precisionMode
+        return precision_decimals(precision.get("price"), mode), precision_decimals(precision.get("amount"), mode)
+
     def fetch_earliest_timestamp(
-        self, symbol: str, timeframe: str = "1h", max_probes: int = 20
+        self, symbol: str, timeframe: str = "1h", max_probes: int = 64
     ) -> Tuple[Optional[int], str]:
-        # Strategy 1: try since=0 with limit=1
-        try:
-            candles = self.exchange.fetch_ohlcv(symbol, timeframe, since=0, limit=1)
-            if candles and len(candles) > 0:
-                ts = int(candles[0][0])
-                now_ms = int(self.exchange.milliseconds())
-                if ts < now_ms - 86400_000 * 90:
-                    return ts, "since_zero"
-        except Exception:
-            pass
-
-        # Strategy 2: bounded search
-        current_raw = self.exchange.parse8601("2013-01-01T00:00:00Z")
-        if current_raw is None:
-            return None, "failed"
-        current: int = int(current_raw)
-        now_ms = int(self.exchange.milliseconds())
-        probes = 0
-
-        while current < now_ms and probes < max_probes:
-            try:
-                candles = self.exchange.fetch_ohlcv(symbol, timeframe, since=current, limit=1)
-                probes += 1
-                if candles and len(candles) > 0:
-                    return int(candles[0][0]), "probe_search"
-                current += 86400_000 * 30
-            except Exception:
-                current += 86400_000 * 30
-                probes += 1
+        """Return the first available candle timestamp and how it was found.
 
-        return None, "failed"
+        ``method`` is ``since_zero`` when the exchange answered a ``since=0``
+        request directly, ``binary_search`` for the probe search, and
+        ``failed`` when no candle was found within ``max_probes`` requests.
+        """
+        plan = _earliest_timestamp_probes(
+            int(self.exchange.milliseconds()), timeframe, max_probes
+        )
+        candles: Optional[List[List[Union[int, float]]]] = None
+        try:
+            while True:
+                since, limit = plan.send(candles)
+                try:
+                    candles = self._request_ohlcv(symbol, timeframe, since=since, limit=limit)
+                except Exception:
+                    candles = None
+        except StopIteration as stop:
+            return stop.value
 
     def fetch_ohlcv(
         self,
@@ -134,61 +442,274 @@ class CryptoDataFetcher:
             OHLCV rows as [[ms, open, high, low, close, volume], ...].
         """
         all_candles: List[List[Union[int, float]]] = []
+        for page in self.iter_ohlcv_pages(
+            symbol,
+            timeframe=timeframe,
+            since=since,
+            until=until,
+            limit=limit,
+            max_requests=max_requests,
+            sleep_seconds=sleep_seconds,
+        ):
+            all_candles.extend(page)
+        return all_candles
+
+    def iter_ohlcv_pages(
+        self,
+        symbol: str,
+        timeframe: str = "1h",
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: int = 1000,
+        max_requests: Optional[int] = None,
+        sleep_seconds: float = 0.0,
+    ) -> Iterator[List[List[Union[int, float]]]]:
+        """Yield OHLCV candles one non-empty response page at a time.
+
+        Takes the same arguments as :meth:`fetch_ohlcv`, which is a thin
+        wrapper collecting these pages. Consumers that persist each page
+        before asking for the next keep memory flat and can resume from the
+        last stored candle after a crash.
+        """
         request_count = 0
 
         while True:
             if max_requests is not None and request_count >= max_requests:
-                break
+                return
 
             try:
-                candles = self.exchange.fetch_ohlcv(
-                    symbol, timeframe=timeframe, since=since, limit=limit
-                )
+                candles = self._request_ohlcv(symbol, timeframe, since=since, limit=limit)
                 request_count += 1
             except Exception as e:
                 logger.warning("Error fetching %s at %s: %s", symbol, since, e)
-                break
+                return
 
-            if not candles or len(candles) == 0:
-                break
+            page, since = _next_page(candles, since, until, limit)
+            if page:
+                yield page
+            if since is None:
+                return
+
+            # Per-request pacing to respect exchange rate limits
+            if sleep_seconds > 0:
+                time.sleep(sleep_seconds)
 
-            # Filter out candles beyond until before extending
-            if until is not None:
-                candles = [c for c in candles if int(c[0]) <= until]
+    def get_earliest(self, market: str) -> int:
+        ts, _ = self.fetch_earliest_timestamp(market)
+        if ts is None:
+            return int(self.exchange.milliseconds())
+        return ts
 
-            if not candles:
-                break
 
-            all_candles.extend(candles)
+def probe_earliest_timestamps(
+    exchange_id: str,
+    symbols: List[str],
+    timeframe: str = "1h",
+    workers: int = 1,
+    fetcher: Optional[CryptoDataFetcher] = None,
+) -> Dict[str, Tuple[Optional[int], str]]:
+    """Run :meth:`CryptoDataFetcher.fetch_earliest_timestamp` for many symbols.
+
+    With ``workers > 1`` symbols are probed on a thread pool. Each thread
+    owns its own exchange client and all of them share one
+    :class:`RateLimiter`. ``fetcher`` is reused for sequential probing.
+    """
+    if workers <= 1 or len(symbols) <= 1:
+        fetcher = fetcher or CryptoDataFetcher(exchange_id=exchange_id)
+        return {sym: fetcher.fetch_earliest_timestamp(sym, timeframe) for sym in symbols}
+
+    if fetcher is not None:
+        rate_limiter = RateLimiter.for_exchange(fetcher.exchange)
+    else:
+        rate_limiter = RateLimiter.for_exchange(getattr(ccxt, exchange_id, ccxt.Exchange)())
+    local = threading.local()
+
+    def probe(sym: str) -> Tuple[Optional[int], str]:
+        worker_fetcher = getattr(local, "fetcher", None)
+        if worker_fetcher is None:
+            worker_fetcher = CryptoDataFetcher(exchange_id=exchange_id, rate_limiter=rate_limiter)
+            local.fetcher = worker_fetcher
+        return worker_fetcher.fetch_earliest_timestamp(sym, timeframe)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(symbols, pool.map(probe, symbols)))
+
+
+def resolve_listings(
+    store: "SQLiteStore",
+    exchange_id: str,
+    symbols: List[str],
+    timeframe: str = "1h",
+    refresh: bool = False,
+    probe: Optional[Callable[[List[str]], Dict[str, Tuple[Optional[int], str]]]] = None,
+) -> Dict[str, SymbolListing]:
+    """Return listing dates for ``symbols`` from the store's catalog.
+
+    Symbols without a fresh catalog entry (or all of them when ``refresh``
+    is set) are passed to ``probe`` in one batch, defaulting to a sequential
+    :func:`probe_earliest_timestamps`. Results are saved back to the store.
+    """
+    cached = {} if refresh else store.get_listings(exchange_id, timeframe, symbols)
+    missing = [sym for sym in symbols if sym not in cached]
+    if missing:
+        if probe is None:
+            def probe(batch: List[str]) -> Dict[str, Tuple[Optional[int], str]]:
+                return probe_earliest_timestamps(exchange_id, batch, timeframe)
+
+        probed_at_ms = int(time.time() * 1000)
+        probed = [
+            SymbolListing(
+                exchange=exchange_id,
+                symbol=sym,
+                timeframe=timeframe,
+                earliest_ms=ts,
+                method=method,
+                probed_at_ms=probed_at_ms,
+            )
+            for sym, (ts, method) in probe(missing).items()
+        ]
+        store.upsert_listings(probed)
+        cached.update((listing.symbol, listing) for listing in probed)
+    return {sym: cached[sym] for sym in symbols if sym in cached}
+
+
+def create_async_exchange(exchange_id: str = DEFAULT_EXCHANGE, session=None):
+    """Create a ``ccxt.async_support`` exchange, optionally on a shared session."""
+    import ccxt.async_support as ccxt_async
+
+    exchange_class = getattr(ccxt_async, exchange_id, None)
+    if exchange_class is None:
+        raise ValueError(f"Unknown CCXT exchange: {exchange_id}")
+    config = {}
+    if session is not None:
+        config["session"] = session
+    return exchange_class(config)
 
-            if not candles:
-                break
 
-            last_ts = int(candles[-1][0])
+class AsyncCryptoDataFetcher:
+    """Asyncio counterpart of :class:`CryptoDataFetcher`.
 
-            # Stop if since didn't advance
-            if since is not None and last_ts <= since:
-                break
+    All coroutines share one ``ccxt.async_support`` exchange, and therefore
+    one aiohttp session and one CCXT throttle. ``max_concurrency`` bounds the
+    number of requests in flight, so many symbols can paginate at once.
+    Use it as an async context manager so the session is always closed::
 
-            # Stop if we've reached the until bound
-            if until is not None and last_ts >= until:
-                break
+        async with AsyncCryptoDataFetcher("binance", max_concurrency=200) as f:
+            candles = await f.fetch_ohlcv("BTC/USDT", since=0)
+    """
 
-            since = last_ts + 1
+    def __init__(
+        self,
+        exchange_id: str = DEFAULT_EXCHANGE,
+        max_concurrency: int = 100,
+        session=None,
+        refresh_markets: bool = False,
+    ):
+        self.exchange_id = exchange_id
+        self.exchange = create_async_exchange(exchange_id, session=session)
+        self.refresh_markets = refresh_markets
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def __aenter__(self) -> "AsyncCryptoDataFetcher":
+        if not _apply_cached_markets(
+            self.exchange, self.exchange_id, MARKETS_CACHE_DIR, self.refresh_markets
+        ):
+            try:
+                await self.exchange.load_markets()
+            except BaseException:
+                # __aexit__ never runs when __aenter__ raises.
+                await self.close()
+                raise
+            write_markets_cache(self.exchange, self.exchange_id)
+        return self
 
-            # If fewer than limit returned, this is the last page
-            if len(candles) < limit:
-                break
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
 
-            # Per-request pacing to respect exchange rate limits
-            if sleep_seconds > 0:
-                import time
-                time.sleep(sleep_seconds)
+    async def close(self) -> None:
+        await self.exchange.close()
 
+    async def _request_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: Optional[int],
+        limit: int,
+    ) -> List[List[Union[int, float]]]:
+        async with self._semaphore:
+            return await self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+
+    async def fetch_earliest_timestamp(
+        self, symbol: str, timeframe: str = "1h", max_probes: int = 64
+    ) -> Tuple[Optional[int], str]:
+        """Async version of :meth:`CryptoDataFetcher.fetch_earliest_timestamp`."""
+        plan = _earliest_timestamp_probes(
+            int(self.exchange.milliseconds()), timeframe, max_probes
+        )
+        candles: Optional[List[List[Union[int, float]]]] = None
+        try:
+            while True:
+                since, limit = plan.send(candles)
+                try:
+                    candles = await self._request_ohlcv(symbol, timeframe, since=since, limit=limit)
+                except Exception:
+                    candles = None
+        except StopIteration as stop:
+            return stop.value
+
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = "1h",
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: int = 1000,
+        max_requests: Optional[int] = None,
+        sleep_seconds: float = 0.0,
+    ) -> List[List[Union[int, float]]]:
+        """Async version of :meth:`CryptoDataFetcher.fetch_ohlcv`."""
+        all_candles: List[List[Union[int, float]]] = []
+        async for page in self.iter_ohlcv_pages(
+            symbol,
+            timeframe=timeframe,
+            since=since,
+            until=until,
+            limit=limit,
+            max_requests=max_requests,
+            sleep_seconds=sleep_seconds,
+        ):
+            all_candles.extend(page)
         return all_candles
 
-    def get_earliest(self, market: str) -> int:
-        ts, _ = self.fetch_earliest_timestamp(market)
-        if ts is None:
-            return int(self.exchange.milliseconds())
-        return ts
+    async def iter_ohlcv_pages(
+        self,
+        symbol: str,
+        timeframe: str = "1h",
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: int = 1000,
+        max_requests: Optional[int] = None,
+        sleep_seconds: float = 0.0,
+    ) -> AsyncIterator[List[List[Union[int, float]]]]:
+        """Async version of :meth:`CryptoDataFetcher.iter_ohlcv_pages`."""
+        request_count = 0
+
+        while True:
+            if max_requests is not None and request_count >= max_requests:
+                return
+
+            try:
+                candles = await self._request_ohlcv(symbol, timeframe, since=since, limit=limit)
+                request_count += 1
+            except Exception as e:
+                logger.warning("Error fetching %s at %s: %s", symbol, since, e)
+                return
+
+            page, since = _next_page(candles, since, until, limit)
+            if page:
+                yield page
+            if since is None:
+                return
+
+            if sleep_seconds > 0:
+                await asyncio.sleep(sleep_seconds)
@@ -1,3 +1,4 @@
+from data_fetcher.storage.cache import PriceCache
 from data_fetcher.storage.sqlite import SQLiteStore
 
-__all__ = ["SQLiteStore"]
+__all__ = ["PriceCache", "SQLiteStore"]
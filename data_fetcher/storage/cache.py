@@ -0,0 +1,136 @@
+"""Query result cache for :meth:`SQLiteStore.load_prices`."""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Hashable, Optional, Tuple, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+#: Default memory budget of the in-process tier.
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+
+#: ``(series_id, data_version)`` of every series a query can read.
+Versions = Tuple[Tuple[int, int], ...]
+
+
+class PriceCache:
+    """Two-tier cache of price frames keyed by normalized query.
+
+    Every entry records the data versions of the series its query reads and
+    is only served while those versions are unchanged, so inserts and
+    deletes invalidate it without any explicit flush. The first tier is an
+    in-process LRU holding at most ``max_bytes`` of frames; with
+    ``cache_dir`` each frame is also written as a Feather snapshot that
+    other processes, and later runs, can read back. Snapshots need the
+    ``arrow`` extra.
+
+    Frames are copied on the way out, so callers may modify what they get.
+    One cache may be shared by several stores and threads.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES, cache_dir: Optional[Union[str, Path]] = None):
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._entries: "OrderedDict[Hashable, Tuple[Versions, pd.DataFrame, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.cache_dir is not None:
+            # Fail at construction rather than on the first snapshot.
+            try:
+                import pyarrow.feather  # noqa: F401
+            except ImportError as exc:
+                raise ImportError(
+                    'pyarrow is not installed. Install with: uv pip install -e ".[arrow]"'
+                ) from exc
+
+    def get(self, key: Hashable, versions: Versions) -> Optional[pd.DataFrame]:
+        """Return a copy of the frame cached for ``key`` at ``versions``, if any."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == versions:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1].copy()
+
+        frame = self._read_snapshot(key, versions)
+        with self._lock:
+            if frame is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, versions, frame)
+        return frame.copy()
+
+    def put(self, key: Hashable, versions: Versions, frame: pd.DataFrame) -> None:
+        """Cache a copy of ``frame`` as the result of ``key`` at ``versions``."""
+        frame = frame.copy()
+        with self._lock:
+            self._remember(key, versions, frame)
+        self._write_snapshot(key, versions, frame)
+
+    def clear(self) -> None:
+        """Drop the in-process tier; snapshots on disk are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remember(self, key: Hashable, versions: Versions, frame: pd.DataFrame) -> None:
+        size = int(frame.memory_usage(index=True, deep=True).sum())
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[2]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (versions, frame, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def _snapshot_path(self, key: Hashable, versions: Versions) -> Tuple[Path, str]:
+        key_digest = hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+        version_digest = hashlib.sha256(repr(versions).encode()).hexdigest()[:16]
+        return self.cache_dir / f"{key_digest}-{version_digest}.feather", key_digest
+
+    def _read_snapshot(self, key: Hashable, versions: Versions) -> Optional[pd.DataFrame]:
+        if self.cache_dir is None:
+            return None
+        path, _ = self._snapshot_path(key, versions)
+        try:
+            return pd.read_feather(path)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.warning("Could not read price cache snapshot %s: %s", path, exc)
+            return None
+
+    def _write_snapshot(self, key: Hashable, versions: Versions, frame: pd.DataFrame) -> None:
+        """Write the snapshot atomically and remove those of older versions."""
+        if self.cache_dir is None:
+            return
+        path, key_digest = self._snapshot_path(key, versions)
+        tmp: Optional[str] = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{key_digest}_", suffix=".tmp")
+            os.close(fd)
+            frame.reset_index(drop=True).to_feather(tmp)
+            os.replace(tmp, path)
+            tmp = None
+            for stale in self.cache_dir.glob(f"{key_digest}-*.feather"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+        except Exception as exc:
+            logger.warning("Could not write price cache snapshot %s: %s", path, exc)
+        finally:
+            if tmp is not None:
+                Path(tmp).unlink(missing_ok=True)
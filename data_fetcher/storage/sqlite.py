@@ -1,84 +1,742 @@
 """SQLite persistence layer for OHLCV data."""
 
+import importlib
 import logging
+import multiprocessing
+import os
+import queue
 import re
 import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import islice, repeat
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
-from data_fetcher.models import InventoryRow, ValidationResult
+from data_fetcher.models import ArchiveFile, Gap, InventoryRow, PriceMatrix, SymbolListing, ValidationResult
+from data_fetcher.storage.cache import PriceCache, Versions
 
 logger = logging.getLogger(__name__)
 
 PRICE_FRAME_COLUMNS = ["milliseconds", "timestamp", "symbol", "price", "volume"]
 PRICE_FRAME_KEY_COLUMNS = ["exchange", "timeframe"]
 
+#: Numeric columns of :meth:`SQLiteStore.load_price_table`, in order.
+PRICE_TABLE_VALUE_COLUMNS = ["open", "high", "low", "price", "volume"]
 
-#: Canonical schema for the price_data table. ``price`` stores the candle
-#: close. ``open``, ``high``, and ``low`` are preserved for consumers that need
-#: full OHLCV context.
-CREATE_TABLE_SQL = """
-CREATE TABLE IF NOT EXISTS price_data (
+#: Rows fetched per round trip by the columnar reader.
+COLUMNAR_FETCH_ROWS = 65_536
+
+#: Time span of each frame yielded by :meth:`SQLiteStore.iter_prices`.
+PRICE_WINDOW_MS = 86_400_000
+
+
+#: Version stored in ``PRAGMA user_version`` by databases on the current
+#: schema. Older databases (version 1 has ``user_version`` 0) keep a
+#: ``price_data`` table and still work; ``migrate`` upgrades them.
+SCHEMA_VERSION = 7
+
+#: Catalog of stored series, so candles carry a small integer key instead of
+#: repeating the exchange, symbol and timeframe strings. A series with a
+#: ``price_scale`` or ``volume_scale`` stores those values as integers
+#: multiplied by that power of ten; ``NULL`` stores them unchanged. The
+#: candle count, time bounds and last insert time are kept current by every
+#: write, so inventory and resume lookups never scan ``candles``;
+#: ``data_version`` is bumped by every write that changes the candles.
+#: ``timestamp_millis`` records whether the series was first written with
+#: millisecond timestamps such as ccxt's ``2024-01-01T00:00:00.000Z``, so
+#: derived timestamps keep that format.
+CREATE_SERIES_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS series (
+    series_id      INTEGER PRIMARY KEY,
+    exchange       TEXT    NOT NULL,
+    symbol         TEXT    NOT NULL,
+    timeframe      TEXT    NOT NULL,
+    price_scale    INTEGER,
+    volume_scale   INTEGER,
+    row_count      INTEGER NOT NULL DEFAULT 0,
+    min_ms         INTEGER,
+    max_ms         INTEGER,
+    last_insert_ms INTEGER,
+    data_version   INTEGER NOT NULL DEFAULT 0,
+    timestamp_millis INTEGER NOT NULL DEFAULT 0,
+    UNIQUE(exchange, symbol, timeframe)
+);
+"""
+
+#: Recomputes the summary columns of every series from its candles, for
+#: databases whose candles were written without maintaining them.
+REFRESH_SERIES_SUMMARY_SQL = """
+UPDATE series SET (row_count, min_ms, max_ms) = (
+    SELECT COUNT(*), MIN(milliseconds), MAX(milliseconds)
+    FROM candles c
+    WHERE c.series_id = series.series_id
+);
+"""
+
+#: Largest scale an encoded series may use, i.e. 12 decimal places. Values
+#: needing more are stored unencoded.
+MAX_ENCODED_SCALE = 10**12
+
+#: Encoded values stay below 2**53, so they and their quotients by the
+#: scale are exact doubles.
+_MAX_ENCODED_INT = 2**53
+
+#: Candle storage. ``price`` stores the candle close. ``open``, ``high``, and
+#: ``low`` are preserved for consumers that need full OHLCV context. Rows are
+#: clustered by their key, so each series is stored contiguously in time
+#: order and needs no separate index. SQLite writes whole-number REALs as
+#: variable-length integers, so encoded series take 1 to 6 bytes per value
+#: instead of 8.
+CREATE_CANDLES_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS candles (
+    series_id    INTEGER NOT NULL,
     milliseconds INTEGER NOT NULL,
-    timestamp    TEXT    NOT NULL,
-    exchange     TEXT    NOT NULL,
-    symbol       TEXT    NOT NULL,
-    timeframe    TEXT    NOT NULL,
     open         REAL    NOT NULL,
     high         REAL    NOT NULL,
     low          REAL    NOT NULL,
     price        REAL    NOT NULL,
     volume       REAL    NOT NULL,
-    UNIQUE(exchange, symbol, timeframe, milliseconds)
-);
+    PRIMARY KEY (series_id, milliseconds)
+) WITHOUT ROWID;
+"""
+
+#: ISO 8601 UTC text for a milliseconds column, e.g. ``2024-01-01T00:00:00Z``;
+#: sub-second candles, and every candle of a series whose ``millis`` flag is
+#: set, keep their milliseconds, e.g. ``2024-01-01T00:00:00.000Z``.
+TIMESTAMP_SQL = """CASE WHEN {column} % 1000 = 0 AND NOT {millis}
+            THEN strftime('%Y-%m-%dT%H:%M:%SZ', {column} / 1000, 'unixepoch')
+            ELSE strftime('%Y-%m-%dT%H:%M:%fZ', {column} / 1000.0, 'unixepoch')
+       END"""
+
+#: Timestamps written with milliseconds, as ``ccxt`` formats them.
+_MILLIS_TIMESTAMP = re.compile(r"\.\d{3}Z$")
+
+#: Canonical read shape, with the columns of the version 1 ``price_data``
+#: table. ``timestamp`` is derived from ``milliseconds``; encoded values are
+#: divided by their scale, which yields exactly the double nearest to the
+#: decimal value, i.e. the float originally inserted.
+CREATE_PRICE_VIEW_SQL = f"""
+CREATE VIEW IF NOT EXISTS price_data AS
+SELECT c.milliseconds AS milliseconds,
+       {TIMESTAMP_SQL.format(column="c.milliseconds", millis="s.timestamp_millis")} AS timestamp,
+       s.exchange AS exchange,
+       s.symbol AS symbol,
+       s.timeframe AS timeframe,
+       c.open / COALESCE(s.price_scale, 1) AS open,
+       c.high / COALESCE(s.price_scale, 1) AS high,
+       c.low / COALESCE(s.price_scale, 1) AS low,
+       c.price / COALESCE(s.price_scale, 1) AS price,
+       c.volume / COALESCE(s.volume_scale, 1) AS volume
+FROM candles c
+JOIN series s ON s.series_id = c.series_id;
 """
 
-#: Index on exchange/symbol/timeframe for fast lookups.
+#: Version 1 index on exchange/symbol/timeframe, a prefix of its UNIQUE index.
 CREATE_INDEX_SYMBOL_SQL = """
 CREATE INDEX IF NOT EXISTS idx_price_data_symbol
 ON price_data(exchange, symbol, timeframe);
 """
 
-#: Index on milliseconds for time-range queries.
+#: Version 1 index on milliseconds.
 CREATE_INDEX_TIME_SQL = """
 CREATE INDEX IF NOT EXISTS idx_price_data_time
 ON price_data(milliseconds);
 """
 
+#: Version 1 secondary indexes, which bulk loads may drop and rebuild
+#: afterwards. The UNIQUE index stays, since it deduplicates inserts.
+SECONDARY_INDEXES = {
+    "idx_price_data_symbol": CREATE_INDEX_SYMBOL_SQL,
+    "idx_price_data_time": CREATE_INDEX_TIME_SQL,
+}
+
+#: Rows copied per transaction by :meth:`SQLiteStore.migrate`.
+MIGRATE_CHUNK_ROWS = 500_000
+
+#: Unindexed, per-connection table that version 1 bulk loads stage rows in.
+CREATE_STAGING_TABLE_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS price_data_staging (
+    milliseconds INTEGER,
+    timestamp    TEXT,
+    exchange     TEXT,
+    symbol       TEXT,
+    timeframe    TEXT,
+    open         REAL,
+    high         REAL,
+    low          REAL,
+    price        REAL,
+    volume       REAL
+);
+"""
+
+
+#: Store-wide key/value settings. ``database_id`` is a random identity
+#: set when the database is created, so results cached for one database are
+#: never served for another later created at the same path.
+CREATE_STORE_META_SQL = """
+CREATE TABLE IF NOT EXISTS store_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+#: Earliest-candle catalog so listing dates are probed once per key.
+CREATE_LISTING_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS symbol_listing (
+    exchange     TEXT    NOT NULL,
+    symbol       TEXT    NOT NULL,
+    timeframe    TEXT    NOT NULL,
+    earliest_ms  INTEGER,
+    method       TEXT    NOT NULL,
+    probed_at_ms INTEGER NOT NULL,
+    PRIMARY KEY (exchange, symbol, timeframe)
+);
+"""
+
+#: Archive files already ingested, so resumed bulk fetches skip them unread.
+CREATE_ARCHIVE_MANIFEST_SQL = """
+CREATE TABLE IF NOT EXISTS archive_manifest (
+    exchange       TEXT    NOT NULL,
+    symbol         TEXT    NOT NULL,
+    timeframe      TEXT    NOT NULL,
+    granularity    TEXT    NOT NULL,
+    period         TEXT    NOT NULL,
+    size_bytes     INTEGER NOT NULL,
+    sha256         TEXT    NOT NULL,
+    rows           INTEGER NOT NULL,
+    ingested_at_ms INTEGER NOT NULL,
+    PRIMARY KEY (exchange, symbol, timeframe, granularity, period)
+);
+"""
+
+#: Negative cache of archive files that returned 404.
+CREATE_ARCHIVE_MISSING_SQL = """
+CREATE TABLE IF NOT EXISTS archive_missing (
+    exchange       TEXT    NOT NULL,
+    symbol         TEXT    NOT NULL,
+    timeframe      TEXT    NOT NULL,
+    granularity    TEXT    NOT NULL,
+    period         TEXT    NOT NULL,
+    period_end_ms  INTEGER NOT NULL,
+    checked_at_ms  INTEGER NOT NULL,
+    PRIMARY KEY (exchange, symbol, timeframe, granularity, period)
+);
+"""
+
+#: A missing archive file is not requested again for this long.
+ARCHIVE_MISSING_RETRY_MS = 30 * 86_400_000
+
+#: Files for periods that had ended less than this long before the 404 may
+#: simply not be published yet ...
+ARCHIVE_PUBLISH_DELAY_MS = 7 * 86_400_000
+
+#: ... so they are retried after this long instead.
+ARCHIVE_RECENT_MISSING_RETRY_MS = 3_600_000
+
+#: Failed probes are retried after this long; found listing dates never
+#: change, so they are reused until explicitly refreshed.
+LISTING_FAILED_RETRY_MS = 86_400_000
+
+
+#: Candle length per timeframe. ``1M`` is nominal; derived monthly candles
+#: follow calendar months.
+TIMEFRAME_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "6h": 21_600_000,
+    "8h": 28_800_000,
+    "12h": 43_200_000,
+    "1d": 86_400_000,
+    "3d": 259_200_000,
+    "1w": 604_800_000,
+    "1M": 2_592_000_000,
+}
+
+#: The Unix epoch is a Thursday; weekly candles open on Monday 00:00 UTC.
+_WEEK_OFFSET_MS = 4 * 86_400_000
+
+
+def can_derive(base_timeframe: str, target_timeframe: str) -> bool:
+    """Return True when ``target_timeframe`` buckets are whole ``base_timeframe`` candles."""
+    if base_timeframe not in TIMEFRAME_MS or target_timeframe not in TIMEFRAME_MS:
+        return False
+    base_ms = TIMEFRAME_MS[base_timeframe]
+    if target_timeframe in {"1w", "1M"}:
+        return TIMEFRAME_MS["1d"] % base_ms == 0
+    target_ms = TIMEFRAME_MS[target_timeframe]
+    return target_ms > base_ms and target_ms % base_ms == 0
+
+
+def _bucket_starts(milliseconds: np.ndarray, timeframe: str) -> np.ndarray:
+    """Return the opening time of the ``timeframe`` candle containing each timestamp."""
+    if timeframe == "1M":
+        months = milliseconds.astype("datetime64[ms]").astype("datetime64[M]")
+        return months.astype("datetime64[ms]").astype(np.int64)
+    offset = _WEEK_OFFSET_MS if timeframe == "1w" else 0
+    return milliseconds - (milliseconds - offset) % TIMEFRAME_MS[timeframe]
+
+
+def _bucket_end(bucket_start: int, timeframe: str) -> int:
+    """Return the opening time of the candle after ``bucket_start``."""
+    if timeframe == "1M":
+        month = np.datetime64(bucket_start, "ms").astype("datetime64[M]") + 1
+        return int(month.astype("datetime64[ms]").astype(np.int64))
+    return bucket_start + TIMEFRAME_MS[timeframe]
+
+
+def _aggregate_buckets(frame: pd.DataFrame, buckets: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Aggregate ascending candles into OHLCV columns, one entry per bucket."""
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    return (
+        buckets[starts],
+        frame["open"].to_numpy()[starts],
+        np.maximum.reduceat(frame["high"].to_numpy(), starts),
+        np.minimum.reduceat(frame["low"].to_numpy(), starts),
+        frame["price"].to_numpy()[ends],
+        np.add.reduceat(frame["volume"].to_numpy(), starts),
+    )
+
+
+def _timeframe_grid(first_ms: int, last_ms: int, timeframe: str) -> np.ndarray:
+    """Return the ``timeframe`` candle open times within ``[first_ms, last_ms]``."""
+    start = int(_bucket_starts(np.array([first_ms], dtype=np.int64), timeframe)[0])
+    if start < first_ms:
+        start = _bucket_end(start, timeframe)
+    if timeframe == "1M":
+        first_month = np.datetime64(start, "ms").astype("datetime64[M]")
+        last_month = np.datetime64(last_ms, "ms").astype("datetime64[M]")
+        return np.arange(first_month, last_month + 1).astype("datetime64[ms]").astype(np.int64)
+    return np.arange(start, last_ms + 1, TIMEFRAME_MS[timeframe], dtype=np.int64)
+
+
+def _forward_fill(values: np.ndarray) -> np.ndarray:
+    """Carry the last non-NaN value of each column down; leading NaNs stay."""
+    present = np.where(~np.isnan(values), np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(present, axis=0, out=present)
+    return values[present, np.arange(values.shape[1])]
+
+
+def _iter_gaps(milliseconds: Iterable[int], interval_ms: int) -> Iterator[Tuple[int, int, int]]:
+    """Yield ``(after_ms, before_ms, missing_bars)`` for ascending timestamps.
+
+    Steps that round to a single interval are not gaps, which keeps
+    calendar timeframes such as ``1M`` from reporting every 31-day month.
+    """
+    prev: Optional[int] = None
+    for curr in milliseconds:
+        if prev is not None and curr - prev > interval_ms:
+            missing_bars = round((curr - prev) / interval_ms) - 1
+            if missing_bars > 0:
+                yield prev, curr, missing_bars
+        prev = curr
+
+
+def _fit_scale(values: np.ndarray, scale: int) -> Optional[int]:
+    """Return the smallest power-of-ten scale from ``scale`` up that encodes ``values`` exactly.
+
+    Returns ``None`` when no scale up to ``MAX_ENCODED_SCALE`` round-trips
+    every value, e.g. for NaN or for values off any decimal grid.
+    """
+    while scale <= MAX_ENCODED_SCALE:
+        encoded = np.rint(values * scale)
+        if np.all(np.abs(encoded) < _MAX_ENCODED_INT) and np.array_equal(encoded / scale, values):
+            return scale
+        scale *= 10
+    return None
+
+
+def _dictionary_codes(
+    labels: List[str], lengths: List[int], categories: Optional[List[str]] = None
+) -> Tuple[np.ndarray, List[str]]:
+    """Return int32 codes repeating each series label ``lengths`` times, and the categories.
+
+    Categories default to the sorted distinct labels.
+    """
+    if categories is None:
+        categories = sorted(set(labels))
+    index = {label: code for code, label in enumerate(categories)}
+    codes = np.repeat(np.array([index[label] for label in labels], dtype=np.int32), lengths)
+    return codes, categories
+
+
+@dataclass
+class _PriceSeries:
+    """One stored series and the table and condition that select its candles."""
+    exchange: str
+    symbol: str
+    timeframe: str
+    source: str
+    where: str
+    params: List[object]
+    rows: int
+    min_ms: Optional[int]
+    max_ms: Optional[int]
+    price_scale: int = 1
+    volume_scale: int = 1
+
+
+def _import_optional(module: str, extra: str):
+    try:
+        return importlib.import_module(module)
+    except ImportError as exc:
+        raise ImportError(
+            f"{module} is not installed. Install with: uv pip install -e \".[{extra}]\""
+        ) from exc
+
+
+def _validate_series(db_path: str, inv: InventoryRow, series: _PriceSeries, interval_ms: int) -> ValidationResult:
+    """Validate one series; runs in worker processes.
+
+    Value checks are one aggregate query. Timestamps are then streamed in
+    order into int64 batches, and duplicates and gaps are counted with
+    ``np.diff``, carrying the last timestamp across batches.
+    """
+    if series.source == "candles":
+        # Every candles column is NOT NULL and the view derives timestamp.
+        columns = ["open", "high", "low", "price", "volume"]
+    else:
+        columns = ["timestamp", "open", "high", "low", "price", "volume"]
+
+    duplicate_count = gap_count = largest_gap_bars = 0
+    prev_ms: Optional[int] = None
+    prev_repeated = False
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA query_only = ON")
+        # Encoded values keep their sign, so they are checked unscaled.
+        total, null_ms, null_values, non_positive_price, non_positive_volume = conn.execute(
+            f"""
+            SELECT COUNT(*),
+                   COALESCE(SUM(milliseconds IS NULL), 0),
+                   COALESCE(SUM({" + ".join(f"({name} IS NULL)" for name in columns)}), 0),
+                   COALESCE(SUM(price <= 0), 0),
+                   COALESCE(SUM(volume <= 0), 0)
+            FROM {series.source}
+            WHERE {series.where}
+            """,
+            series.params,
+        ).fetchone()
+
+        cursor = conn.execute(
+            f"""
+            SELECT milliseconds FROM {series.source}
+            WHERE {series.where} AND milliseconds IS NOT NULL
+            ORDER BY milliseconds
+            """,
+            series.params,
+        )
+        values = (row[0] for row in cursor)
+        while True:
+            milliseconds = np.fromiter(islice(values, COLUMNAR_FETCH_ROWS), dtype=np.int64)
+            if not len(milliseconds):
+                break
+            if prev_ms is not None:
+                milliseconds = np.concatenate(([prev_ms], milliseconds))
+            steps = np.diff(milliseconds)
+
+            # A duplicate group starts at each repeat not preceded by one.
+            repeated = steps == 0
+            preceded = np.concatenate(([prev_repeated], repeated))
+            duplicate_count += int(np.count_nonzero(repeated & ~preceded[:-1]))
+            prev_repeated = bool(preceded[-1])
+
+            # np.rint rounds half to even like round() in _iter_gaps.
+            gap_bars = np.rint(steps[steps > interval_ms] / interval_ms).astype(np.int64) - 1
+            gap_bars = gap_bars[gap_bars > 0]
+            if len(gap_bars):
+                gap_count += int(gap_bars.sum())
+                largest_gap_bars = max(largest_gap_bars, int(gap_bars.max()))
+            prev_ms = int(milliseconds[-1])
+    finally:
+        conn.close()
+    # NULL timestamps group together, as in GROUP BY.
+    null_count = null_ms + null_values
+    duplicate_count += int(null_ms > 1)
+
+    status = "PASS"
+    if duplicate_count > 0 or null_count > 0 or gap_count > 0:
+        status = "WARN"
+    if non_positive_price > 0 or non_positive_volume > 0:
+        status = "FAIL"
+
+    return ValidationResult(
+        exchange=inv.exchange,
+        symbol=inv.symbol,
+        timeframe=inv.timeframe,
+        rows=total,
+        duplicate_count=duplicate_count,
+        null_count=null_count,
+        non_positive_price_count=non_positive_price,
+        non_positive_volume_count=non_positive_volume,
+        expected_interval_ms=interval_ms,
+        gap_count=gap_count,
+        largest_gap_bars=largest_gap_bars,
+        first_datetime_utc=inv.first_datetime_utc,
+        last_datetime_utc=inv.last_datetime_utc,
+        status=status,
+    )
+
+
+#: Connection tuning profiles. ``fast`` trades durability of the last few
+#: commits on power loss (never consistency) for write throughput and keeps
+#: index pages hot in memory; ``safe`` leaves SQLite's defaults untouched.
+PRAGMA_PROFILES: Dict[str, Dict[str, Union[int, str]]] = {
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268_435_456,
+        "cache_size": -65_536,  # KiB, i.e. 64 MiB
+        "temp_store": "MEMORY",
+    },
+    "safe": {},
+}
+
 
 class SQLiteStore:
     """SQLite storage for OHLCV data.
 
-    Manages the ``price_data`` table with idempotent inserts, resume
-    capability, inventory queries, and validation.
+    Manages the ``series`` and ``candles`` tables behind the ``price_data``
+    view with idempotent inserts, resume capability, inventory queries, and
+    validation.
+
+    Each thread reuses one long-lived connection tuned with a profile from
+    ``PRAGMA_PROFILES``, so repeated calls keep their page cache warm. Use
+    the store as a context manager, or call :meth:`close`, to release the
+    connections once every thread using it has finished.
+
+    With ``integer_encoding``, series created by this store keep their
+    values as integers scaled by the market precision registered through
+    :meth:`set_market_precision`, or by the fewest decimal places that
+    represent the first batch exactly. A later value that needs more
+    decimals widens the scale in the same transaction, and values off any
+    decimal grid turn the encoding off for the series, so reads always
+    return the floats that were inserted.
+
+    With a ``price_cache``, :meth:`load_prices` results are cached per
+    normalized query and database identity, and served until a write
+    changes one of the series the query reads.
     """
 
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        profile: str = "fast",
+        integer_encoding: bool = False,
+        price_cache: Optional[PriceCache] = None,
+    ):
+        if profile not in PRAGMA_PROFILES:
+            raise ValueError(f"Unknown SQLite profile: {profile}")
         self.db_path = str(Path(db_path).expanduser().resolve())
+        self.profile = profile
+        self.integer_encoding = integer_encoding
+        self.price_cache = price_cache
+        self._market_precision: Dict[Tuple[str, str], Tuple[Optional[int], Optional[int]]] = {}
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._bulk_loads = 0
+        self._dropped_indexes: List[str] = []
+        # (series_id, price_scale, volume_scale) per (exchange, symbol, timeframe).
+        self._series: Dict[Tuple[str, str, str], Tuple[int, Optional[int], Optional[int]]] = {}
         self._ensure_schema()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+    def __enter__(self) -> "SQLiteStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the connections opened by every thread."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def _close_thread_connection(self) -> None:
+        """Close the calling thread's connection, for short-lived worker threads."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._connections_lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Connections are only used by the thread that opened them;
+            # check_same_thread is relaxed so close() can release them all.
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            for pragma, value in PRAGMA_PROFILES[self.profile].items():
+                conn.execute(f"PRAGMA {pragma} = {value}")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
         return conn
 
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Yield this thread's connection, rolling back on error."""
+        conn = self._connection()
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+
     def _ensure_schema(self) -> None:
-        """Create the price_data table and indexes if they do not exist.
+        """Create the storage tables, views and indexes if they do not exist.
 
         Creates parent directories if they do not exist.
         """
         db_dir = Path(self.db_path).parent
         db_dir.mkdir(parents=True, exist_ok=True)
-        conn = self._connect()
-        try:
-            conn.execute(CREATE_TABLE_SQL)
-            conn.execute(CREATE_INDEX_SYMBOL_SQL)
-            conn.execute(CREATE_INDEX_TIME_SQL)
+        with self._connect() as conn:
+            row = conn.execute("SELECT type FROM sqlite_master WHERE name = 'price_data'").fetchone()
+            if row is None:
+                conn.execute(CREATE_SERIES_TABLE_SQL)
+                conn.execute(CREATE_CANDLES_TABLE_SQL)
+                conn.execute(CREATE_PRICE_VIEW_SQL)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                self.schema_version = SCHEMA_VERSION
+            else:
+                self.schema_version = conn.execute("PRAGMA user_version").fetchone()[0] or 1
+            if 3 <= self.schema_version < SCHEMA_VERSION:
+                self._upgrade_series(conn)
+            if self.schema_version == 1:
+                conn.execute(CREATE_INDEX_SYMBOL_SQL)
+                conn.execute(CREATE_INDEX_TIME_SQL)
+            conn.execute(CREATE_LISTING_TABLE_SQL)
+            conn.execute(CREATE_ARCHIVE_MANIFEST_SQL)
+            conn.execute(CREATE_ARCHIVE_MISSING_SQL)
+            conn.execute(CREATE_STORE_META_SQL)
+            conn.execute(
+                "INSERT OR IGNORE INTO store_meta (key, value) VALUES ('database_id', ?)", (uuid.uuid4().hex,)
+            )
+            self.database_id = conn.execute("SELECT value FROM store_meta WHERE key = 'database_id'").fetchone()[0]
             conn.commit()
-        finally:
-            conn.close()
+
+    def _upgrade_series(self, conn: sqlite3.Connection) -> None:
+        """Add the catalog columns that databases from version 3 on lack.
+
+        No candles are rewritten; summaries are computed in one pass.
+        """
+        conn.execute("BEGIN")
+        if self.schema_version < 4:
+            conn.execute("ALTER TABLE series ADD COLUMN price_scale INTEGER")
+            conn.execute("ALTER TABLE series ADD COLUMN volume_scale INTEGER")
+        if self.schema_version < 5:
+            conn.execute("ALTER TABLE series ADD COLUMN row_count INTEGER NOT NULL DEFAULT 0")
+            conn.execute("ALTER TABLE series ADD COLUMN min_ms INTEGER")
+            conn.execute("ALTER TABLE series ADD COLUMN max_ms INTEGER")
+            conn.execute("ALTER TABLE series ADD COLUMN last_insert_ms INTEGER")
+            conn.execute(REFRESH_SERIES_SUMMARY_SQL)
+        if self.schema_version < 6:
+            conn.execute("ALTER TABLE series ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0")
+        # Earlier versions derived whole-second timestamps, so they keep them.
+        conn.execute("ALTER TABLE series ADD COLUMN timestamp_millis INTEGER NOT NULL DEFAULT 0")
+        conn.execute("DROP VIEW price_data")
+        conn.execute(CREATE_PRICE_VIEW_SQL)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+        self.schema_version = SCHEMA_VERSION
+
+    @property
+    def _uses_series(self) -> bool:
+        return self.schema_version >= 3
+
+    def set_market_precision(
+        self,
+        exchange: str,
+        symbol: str,
+        price_decimals: Optional[int],
+        amount_decimals: Optional[int],
+    ) -> None:
+        """Register the decimal places an encoded series of a market starts from.
+
+        Only consulted with ``integer_encoding``, when a series of the market
+        is first created; ``None`` falls back to the decimals of the data.
+        """
+        self._market_precision[(exchange, symbol)] = (price_decimals, amount_decimals)
+
+    def _series_entry(
+        self,
+        conn: sqlite3.Connection,
+        key: Tuple[str, str, str],
+        create: bool = False,
+        prices: Optional[np.ndarray] = None,
+        volumes: Optional[np.ndarray] = None,
+        timestamp: Optional[str] = None,
+    ) -> Optional[Tuple[int, Optional[int], Optional[int]]]:
+        """Return ``(series_id, price_scale, volume_scale)``, adding the series first with ``create``.
+
+        With ``integer_encoding``, new series get their scales from the
+        market precision or from ``prices`` and ``volumes``. New series
+        keep the timestamp format of ``timestamp``, a written row's. New series are
+        committed immediately, so cached entries never outlive a rolled-back
+        transaction.
+        """
+        entry = self._series.get(key)
+        if entry is not None:
+            return entry
+        if create:
+            price_scale = volume_scale = None
+            if self.integer_encoding:
+                price_decimals, amount_decimals = self._market_precision.get(key[:2], (None, None))
+                price_scale = 10**price_decimals if price_decimals is not None else _fit_scale(prices, 1)
+                volume_scale = 10**amount_decimals if amount_decimals is not None else _fit_scale(volumes, 1)
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO series
+                (exchange, symbol, timeframe, price_scale, volume_scale, timestamp_millis)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (*key, price_scale, volume_scale, int(bool(timestamp and _MILLIS_TIMESTAMP.search(timestamp)))),
+            )
+            conn.commit()
+        row = conn.execute(
+            """
+            SELECT series_id, price_scale, volume_scale FROM series
+            WHERE exchange = ? AND symbol = ? AND timeframe = ?
+            """,
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        self._series[key] = entry = (row[0], row[1], row[2])
+        return entry
+
+    def _series_id(
+        self,
+        conn: sqlite3.Connection,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+    ) -> Optional[int]:
+        """Return the catalog id of a series, or ``None`` when it is not stored."""
+        entry = self._series_entry(conn, (exchange, symbol, timeframe))
+        return None if entry is None else entry[0]
 
     def get_max_timestamp(
         self, exchange: str, symbol: str, timeframe: str
@@ -88,19 +746,22 @@ class SQLiteStore:
         Used to resume fetching from the latest stored candle.
         Returns ``None`` when no data exists for the key.
         """
-        conn = self._connect()
-        try:
-            row = conn.execute(
-                """
-                SELECT MAX(milliseconds) AS max_ms
-                FROM price_data
-                WHERE exchange = ? AND symbol = ? AND timeframe = ?
-                """,
-                (exchange, symbol, timeframe),
-            ).fetchone()
+        with self._connect() as conn:
+            if self._uses_series:
+                row = conn.execute(
+                    "SELECT max_ms FROM series WHERE exchange = ? AND symbol = ? AND timeframe = ?",
+                    (exchange, symbol, timeframe),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    """
+                    SELECT MAX(milliseconds) AS max_ms
+                    FROM price_data
+                    WHERE exchange = ? AND symbol = ? AND timeframe = ?
+                    """,
+                    (exchange, symbol, timeframe),
+                ).fetchone()
             return row["max_ms"] if row and row["max_ms"] is not None else None
-        finally:
-            conn.close()
 
     def insert_ohlcv(self, rows: List[Tuple]) -> int:
         """Insert OHLCV rows idempotently.
@@ -120,8 +781,33 @@ class SQLiteStore:
         if not rows:
             return 0
 
-        conn = self._connect()
-        try:
+        with self._connect() as conn:
+            if self._uses_series:
+                batches, scales = self._encode_candles(conn, rows)
+                inserted = 0
+                for series_id, values in batches:
+                    changes_before = conn.total_changes
+                    conn.executemany(
+                        """
+                        INSERT OR IGNORE INTO candles
+                        (series_id, milliseconds, open, high, low, price, volume)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        values,
+                    )
+                    added = conn.total_changes - changes_before
+                    if added:
+                        self._update_summary(conn, series_id, added, values)
+                    inserted += added
+                conn.commit()
+                # Changed scales are cached once committed.
+                self._series.update(scales)
+                return inserted
+            if self._bulk_loads and self.schema_version == 1:
+                inserted = self._merge_staged(conn, rows)
+                conn.commit()
+                return inserted
+            changes_before = conn.total_changes
             conn.executemany(
                 """
                 INSERT OR IGNORE INTO price_data
@@ -132,28 +818,504 @@ class SQLiteStore:
                 rows,
             )
             conn.commit()
-            return conn.total_changes
+            return conn.total_changes - changes_before
+
+    def _encode_candles(
+        self, conn: sqlite3.Connection, rows: List[Tuple]
+    ) -> Tuple[List[Tuple[int, List[Tuple]]], Dict[Tuple[str, str, str], Tuple[int, Optional[int], Optional[int]]]]:
+        """Map rows to ``candles`` tuples per series, encoding the values of scaled series.
+
+        ``timestamp`` (row[1]) is derived on read. Returns ``(series_id,
+        tuples)`` batches and the entries of series whose scale differs from
+        the cached one, to be cached after commit.
+        """
+        groups: Dict[Tuple[str, str, str], List[Tuple]] = {}
+        for row in rows:
+            groups.setdefault((row[2], row[3], row[4]), []).append(row)
+
+        # New series are committed before the write transaction below starts.
+        for key, group in groups.items():
+            if key not in self._series:
+                self._series_entry(
+                    conn,
+                    key,
+                    create=True,
+                    prices=np.array([r[5:9] for r in group], dtype=np.float64),
+                    volumes=np.array([r[9] for r in group], dtype=np.float64),
+                    timestamp=group[0][1],
+                )
+
+        batches: List[Tuple[int, List[Tuple]]] = []
+        scales: Dict[Tuple[str, str, str], Tuple[int, Optional[int], Optional[int]]] = {}
+        for key, group in groups.items():
+            entry = self._series[key]
+            # A NULL scale is never set again, so only those entries are trusted.
+            if entry[1] is None and entry[2] is None:
+                batches.append((entry[0], [(entry[0], r[0], r[5], r[6], r[7], r[8], r[9]) for r in group]))
+                continue
+
+            # Other writers may have rescaled the series since it was cached,
+            # so its scales are read again under the write lock.
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            series_id = entry[0]
+            price_scale, volume_scale = conn.execute(
+                "SELECT price_scale, volume_scale FROM series WHERE series_id = ?", (series_id,)
+            ).fetchone()
+            prices = np.array([r[5:9] for r in group], dtype=np.float64)
+            volumes = np.array([r[9] for r in group], dtype=np.float64)
+            new_price_scale = self._rescale(conn, series_id, "price_scale", prices, price_scale)
+            new_volume_scale = self._rescale(conn, series_id, "volume_scale", volumes, volume_scale)
+            if (series_id, new_price_scale, new_volume_scale) != entry:
+                scales[key] = (series_id, new_price_scale, new_volume_scale)
+
+            if new_price_scale is not None:
+                prices = np.rint(prices * new_price_scale).astype(np.int64)
+            if new_volume_scale is not None:
+                volumes = np.rint(volumes * new_volume_scale).astype(np.int64)
+            batches.append(
+                (series_id, [(series_id, r[0], *p, v) for r, p, v in zip(group, prices.tolist(), volumes.tolist())])
+            )
+        return batches, scales
+
+    @staticmethod
+    def _update_summary(conn: sqlite3.Connection, series_id: int, added: int, values: List[Tuple]) -> None:
+        """Fold a batch that added ``added`` candles into the series summary.
+
+        Ignored duplicates already lie within the stored bounds, so the
+        batch's own bounds are safe to merge.
+        """
+        milliseconds = [v[1] for v in values]
+        conn.execute(
+            """
+            UPDATE series SET
+                row_count = row_count + :added,
+                min_ms = MIN(COALESCE(min_ms, :first), :first),
+                max_ms = MAX(COALESCE(max_ms, :last), :last),
+                last_insert_ms = :now,
+                data_version = data_version + 1
+            WHERE series_id = :series_id
+            """,
+            {
+                "added": added,
+                "first": min(milliseconds),
+                "last": max(milliseconds),
+                "now": int(time.time() * 1000),
+                "series_id": series_id,
+            },
+        )
+
+    @staticmethod
+    def _rescale(
+        conn: sqlite3.Connection,
+        series_id: int,
+        scale_column: str,
+        values: np.ndarray,
+        scale: Optional[int],
+    ) -> Optional[int]:
+        """Return the scale that encodes ``values`` exactly, rewriting stored candles to it.
+
+        Stored candles are multiplied up to a wider scale, or decoded when
+        no scale fits; both run in the caller's transaction.
+        """
+        if scale is None:
+            return None
+        fit = _fit_scale(values, scale)
+        if fit == scale:
+            return scale
+
+        columns = ["open", "high", "low", "price"] if scale_column == "price_scale" else ["volume"]
+        if fit is not None:
+            factor = fit // scale
+            largest = conn.execute(
+                f"SELECT MAX(MAX({', '.join(f'ABS({c})' for c in columns)}, 0)) FROM candles WHERE series_id = ?",
+                (series_id,),
+            ).fetchone()[0]
+            if largest is None or largest * factor < _MAX_ENCODED_INT:
+                assignments = ", ".join(f"{c} = {c} * {factor}" for c in columns)
+                conn.execute(f"UPDATE candles SET {assignments} WHERE series_id = ?", (series_id,))
+                conn.execute(f"UPDATE series SET {scale_column} = ? WHERE series_id = ?", (fit, series_id))
+                return fit
+
+        assignments = ", ".join(f"{c} = {c} / {scale}" for c in columns)
+        conn.execute(f"UPDATE candles SET {assignments} WHERE series_id = ?", (series_id,))
+        conn.execute(f"UPDATE series SET {scale_column} = NULL WHERE series_id = ?", (series_id,))
+        return None
+
+    @staticmethod
+    def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+        row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _index_exists(conn: sqlite3.Connection, name: str) -> bool:
+        row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone()
+        return row is not None
+
+    def migrate(
+        self,
+        chunk_rows: int = MIGRATE_CHUNK_ROWS,
+        vacuum: bool = True,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> bool:
+        """Upgrade a database with a ``price_data`` table to the current schema.
+
+        Each series is added to the catalog and its rows are copied in time
+        order into ``candles``, ``chunk_rows`` per transaction, so memory
+        stays flat and an interrupted run resumes after the last copied
+        candle. The old table and its indexes are then replaced by the
+        ``price_data`` view in one transaction and, with ``vacuum``, the freed
+        pages are returned to the filesystem. ``progress`` is called with the
+        rows copied so far and the total after each chunk.
+
+        Returns
+        -------
+        bool
+            False when the database already uses the current schema.
+        """
+        if self.schema_version >= SCHEMA_VERSION:
+            return False
+
+        with self._connect() as conn:
+            conn.execute(CREATE_SERIES_TABLE_SQL)
+            conn.execute(CREATE_CANDLES_TABLE_SQL)
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO series (exchange, symbol, timeframe, timestamp_millis)
+                SELECT exchange, symbol, timeframe, MAX(timestamp GLOB '*.[0-9][0-9][0-9]Z')
+                FROM price_data
+                GROUP BY exchange, symbol, timeframe
+                ORDER BY exchange, symbol, timeframe
+                """
+            )
+            conn.commit()
+            total = conn.execute("SELECT COUNT(*) FROM price_data").fetchone()[0]
+            copied = conn.execute("SELECT COUNT(*) FROM candles").fetchone()[0]
+            catalog = conn.execute(
+                "SELECT series_id, exchange, symbol, timeframe FROM series ORDER BY series_id"
+            ).fetchall()
+            for series_id, exchange, symbol, timeframe in catalog:
+                while True:
+                    last_ms = conn.execute(
+                        "SELECT MAX(milliseconds) FROM candles WHERE series_id = ?", (series_id,)
+                    ).fetchone()[0]
+                    cursor = conn.execute(
+                        """
+                        INSERT INTO candles
+                        (series_id, milliseconds, open, high, low, price, volume)
+                        SELECT ?, milliseconds, open, high, low, price, volume
+                        FROM price_data
+                        WHERE exchange = ? AND symbol = ? AND timeframe = ? AND milliseconds > ?
+                        ORDER BY milliseconds
+                        LIMIT ?
+                        """,
+                        (series_id, exchange, symbol, timeframe, -(2**63) if last_ms is None else last_ms, chunk_rows),
+                    )
+                    conn.commit()
+                    if cursor.rowcount <= 0:
+                        break
+                    copied += cursor.rowcount
+                    if progress is not None:
+                        progress(copied, total)
+                    if cursor.rowcount < chunk_rows:
+                        break
+
+            # The swap runs in one explicit transaction; DDL would otherwise
+            # autocommit statement by statement.
+            conn.execute("BEGIN")
+            for name in SECONDARY_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+            conn.execute("DROP TABLE price_data")
+            conn.execute(CREATE_PRICE_VIEW_SQL)
+            conn.execute(REFRESH_SERIES_SUMMARY_SQL)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+            self.schema_version = SCHEMA_VERSION
+            if vacuum:
+                conn.execute("VACUUM")
+        return True
+
+    @contextmanager
+    def bulk_load(self, drop_indexes: bool = False) -> Iterator["SQLiteStore"]:
+        """Batch version 1 inserts for a large load.
+
+        On a version 1 database each batch inside the block is staged with a
+        plain ``executemany``, then merged into ``price_data`` by one
+        ``INSERT OR IGNORE ... SELECT`` in key order, so the unique index is
+        extended sequentially instead of row by row. With ``drop_indexes``
+        its secondary indexes are dropped for the duration and rebuilt in one
+        pass when the outermost block exits; use it for loads that are large
+        relative to the table. Interrupted loads get their indexes back on
+        the next schema check.
+
+        Later versions cluster candles on their key and have no secondary
+        indexes, so batches are inserted directly and the block has no
+        effect; staging them only copies every row twice.
+        """
+        if drop_indexes and self._bulk_loads == 0:
+            with self._connect() as conn:
+                for name in SECONDARY_INDEXES:
+                    if self._index_exists(conn, name):
+                        conn.execute(f"DROP INDEX {name}")
+                        self._dropped_indexes.append(name)
+                conn.commit()
+        self._bulk_loads += 1
+        try:
+            yield self
         finally:
-            conn.close()
+            self._bulk_loads -= 1
+            if self._bulk_loads == 0 and self._dropped_indexes:
+                with self._connect() as conn:
+                    for name in self._dropped_indexes:
+                        conn.execute(SECONDARY_INDEXES[name])
+                    conn.commit()
+                self._dropped_indexes = []
+
+    def _merge_staged(self, conn: sqlite3.Connection, rows: List[Tuple]) -> int:
+        """Merge version 1 rows through the staging table; the caller commits."""
+        conn.execute(CREATE_STAGING_TABLE_SQL)
+        conn.executemany(
+            "INSERT INTO temp.price_data_staging VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        cursor = conn.execute(
+            """
+            INSERT OR IGNORE INTO price_data
+            (milliseconds, timestamp, exchange, symbol, timeframe,
+             open, high, low, price, volume)
+            SELECT milliseconds, timestamp, exchange, symbol, timeframe,
+                   open, high, low, price, volume
+            FROM temp.price_data_staging
+            ORDER BY exchange, symbol, timeframe, milliseconds
+            """
+        )
+        inserted = cursor.rowcount
+        conn.execute("DELETE FROM temp.price_data_staging")
+        return inserted
 
     def delete_for_key(
         self, exchange: str, symbol: str, timeframe: str
     ) -> int:
         """Delete all rows matching exchange/symbol/timeframe.
 
-        Used by ``--overwrite`` mode.
+        Used by ``--overwrite`` mode. The key's archive manifest and missing
+        archive entries are cleared with the candles, so a later resumed
+        ingest reads those archives again.
         Returns the number of rows deleted.
         """
-        conn = self._connect()
-        try:
-            cursor = conn.execute(
-                "DELETE FROM price_data WHERE exchange = ? AND symbol = ? AND timeframe = ?",
+        key = (exchange, symbol, timeframe)
+        deleted = 0
+        with self._connect() as conn:
+            if self._uses_series:
+                series_id = self._series_id(conn, exchange, symbol, timeframe)
+                if series_id is not None:
+                    deleted = conn.execute("DELETE FROM candles WHERE series_id = ?", (series_id,)).rowcount
+                    conn.execute(
+                        """
+                        UPDATE series SET
+                            row_count = 0, min_ms = NULL, max_ms = NULL, last_insert_ms = NULL,
+                            data_version = data_version + 1
+                        WHERE series_id = ?
+                        """,
+                        (series_id,),
+                    )
+            else:
+                deleted = conn.execute(
+                    "DELETE FROM price_data WHERE exchange = ? AND symbol = ? AND timeframe = ?", key
+                ).rowcount
+            for table in ("archive_manifest", "archive_missing"):
+                conn.execute(f"DELETE FROM {table} WHERE exchange = ? AND symbol = ? AND timeframe = ?", key)
+            conn.commit()
+            return deleted
+
+    def get_listings(
+        self,
+        exchange: str,
+        timeframe: str,
+        symbols: Optional[List[str]] = None,
+        now_ms: Optional[int] = None,
+        failed_retry_ms: int = LISTING_FAILED_RETRY_MS,
+    ) -> Dict[str, SymbolListing]:
+        """Return cached listing probes that are still fresh, keyed by symbol.
+
+        Found listing dates are always fresh. Failed probes count as fresh
+        for ``failed_retry_ms`` after ``probed_at_ms`` and are omitted
+        afterwards so callers probe them again.
+        """
+        if symbols is not None and len(symbols) == 0:
+            return {}
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+
+        conditions = ["exchange = ?", "timeframe = ?"]
+        params: List[object] = [exchange, timeframe]
+        if symbols:
+            placeholders = ", ".join("?" for _ in symbols)
+            conditions.append(f"symbol IN ({placeholders})")
+            params.extend(symbols)
+        conditions.append("(earliest_ms IS NOT NULL OR probed_at_ms >= ?)")
+        params.append(now_ms - failed_retry_ms)
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT exchange, symbol, timeframe, earliest_ms, method, probed_at_ms
+                FROM symbol_listing
+                WHERE {" AND ".join(conditions)}
+                """,
+                params,
+            ).fetchall()
+            return {r["symbol"]: SymbolListing(**dict(r)) for r in rows}
+
+    def upsert_listings(self, listings: List[SymbolListing]) -> None:
+        """Insert or replace listing probe results."""
+        if not listings:
+            return
+
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO symbol_listing
+                (exchange, symbol, timeframe, earliest_ms, method, probed_at_ms)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        listing.exchange,
+                        listing.symbol,
+                        listing.timeframe,
+                        listing.earliest_ms,
+                        listing.method,
+                        listing.probed_at_ms,
+                    )
+                    for listing in listings
+                ],
+            )
+            conn.commit()
+
+    def get_archive_manifest(
+        self, exchange: str, symbol: str, timeframe: str
+    ) -> Dict[Tuple[str, str], ArchiveFile]:
+        """Return ingested archive files for a key, keyed by ``(granularity, period)``."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT exchange, symbol, timeframe, granularity, period,
+                       size_bytes, sha256, rows, ingested_at_ms
+                FROM archive_manifest
+                WHERE exchange = ? AND symbol = ? AND timeframe = ?
+                """,
                 (exchange, symbol, timeframe),
+            ).fetchall()
+            return {(r["granularity"], r["period"]): ArchiveFile(**dict(r)) for r in rows}
+
+    def record_archive_files(self, files: List[ArchiveFile]) -> None:
+        """Insert or replace archive manifest entries."""
+        if not files:
+            return
+
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO archive_manifest
+                (exchange, symbol, timeframe, granularity, period,
+                 size_bytes, sha256, rows, ingested_at_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        f.exchange,
+                        f.symbol,
+                        f.timeframe,
+                        f.granularity,
+                        f.period,
+                        f.size_bytes,
+                        f.sha256,
+                        f.rows,
+                        f.ingested_at_ms,
+                    )
+                    for f in files
+                ],
             )
             conn.commit()
-            return cursor.rowcount
-        finally:
-            conn.close()
+
+    def get_missing_archives(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        now_ms: Optional[int] = None,
+    ) -> Set[Tuple[str, str]]:
+        """Return ``(granularity, period)`` of archive files known to be missing.
+
+        Entries expire after :data:`ARCHIVE_MISSING_RETRY_MS`, or after
+        :data:`ARCHIVE_RECENT_MISSING_RETRY_MS` when the period had only just
+        ended at check time and its file may still be published.
+        """
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT granularity, period FROM archive_missing
+                WHERE exchange = ? AND symbol = ? AND timeframe = ?
+                  AND checked_at_ms >= ? - CASE
+                      WHEN checked_at_ms - period_end_ms < ? THEN ?
+                      ELSE ?
+                  END
+                """,
+                (
+                    exchange,
+                    symbol,
+                    timeframe,
+                    now_ms,
+                    ARCHIVE_PUBLISH_DELAY_MS,
+                    ARCHIVE_RECENT_MISSING_RETRY_MS,
+                    ARCHIVE_MISSING_RETRY_MS,
+                ),
+            ).fetchall()
+            return {(r["granularity"], r["period"]) for r in rows}
+
+    def record_missing_archives(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        periods: List[Tuple[str, str, int]],
+        checked_at_ms: Optional[int] = None,
+    ) -> None:
+        """Remember ``(granularity, period, period_end_ms)`` files that returned 404."""
+        if not periods:
+            return
+        if checked_at_ms is None:
+            checked_at_ms = int(time.time() * 1000)
+
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO archive_missing
+                (exchange, symbol, timeframe, granularity, period, period_end_ms, checked_at_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (exchange, symbol, timeframe, granularity, period, period_end_ms, checked_at_ms)
+                    for granularity, period, period_end_ms in periods
+                ],
+            )
+            conn.commit()
+
+    def get_listing_start(self, exchange: str, symbol: str) -> Optional[int]:
+        """Return the earliest cached listing timestamp across timeframes, if any."""
+        with self._connect() as conn:
+            row = conn.execute(
+                """
+                SELECT MIN(earliest_ms) AS earliest_ms FROM symbol_listing
+                WHERE exchange = ? AND symbol = ? AND earliest_ms IS NOT NULL
+                """,
+                (exchange, symbol),
+            ).fetchone()
+            return row["earliest_ms"] if row else None
 
     def load_price_frame(
         self,
@@ -212,18 +1374,453 @@ class SQLiteStore:
         )
         where = " AND ".join(conditions) if conditions else "1"
 
-        conn = self._connect()
-        try:
-            self._raise_for_ambiguous_read(conn, where, params, exchange, timeframe)
+        with self._connect() as conn:
+            cache_key = versions = None
+            if self.price_cache is not None and self._uses_series:
+                # Row order does not depend on the order symbols are given in.
+                cache_key = (
+                    self.db_path,
+                    self.database_id,
+                    None if symbols is None else tuple(sorted(set(symbols))),
+                    timeframe,
+                    exchange,
+                    start_ms,
+                    end_ms,
+                    include_key_columns,
+                )
+                versions = self._data_versions(conn, symbols, timeframe, exchange)
+                cached = self.price_cache.get(cache_key, versions)
+                if cached is not None:
+                    return cached
+
+            self._raise_for_ambiguous_read(
+                conn, where, params, symbols, exchange, timeframe, start_ms, end_ms
+            )
             sql = f"""
                 SELECT {", ".join(select_columns)}
                 FROM price_data
                 WHERE {where}
                 ORDER BY symbol, milliseconds
             """
-            return pd.read_sql_query(sql, conn, params=params)
+            frame = pd.read_sql_query(sql, conn, params=params)
+            if cache_key is not None:
+                self.price_cache.put(cache_key, versions, frame)
+            return frame
+
+    def _data_versions(
+        self,
+        conn: sqlite3.Connection,
+        symbols: Optional[List[str]],
+        timeframe: Optional[str],
+        exchange: Optional[str],
+    ) -> Versions:
+        """Return ``(series_id, data_version)`` of every series matching the key filters."""
+        conditions, params = self._build_price_conditions(symbols=symbols, timeframe=timeframe, exchange=exchange)
+        where = " AND ".join(conditions) if conditions else "1"
+        rows = conn.execute(
+            f"SELECT series_id, data_version FROM series WHERE {where} ORDER BY series_id", params
+        ).fetchall()
+        return tuple((row[0], row[1]) for row in rows)
+
+    def load_price_table(
+        self,
+        symbols: Optional[List[str]] = None,
+        timeframe: Optional[str] = None,
+        exchange: Optional[str] = None,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        include_key_columns: bool = False,
+        output: str = "arrow",
+    ):
+        """Return price rows as typed columns instead of through ``read_sql_query``.
+
+        Takes the filters of :meth:`load_prices` and raises ``ValueError``
+        for the same ambiguous reads. Each series is read with its own
+        range query, without the join and text timestamps of the
+        ``price_data`` view, and decoded in batches into int64 milliseconds
+        and float64 OHLCV arrays, so no per-cell objects outlive a batch.
+
+        Parameters
+        ----------
+        output : str
+            ``"arrow"`` returns a ``pyarrow.Table``, ``"polars"`` a
+            ``polars.DataFrame`` built from it without copying, and
+            ``"pandas"`` a ``pandas.DataFrame`` built from the arrays
+            directly. Arrow and polars output need the ``arrow`` and
+            ``polars`` extras.
+
+        Returns
+        -------
+        table
+            Columns ``milliseconds``, ``timestamp`` (UTC, millisecond
+            resolution), ``symbol``, ``open``, ``high``, ``low``, ``price``
+            and ``volume``, plus ``exchange`` and ``timeframe`` with
+            ``include_key_columns``. Symbol and key columns are
+            dictionary-encoded. Rows are ordered by symbol and
+            ``milliseconds``.
+        """
+        if output not in {"arrow", "polars", "pandas"}:
+            raise ValueError(f"Unknown output: {output}")
+
+        series: List[_PriceSeries] = []
+        with self._connect() as conn:
+            if symbols is None or len(symbols) > 0:
+                self._raise_for_ambiguous_read_range(conn, symbols, timeframe, exchange, start_ms, end_ms)
+                series = self._price_series(conn, symbols, timeframe, exchange)
+            milliseconds, columns, lengths = self._read_price_columns(conn, series, start_ms, end_ms)
+
+        key_columns = ["symbol", *(PRICE_FRAME_KEY_COLUMNS if include_key_columns else [])]
+        keys = {name: _dictionary_codes([getattr(item, name) for item in series], lengths) for name in key_columns}
+        return self._price_output(milliseconds, columns, keys, output)
+
+    def iter_prices(
+        self,
+        symbols: Optional[List[str]] = None,
+        timeframe: Optional[str] = None,
+        exchange: Optional[str] = None,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        window_ms: int = PRICE_WINDOW_MS,
+        include_key_columns: bool = False,
+        output: str = "pandas",
+        prefetch: int = 1,
+    ) -> Iterator:
+        """Yield price rows in consecutive ``window_ms`` windows, in time order.
+
+        Windows start at the first stored candle in range (or ``start_ms``)
+        and cover ``window_ms`` milliseconds each; empty windows are skipped.
+        Each window holds every requested symbol, ordered by
+        ``milliseconds`` and then symbol, in the columns and ``output``
+        types of :meth:`load_price_table`. Symbol and key columns use the
+        same categories in every window.
+
+        A background thread reads up to ``prefetch`` windows ahead while the
+        caller processes the current one, so memory stays bounded by a few
+        windows. ``prefetch=0`` reads each window on demand instead. Filters
+        and the ambiguity rules of :meth:`load_prices` apply to the whole
+        range up front.
+        """
+        if output not in {"arrow", "polars", "pandas"}:
+            raise ValueError(f"Unknown output: {output}")
+        if window_ms <= 0:
+            raise ValueError("window_ms must be positive")
+        if symbols is not None and len(symbols) == 0:
+            return
+
+        with self._connect() as conn:
+            self._raise_for_ambiguous_read_range(conn, symbols, timeframe, exchange, start_ms, end_ms)
+            series = [item for item in self._price_series(conn, symbols, timeframe, exchange) if item.rows]
+        if not series:
+            return
+        first_ms = min(item.min_ms for item in series)
+        last_ms = max(item.max_ms for item in series)
+        first_ms = first_ms if start_ms is None else max(first_ms, start_ms)
+        last_ms = last_ms if end_ms is None else min(last_ms, end_ms)
+
+        key_columns = ["symbol", *(PRICE_FRAME_KEY_COLUMNS if include_key_columns else [])]
+        labels = {name: [getattr(item, name) for item in series] for name in key_columns}
+        categories = {name: sorted(set(values)) for name, values in labels.items()}
+
+        def read(window_start: int):
+            window_end = min(window_start + window_ms - 1, last_ms)
+            with self._connect() as conn:
+                milliseconds, columns, lengths = self._read_price_columns(conn, series, window_start, window_end)
+            if len(milliseconds) == 0:
+                return None
+            keys = {
+                name: _dictionary_codes(labels[name], lengths, categories[name]) for name in key_columns
+            }
+            order = np.lexsort((keys["symbol"][0], milliseconds))
+            milliseconds = milliseconds[order]
+            columns = {name: column[order] for name, column in columns.items()}
+            keys = {name: (codes[order], names) for name, (codes, names) in keys.items()}
+            return self._price_output(milliseconds, columns, keys, output)
+
+        windows = range(first_ms, last_ms + 1, window_ms)
+        if prefetch <= 0:
+            for window_start in windows:
+                frame = read(window_start)
+                if frame is not None:
+                    yield frame
+            return
+
+        # Bounded, so the reader stays at most ``prefetch`` windows ahead.
+        frames: "queue.Queue[object]" = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+        done = object()
+
+        def put(item: object) -> None:
+            while not stop.is_set():
+                try:
+                    frames.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def produce() -> None:
+            try:
+                for window_start in windows:
+                    if stop.is_set():
+                        return
+                    frame = read(window_start)
+                    if frame is not None:
+                        put(frame)
+                put(done)
+            except BaseException as exc:
+                put(exc)
+            finally:
+                self._close_thread_connection()
+
+        reader = threading.Thread(target=produce, name="iter-prices-prefetch", daemon=True)
+        reader.start()
+        try:
+            while True:
+                item = frames.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
         finally:
-            conn.close()
+            stop.set()
+            reader.join()
+
+    def load_price_matrix(
+        self,
+        symbols: Optional[List[str]] = None,
+        field: str = "price",
+        timeframe: str = "1h",
+        exchange: Optional[str] = None,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        fill: Union[str, float, None] = "ffill",
+    ) -> PriceMatrix:
+        """Return one field of several symbols as a time x symbol array.
+
+        Rows are the ``timeframe`` grid from ``start_ms`` (or the first
+        stored candle) to ``end_ms`` (or the last); columns follow
+        ``symbols``, or all matching symbols sorted when omitted. Each
+        series is read on its own and scattered onto the grid with one
+        vectorized assignment, so no long-format frame is built; candles off
+        the grid are dropped. The ambiguity rules of :meth:`load_prices`
+        apply.
+
+        Parameters
+        ----------
+        field : str
+            One of ``open``, ``high``, ``low``, ``price`` (close) and ``volume``.
+        fill : str, float or None
+            ``"ffill"`` carries each symbol's last value into missing
+            candles, ``None`` leaves them NaN, and a number fills them with
+            that value (e.g. ``0.0`` for volume). Candles before a symbol's
+            first stored value stay NaN under ``"ffill"``.
+        """
+        if field not in PRICE_TABLE_VALUE_COLUMNS:
+            raise ValueError(f"Unknown field: {field}")
+        if timeframe not in TIMEFRAME_MS:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
+        if isinstance(fill, str) and fill != "ffill":
+            raise ValueError(f"Unknown fill: {fill}")
+
+        columns = list(dict.fromkeys(symbols)) if symbols is not None else []
+        series: List[_PriceSeries] = []
+        with self._connect() as conn:
+            if symbols is None or columns:
+                self._raise_for_ambiguous_read_range(conn, symbols, timeframe, exchange, start_ms, end_ms)
+                series = self._price_series(conn, symbols, timeframe, exchange)
+            if symbols is None:
+                columns = sorted({item.symbol for item in series})
+
+            first_ms = start_ms if start_ms is not None or not series else min(item.min_ms for item in series)
+            last_ms = end_ms if end_ms is not None or not series else max(item.max_ms for item in series)
+            if first_ms is None or last_ms is None:
+                grid = np.empty(0, dtype=np.int64)
+            else:
+                grid = _timeframe_grid(first_ms, last_ms, timeframe)
+            values = np.full((len(grid), len(columns)), np.nan)
+            position = {symbol: i for i, symbol in enumerate(columns)}
+            for item in series:
+                milliseconds, data, _ = self._read_price_columns(conn, [item], first_ms, last_ms, [field])
+                rows = np.searchsorted(grid, milliseconds)
+                on_grid = rows < len(grid)
+                on_grid[on_grid] = grid[rows[on_grid]] == milliseconds[on_grid]
+                values[rows[on_grid], position[item.symbol]] = data[field][on_grid]
+
+        if fill == "ffill":
+            values = _forward_fill(values)
+        elif fill is not None:
+            values[np.isnan(values)] = fill
+        return PriceMatrix(milliseconds=grid, symbols=columns, values=values, field=field, timeframe=timeframe)
+
+    def _raise_for_ambiguous_read_range(
+        self,
+        conn: sqlite3.Connection,
+        symbols: Optional[List[str]],
+        timeframe: Optional[str],
+        exchange: Optional[str],
+        start_ms: Optional[int],
+        end_ms: Optional[int],
+    ) -> None:
+        conditions, params = self._build_price_conditions(
+            symbols=symbols,
+            timeframe=timeframe,
+            exchange=exchange,
+            start_ms=start_ms,
+            end_ms=end_ms,
+        )
+        where = " AND ".join(conditions) if conditions else "1"
+        self._raise_for_ambiguous_read(conn, where, params, symbols, exchange, timeframe, start_ms, end_ms)
+
+    def _price_series(
+        self,
+        conn: sqlite3.Connection,
+        symbols: Optional[List[str]],
+        timeframe: Optional[str],
+        exchange: Optional[str],
+    ) -> List["_PriceSeries"]:
+        """Return the stored series matching the key filters, ordered by symbol."""
+        conditions, params = self._build_price_conditions(symbols=symbols, timeframe=timeframe, exchange=exchange)
+        where = " AND ".join(conditions) if conditions else "1"
+        if self._uses_series:
+            catalog = conn.execute(
+                f"""
+                SELECT series_id, exchange, symbol, timeframe, price_scale, volume_scale,
+                       row_count, min_ms, max_ms
+                FROM series
+                WHERE {where} AND row_count > 0
+                ORDER BY symbol, exchange, timeframe
+                """,
+                params,
+            ).fetchall()
+            return [
+                _PriceSeries(
+                    exchange=row["exchange"],
+                    symbol=row["symbol"],
+                    timeframe=row["timeframe"],
+                    source="candles",
+                    where="series_id = ?",
+                    params=[row["series_id"]],
+                    price_scale=row["price_scale"] or 1,
+                    volume_scale=row["volume_scale"] or 1,
+                    rows=row["row_count"],
+                    min_ms=row["min_ms"],
+                    max_ms=row["max_ms"],
+                )
+                for row in catalog
+            ]
+
+        catalog = conn.execute(
+            f"""
+            SELECT exchange, symbol, timeframe, COUNT(*) AS rows,
+                   MIN(milliseconds) AS min_ms, MAX(milliseconds) AS max_ms
+            FROM price_data
+            WHERE {where}
+            GROUP BY exchange, symbol, timeframe
+            ORDER BY symbol, exchange, timeframe
+            """,
+            params,
+        ).fetchall()
+        return [
+            _PriceSeries(
+                exchange=row["exchange"],
+                symbol=row["symbol"],
+                timeframe=row["timeframe"],
+                source="price_data",
+                where="exchange = ? AND symbol = ? AND timeframe = ?",
+                params=[row["exchange"], row["symbol"], row["timeframe"]],
+                rows=row["rows"],
+                min_ms=row["min_ms"],
+                max_ms=row["max_ms"],
+            )
+            for row in catalog
+        ]
+
+    @staticmethod
+    def _read_price_columns(
+        conn: sqlite3.Connection,
+        series: List["_PriceSeries"],
+        start_ms: Optional[int],
+        end_ms: Optional[int],
+        fields: List[str] = PRICE_TABLE_VALUE_COLUMNS,
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray], List[int]]:
+        """Read ``series`` within inclusive bounds into int64 milliseconds and float64 ``fields``.
+
+        Returns the milliseconds, the value columns and the row count of each
+        series, in ``series`` order.
+        """
+        bounds = [-(2**63) if start_ms is None else start_ms, 2**63 - 1 if end_ms is None else end_ms]
+        lengths: List[int] = []
+        chunks: List[np.ndarray] = []
+        for item in series:
+            # Plain tuples; sqlite3.Row would double the per-row cost.
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(
+                f"""
+                SELECT milliseconds, {", ".join(fields)} FROM {item.source}
+                WHERE {item.where} AND milliseconds BETWEEN ? AND ?
+                ORDER BY milliseconds
+                """,
+                item.params + bounds,
+            )
+            scales = [item.volume_scale if name == "volume" else item.price_scale for name in fields]
+            length = 0
+            while True:
+                batch = cursor.fetchmany(COLUMNAR_FETCH_ROWS)
+                if not batch:
+                    break
+                # Millisecond timestamps are exact doubles.
+                chunk = np.array(batch, dtype=np.float64).T
+                for i, scale in enumerate(scales, start=1):
+                    if scale != 1:
+                        chunk[i] /= scale
+                chunks.append(chunk)
+                length += len(batch)
+            lengths.append(length)
+
+        values = np.concatenate(chunks, axis=1) if chunks else np.empty((len(fields) + 1, 0))
+        milliseconds = values[0].astype(np.int64)
+        columns = {name: np.ascontiguousarray(values[i]) for i, name in enumerate(fields, start=1)}
+        return milliseconds, columns, lengths
+
+    @staticmethod
+    def _price_output(
+        milliseconds: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        keys: Dict[str, Tuple[np.ndarray, List[str]]],
+        output: str,
+    ):
+        """Assemble typed columns into a pandas, arrow or polars table."""
+        key_columns = [name for name in PRICE_FRAME_KEY_COLUMNS if name in keys]
+        if output == "pandas":
+            frame = {
+                "milliseconds": milliseconds,
+                "timestamp": pd.to_datetime(milliseconds, unit="ms", utc=True),
+                "symbol": pd.Categorical.from_codes(*keys["symbol"]),
+                **columns,
+            }
+            for name in key_columns:
+                frame[name] = pd.Categorical.from_codes(*keys[name])
+            return pd.DataFrame(frame, copy=False)
+
+        pa = _import_optional("pyarrow", "arrow")
+
+        def dictionary(name: str):
+            codes, categories = keys[name]
+            return pa.DictionaryArray.from_arrays(pa.array(codes), pa.array(categories, pa.string()))
+
+        table = pa.table(
+            {
+                "milliseconds": pa.array(milliseconds),
+                "timestamp": pa.array(milliseconds, type=pa.timestamp("ms", tz="UTC")),
+                "symbol": dictionary("symbol"),
+                **{name: pa.array(column) for name, column in columns.items()},
+                **{name: dictionary(name) for name in key_columns},
+            }
+        )
+        if output == "polars":
+            return _import_optional("polars", "polars").from_arrow(table)
+        return table
 
     def create_backtesting_view(
         self,
@@ -235,8 +1832,7 @@ class SQLiteStore:
         if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", view_name):
             raise ValueError("view_name must be a simple SQLite identifier")
 
-        conn = self._connect()
-        try:
+        with self._connect() as conn:
             exchange_literal = conn.execute("SELECT quote(?)", (exchange,)).fetchone()[0]
             timeframe_literal = conn.execute("SELECT quote(?)", (timeframe,)).fetchone()[0]
             conn.execute(f"DROP VIEW IF EXISTS {view_name}")
@@ -250,8 +1846,6 @@ class SQLiteStore:
                 """
             )
             conn.commit()
-        finally:
-            conn.close()
 
     def _build_price_conditions(
         self,
@@ -288,28 +1882,45 @@ class SQLiteStore:
         conn: sqlite3.Connection,
         where: str,
         params: List[object],
+        symbols: Optional[List[str]],
         exchange: Optional[str],
         timeframe: Optional[str],
+        start_ms: Optional[int],
+        end_ms: Optional[int],
     ) -> None:
-        if exchange is None:
-            row = conn.execute(
-                f"SELECT COUNT(DISTINCT exchange) AS count FROM price_data WHERE {where}",
-                params,
-            ).fetchone()
-            if row["count"] > 1:
-                raise ValueError(
-                    "exchange is required because multiple exchanges are present"
-                )
+        if self._uses_series:
+            # Candidate series come from the catalog; only a time range that
+            # could fall into one series' gap is confirmed against candles.
+            catalog_conditions, catalog_params = self._build_price_conditions(
+                symbols=symbols, timeframe=timeframe, exchange=exchange
+            )
+            catalog_conditions.append("row_count > 0")
+            if start_ms is not None:
+                catalog_conditions.append("max_ms >= ?")
+                catalog_params.append(start_ms)
+            if end_ms is not None:
+                catalog_conditions.append("min_ms <= ?")
+                catalog_params.append(end_ms)
+            catalog_where = " AND ".join(catalog_conditions)
+            exact = start_ms is None and end_ms is None
 
-        if timeframe is None:
-            row = conn.execute(
-                f"SELECT COUNT(DISTINCT timeframe) AS count FROM price_data WHERE {where}",
-                params,
-            ).fetchone()
-            if row["count"] > 1:
-                raise ValueError(
-                    "timeframe is required because multiple timeframes are present"
-                )
+        for column, value in (("exchange", exchange), ("timeframe", timeframe)):
+            if value is not None:
+                continue
+            checked = False
+            if self._uses_series:
+                count = conn.execute(
+                    f"SELECT COUNT(DISTINCT {column}) FROM series WHERE {catalog_where}",
+                    catalog_params,
+                ).fetchone()[0]
+                checked = count <= 1 or exact
+            if not checked:
+                count = conn.execute(
+                    f"SELECT COUNT(DISTINCT {column}) FROM price_data WHERE {where}",
+                    params,
+                ).fetchone()[0]
+            if count > 1:
+                raise ValueError(f"{column} is required because multiple {column}s are present")
 
     def get_inventory(
         self,
@@ -331,22 +1942,37 @@ class SQLiteStore:
             params.append(timeframe)
 
         where = " AND ".join(conditions) if conditions else "1"
-        sql = f"""
-            SELECT
-                exchange,
-                symbol,
-                timeframe,
-                COUNT(*) AS rows,
-                MIN(timestamp) AS first_dt,
-                MAX(timestamp) AS last_dt
-            FROM price_data
-            WHERE {where}
-            GROUP BY exchange, symbol, timeframe
-            ORDER BY exchange, symbol, timeframe
-        """
+        if self._uses_series:
+            sql = f"""
+                SELECT
+                    exchange,
+                    symbol,
+                    timeframe,
+                    row_count AS rows,
+                    {TIMESTAMP_SQL.format(column="min_ms", millis="timestamp_millis")} AS first_dt,
+                    {TIMESTAMP_SQL.format(column="max_ms", millis="timestamp_millis")} AS last_dt,
+                    last_insert_ms
+                FROM series
+                WHERE {where} AND row_count > 0
+                ORDER BY exchange, symbol, timeframe
+            """
+        else:
+            sql = f"""
+                SELECT
+                    exchange,
+                    symbol,
+                    timeframe,
+                    COUNT(*) AS rows,
+                    MIN(timestamp) AS first_dt,
+                    MAX(timestamp) AS last_dt,
+                    NULL AS last_insert_ms
+                FROM price_data
+                WHERE {where}
+                GROUP BY exchange, symbol, timeframe
+                ORDER BY exchange, symbol, timeframe
+            """
 
-        conn = self._connect()
-        try:
+        with self._connect() as conn:
             rows = conn.execute(sql, params).fetchall()
             results = []
             for r in rows:
@@ -358,16 +1984,16 @@ class SQLiteStore:
                         rows=r["rows"],
                         first_datetime_utc=r["first_dt"],
                         last_datetime_utc=r["last_dt"],
+                        last_insert_ms=r["last_insert_ms"],
                     )
                 )
             return results
-        finally:
-            conn.close()
 
     def validate(
         self,
         exchange: Optional[str] = None,
         timeframe: Optional[str] = None,
+        workers: Optional[int] = None,
     ) -> List[ValidationResult]:
         """Validate data integrity and detect gaps.
 
@@ -376,129 +2002,200 @@ class SQLiteStore:
         - Null values in critical columns (price, volume)
         - Non-positive price or volume
         - Missing bars (gaps) based on expected interval
+
+        See :meth:`iter_validate` for ``workers``.
+        """
+        return list(self.iter_validate(exchange=exchange, timeframe=timeframe, workers=workers))
+
+    def iter_validate(
+        self,
+        exchange: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        workers: Optional[int] = None,
+    ) -> Iterator[ValidationResult]:
+        """Yield the :meth:`validate` result of each series as it completes.
+
+        Each series is read once, in time order, and checked with array
+        operations. Series are validated by ``workers`` processes, one CPU
+        each by default; with one worker, or one series, they are validated
+        in this process. Results follow inventory order either way.
         """
         inventory = self.get_inventory(exchange=exchange, timeframe=timeframe)
-        results: List[ValidationResult] = []
+        if not inventory:
+            return
+        with self._connect() as conn:
+            series = {
+                (item.exchange, item.symbol, item.timeframe): item
+                for item in self._price_series(conn, None, timeframe or None, exchange or None)
+            }
+        # A series first written after the inventory was read is left out.
+        tasks = [
+            (inv, series[key], self._guess_interval_ms(inv.timeframe))
+            for inv in inventory
+            if (key := (inv.exchange, inv.symbol, inv.timeframe)) in series
+        ]
 
-        conn = self._connect()
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        if workers <= 1:
+            for inv, item, interval_ms in tasks:
+                yield _validate_series(self.db_path, inv, item, interval_ms)
+            return
+
+        # Spawned like the decode pool: the caller's threads may hold locks
+        # a forked child would inherit.
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
         try:
-            for inv in inventory:
-                row = conn.execute(
-                    """
-                    SELECT
-                        COUNT(*) AS total,
-                        SUM(CASE WHEN milliseconds IS NULL THEN 1 ELSE 0 END) AS null_ms,
-                        SUM(CASE WHEN timestamp IS NULL THEN 1 ELSE 0 END) AS null_ts,
-                        SUM(CASE WHEN open IS NULL THEN 1 ELSE 0 END) AS null_open,
-                        SUM(CASE WHEN high IS NULL THEN 1 ELSE 0 END) AS null_high,
-                        SUM(CASE WHEN low IS NULL THEN 1 ELSE 0 END) AS null_low,
-                        SUM(CASE WHEN price IS NULL THEN 1 ELSE 0 END) AS null_price,
-                        SUM(CASE WHEN volume IS NULL THEN 1 ELSE 0 END) AS null_vol,
-                        SUM(CASE WHEN price <= 0 THEN 1 ELSE 0 END) AS bad_price,
-                        SUM(CASE WHEN volume <= 0 THEN 1 ELSE 0 END) AS bad_vol
-                    FROM price_data
-                    WHERE exchange = ? AND symbol = ? AND timeframe = ?
-                    """,
-                    (inv.exchange, inv.symbol, inv.timeframe),
-                ).fetchone()
+            yield from executor.map(_validate_series, repeat(self.db_path), *zip(*tasks))
+        finally:
+            executor.shutdown(cancel_futures=True)
 
-                total = row["total"]
-                null_count = int(
-                    (row["null_ms"] or 0)
-                    + (row["null_ts"] or 0)
-                    + (row["null_open"] or 0)
-                    + (row["null_high"] or 0)
-                    + (row["null_low"] or 0)
-                    + (row["null_price"] or 0)
-                    + (row["null_vol"] or 0)
+    def find_gaps(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> List[Gap]:
+        """Return missing-candle runs between stored candles of one series.
+
+        Only gaps bounded by stored candles are reported; history before the
+        first or after the last candle is the job of ``fetch``. ``start_ms``
+        and ``end_ms`` restrict the scan to an inclusive range.
+        """
+        conditions = ["exchange = ?", "symbol = ?", "timeframe = ?"]
+        params: List[object] = [exchange, symbol, timeframe]
+        if start_ms is not None:
+            conditions.append("milliseconds >= ?")
+            params.append(start_ms)
+        if end_ms is not None:
+            conditions.append("milliseconds <= ?")
+            params.append(end_ms)
+
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"""
+                SELECT milliseconds FROM price_data
+                WHERE {" AND ".join(conditions)}
+                ORDER BY milliseconds ASC
+                """,
+                params,
+            )
+            return [
+                Gap(exchange, symbol, timeframe, after_ms, before_ms, missing_bars)
+                for after_ms, before_ms, missing_bars in _iter_gaps(
+                    (row[0] for row in cursor), self._guess_interval_ms(timeframe)
                 )
-                non_positive_price = int(row["bad_price"] or 0)
-                non_positive_volume = int(row["bad_vol"] or 0)
+            ]
 
-                # Detect duplicates via GROUP BY having count > 1
-                dup_row = conn.execute(
-                    """
-                    SELECT COUNT(*) AS dup_count FROM (
-                        SELECT milliseconds
-                        FROM price_data
-                        WHERE exchange = ? AND symbol = ? AND timeframe = ?
-                        GROUP BY exchange, symbol, timeframe, milliseconds
-                        HAVING COUNT(*) > 1
-                    )
-                    """,
-                    (inv.exchange, inv.symbol, inv.timeframe),
-                ).fetchone()
-                duplicate_count = int(dup_row["dup_count"] if dup_row else 0)
+    def derive_timeframe(
+        self,
+        exchange: str,
+        symbol: str,
+        base_timeframe: str,
+        target_timeframe: str,
+        chunk_size: int = 250_000,
+    ) -> int:
+        """Build ``target_timeframe`` candles from stored ``base_timeframe`` candles.
+
+        Each bucket takes the first open, max high, min low, last close and
+        summed volume of its base candles. Intraday buckets are aligned to the
+        Unix epoch, ``1w`` to Monday and ``1M`` to calendar months, matching
+        exchange candles. Runs incrementally after the latest stored target
+        candle, and the trailing bucket is only written once the base series
+        reaches its end. Target timestamps follow the base series' format.
+
+        Returns
+        -------
+        int
+            Number of target rows inserted.
+        """
+        if not can_derive(base_timeframe, target_timeframe):
+            raise ValueError(f"Cannot derive {target_timeframe} candles from {base_timeframe} candles")
 
-                # Detect gaps by iterating ordered timestamps
-                expected_interval = self._guess_interval_ms(inv.timeframe)
-                gap_count = 0
-                largest_gap_bars = 0
+        last_target_ms = self.get_max_timestamp(exchange, symbol, target_timeframe)
+        cursor_ms = 0 if last_target_ms is None else _bucket_end(last_target_ms, target_timeframe)
+        carry: Optional[pd.DataFrame] = None
+        inserted = 0
 
-                timestamps = conn.execute(
+        with self._connect() as conn:
+            sample = conn.execute(
+                "SELECT timestamp FROM price_data WHERE exchange = ? AND symbol = ? AND timeframe = ? LIMIT 1",
+                (exchange, symbol, base_timeframe),
+            ).fetchone()
+            unit = "ms" if sample and _MILLIS_TIMESTAMP.search(sample[0]) else "s"
+            while True:
+                chunk = pd.read_sql_query(
                     """
-                    SELECT milliseconds FROM price_data
+                    SELECT milliseconds, open, high, low, price, volume
+                    FROM price_data
                     WHERE exchange = ? AND symbol = ? AND timeframe = ?
+                      AND milliseconds >= ?
                     ORDER BY milliseconds ASC
+                    LIMIT ?
                     """,
-                    (inv.exchange, inv.symbol, inv.timeframe),
-                ).fetchall()
-
-                if len(timestamps) > 1:
-                    prev = timestamps[0]["milliseconds"]
-                    for ts_row in timestamps[1:]:
-                        curr = ts_row["milliseconds"]
-                        diff = curr - prev
-                        if diff > expected_interval:
-                            gap_bars = round(diff / expected_interval) - 1
-                            gap_count += gap_bars
-                            if gap_bars > largest_gap_bars:
-                                largest_gap_bars = gap_bars
-                        prev = curr
-
-                status = "PASS"
-                if duplicate_count > 0 or null_count > 0 or gap_count > 0:
-                    status = "WARN"
-                if non_positive_price > 0 or non_positive_volume > 0:
-                    status = "FAIL"
+                    conn,
+                    params=(exchange, symbol, base_timeframe, cursor_ms, chunk_size),
+                )
+                if chunk.empty:
+                    break
+                cursor_ms = int(chunk["milliseconds"].iloc[-1]) + 1
+                frame = chunk if carry is None else pd.concat([carry, chunk], ignore_index=True)
+                buckets = _bucket_starts(frame["milliseconds"].to_numpy(np.int64), target_timeframe)
 
-                results.append(
-                    ValidationResult(
-                        exchange=inv.exchange,
-                        symbol=inv.symbol,
-                        timeframe=inv.timeframe,
-                        rows=total,
-                        duplicate_count=duplicate_count,
-                        null_count=null_count,
-                        non_positive_price_count=non_positive_price,
-                        non_positive_volume_count=non_positive_volume,
-                        expected_interval_ms=expected_interval,
-                        gap_count=gap_count,
-                        largest_gap_bars=largest_gap_bars,
-                        first_datetime_utc=inv.first_datetime_utc,
-                        last_datetime_utc=inv.last_datetime_utc,
-                        status=status,
+                # The last bucket may continue in the next chunk.
+                closed = buckets < buckets[-1]
+                if closed.any():
+                    inserted += self._insert_buckets(
+                        exchange, symbol, target_timeframe, frame[closed], buckets[closed], unit
                     )
+                carry = frame[~closed].reset_index(drop=True)
+                if len(chunk) < chunk_size:
+                    break
+
+        if carry is not None and not carry.empty:
+            bucket_start = int(_bucket_starts(carry["milliseconds"].to_numpy(np.int64)[:1], target_timeframe)[0])
+            last_base_ms = int(carry["milliseconds"].iloc[-1])
+            if _bucket_end(bucket_start, target_timeframe) <= last_base_ms + TIMEFRAME_MS[base_timeframe]:
+                inserted += self._insert_buckets(
+                    exchange,
+                    symbol,
+                    target_timeframe,
+                    carry,
+                    np.full(len(carry), bucket_start, dtype=np.int64),
+                    unit,
                 )
-            return results
-        finally:
-            conn.close()
+        return inserted
+
+    def _insert_buckets(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        frame: pd.DataFrame,
+        buckets: np.ndarray,
+        unit: str,
+    ) -> int:
+        milliseconds, open_, high, low, close, volume = _aggregate_buckets(frame, buckets)
+        timestamps = np.char.add(np.datetime_as_string(milliseconds.astype("datetime64[ms]"), unit=unit), "Z")
+        count = len(milliseconds)
+        rows = list(
+            zip(
+                milliseconds.tolist(),
+                timestamps.tolist(),
+                [exchange] * count,
+                [symbol] * count,
+                [timeframe] * count,
+                open_.tolist(),
+                high.tolist(),
+                low.tolist(),
+                close.tolist(),
+                volume.tolist(),
+            )
+        )
+        return self.insert_ohlcv(rows)
 
     @staticmethod
     def _guess_interval_ms(timeframe: str) -> int:
         """Guess the expected interval in milliseconds for a timeframe string."""
-        mapping = {
-            "1m": 60_000,
-            "5m": 300_000,
-            "15m": 900_000,
-            "30m": 1_800_000,
-            "1h": 3_600_000,
-            "2h": 7_200_000,
-            "4h": 14_400_000,
-            "6h": 21_600_000,
-            "12h": 43_200_000,
-            "1d": 86_400_000,
-            "1w": 604_800_000,
-            "1M": 2_592_000_000,
-        }
-        return mapping.get(timeframe, 3_600_000)
+        return TIMEFRAME_MS.get(timeframe, 3_600_000)
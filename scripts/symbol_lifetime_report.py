@@ -10,7 +10,13 @@ from html import escape
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 
-from data_fetcher.providers.crypto import DEFAULT_EXCHANGE, CryptoDataFetcher
+from data_fetcher.providers.crypto import (
+    DEFAULT_EXCHANGE,
+    CryptoDataFetcher,
+    probe_earliest_timestamps,
+    resolve_listings,
+)
+from data_fetcher.storage.sqlite import SQLiteStore
 
 
 def _read_symbol_file(path: Path) -> List[str]:
@@ -341,6 +347,9 @@ def main() -> None:
     parser.add_argument("--limit", type=int, default=200)
     parser.add_argument("--active-only", action="store_true")
     parser.add_argument("--all-types", action="store_true")
+    parser.add_argument("--workers", type=int, default=8, help="Symbols probed concurrently")
+    parser.add_argument("--db-path", help="Reuse and update the listing catalog in this SQLite database")
+    parser.add_argument("--refresh-listings", action="store_true")
     parser.add_argument("--from-csv", type=Path, help="Render HTML from an existing lifetime CSV without probing")
     parser.add_argument("--csv-output", type=Path, default=Path("symbol_lifetimes.csv"))
     parser.add_argument("--html-output", type=Path, default=Path("symbol_lifetimes.html"))
@@ -366,12 +375,32 @@ def main() -> None:
         limit=args.limit,
     )
 
+    symbols = [row["symbol"] for row in symbol_rows]
+
+    def probe(batch: List[str]) -> Dict[str, tuple]:
+        print(f"Probing {len(batch)} of {len(symbols)} symbols with {args.workers} workers")
+        return probe_earliest_timestamps(
+            args.exchange, batch, args.timeframe, workers=args.workers, fetcher=fetcher
+        )
+
+    if args.db_path:
+        listings = resolve_listings(
+            SQLiteStore(args.db_path),
+            args.exchange,
+            symbols,
+            args.timeframe,
+            refresh=args.refresh_listings,
+            probe=probe,
+        )
+        earliest = {sym: (item.earliest_ms, item.method) for sym, item in listings.items()}
+    else:
+        earliest = probe(symbols)
+
     now_iso = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
     rows = []
-    for index, row in enumerate(symbol_rows, start=1):
+    for row in symbol_rows:
         symbol = row["symbol"]
-        print(f"[{index}/{len(symbol_rows)}] probing {symbol}")
-        start_ms, method = fetcher.fetch_earliest_timestamp(symbol, args.timeframe)
+        start_ms, method = earliest[symbol]
         start_iso = fetcher.exchange.iso8601(start_ms) if start_ms is not None else "N/A"
         rows.append(
             {
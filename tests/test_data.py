@@ -1,24 +1,39 @@
 """Tests for data_fetcher Phase 1: crypto OHLCV SQLite CLI."""
 
+import http.server
+import io
 import sqlite3
 import tempfile
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import date
 from pathlib import Path
-from typing import List
-from unittest.mock import Mock, patch
+from typing import Iterator, List, Optional
+from unittest.mock import AsyncMock, Mock, patch
 
+import ccxt
 import pytest
+import numpy as np
 import pandas as pd
 from typer.testing import CliRunner
 
 from data_fetcher.cli import app
 from data_fetcher.data import BaseDataFetcher
+from data_fetcher.models import ArchiveFile, SymbolListing
 from data_fetcher.providers.binance_archive import (
+    ArchiveHTTPClient,
+    _iso8601_array,
+    _read_zip_klines,
     archive_filename,
     archive_url,
+    create_decode_pool,
     ingest_binance_archives,
+    local_archive_path,
 )
+from data_fetcher.providers.crypto import create_exchange
+from data_fetcher.storage.cache import PriceCache
 from data_fetcher.storage.sqlite import SQLiteStore
 
 runner = CliRunner()
@@ -42,6 +57,26 @@ def store(temp_db: str) -> SQLiteStore:
     return SQLiteStore(temp_db)
 
 
+def _create_v1_db(db_path: str, rows: Optional[List[tuple]] = None) -> None:
+    """Create a database on the version 1 rowid schema."""
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """
+        CREATE TABLE price_data (
+            milliseconds INTEGER NOT NULL, timestamp TEXT NOT NULL, exchange TEXT NOT NULL,
+            symbol TEXT NOT NULL, timeframe TEXT NOT NULL, open REAL NOT NULL, high REAL NOT NULL,
+            low REAL NOT NULL, price REAL NOT NULL, volume REAL NOT NULL,
+            UNIQUE(exchange, symbol, timeframe, milliseconds)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX idx_price_data_symbol ON price_data(exchange, symbol, timeframe)")
+    conn.execute("CREATE INDEX idx_price_data_time ON price_data(milliseconds)")
+    conn.executemany("INSERT INTO price_data VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows or [])
+    conn.commit()
+    conn.close()
+
+
 @pytest.fixture
 def sample_ohlcv_rows() -> List[tuple]:
     """Return a list of 3 OHLCV rows for binance BTC/USDT 1h."""
@@ -122,22 +157,214 @@ class TestBinanceArchive:
                 ),
             )
 
-        result = ingest_binance_archives(
+        with patch("data_fetcher.providers.binance_archive.first_archive_month", return_value=None):
+            result = ingest_binance_archives(
+                store=store,
+                symbol="BTC/USDT",
+                timeframe="1h",
+                since=date(2024, 1, 1),
+                until=date(2024, 1, 31),
+                cache_dir=tmp_path,
+                include_daily_current_month=False,
+            )
+
+        assert result.files_cached == 1
+        assert result.candles_seen == 2
+        assert result.rows_inserted == 2
+        inventory = store.get_inventory(symbol="BTC/USDT", timeframe="1h")
+        assert len(inventory) == 1
+        assert inventory[0].rows == 2
+
+        manifest = store.get_archive_manifest("binance", "BTC/USDT", "1h")
+        assert manifest[("monthly", "2024-01")].rows == 2
+        rerun = ingest_binance_archives(
             store=store,
             symbol="BTC/USDT",
             timeframe="1h",
-            since=date(2024, 1, 1),
+            since=date(2023, 6, 1),
             until=date(2024, 1, 31),
             cache_dir=tmp_path,
             include_daily_current_month=False,
         )
+        assert (rerun.files_skipped, rerun.files_cached, rerun.candles_seen) == (8, 0, 0)
+
+        # Overwriting the key forgets its manifest, so the archive is read again.
+        store.delete_for_key("binance", "BTC/USDT", "1h")
+        assert store.get_archive_manifest("binance", "BTC/USDT", "1h") == {}
+        with patch("data_fetcher.providers.binance_archive.first_archive_month", return_value=None):
+            refill = ingest_binance_archives(
+                store=store,
+                symbol="BTC/USDT",
+                timeframe="1h",
+                since=date(2024, 1, 1),
+                until=date(2024, 1, 31),
+                cache_dir=tmp_path,
+                include_daily_current_month=False,
+            )
+        assert (refill.files_skipped, refill.files_cached, refill.rows_inserted) == (0, 1, 2)
+
+    def test_ingest_decodes_in_worker_processes(self, store: SQLiteStore, tmp_path: Path) -> None:
+        """Verify pooled decoding writes every file in order and reports stage times."""
+        month_starts = {"2024-01": 1704067200000, "2024-02": 1706745600000, "2024-03": 1709251200000}
+        for label, start in month_starts.items():
+            path = local_archive_path(tmp_path, "BTCUSDT", "1h", date.fromisoformat(f"{label}-01"), "monthly")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with zipfile.ZipFile(path, "w") as zf:
+                zf.writestr(
+                    path.with_suffix(".csv").name,
+                    "\n".join(f"{start + h * 3_600_000},1,2,0.5,1.5,10" for h in range(24)),
+                )
 
-        assert result.files_cached == 1
-        assert result.candles_seen == 2
-        assert result.rows_inserted == 2
-        inventory = store.get_inventory(symbol="BTC/USDT", timeframe="1h")
-        assert len(inventory) == 1
-        assert inventory[0].rows == 2
+        pool = create_decode_pool(2)
+        try:
+            with patch("data_fetcher.providers.binance_archive.first_archive_month", return_value=None):
+                result = ingest_binance_archives(
+                    store=store,
+                    symbol="BTC/USDT",
+                    timeframe="1h",
+                    since=date(2024, 1, 1),
+                    until=date(2024, 3, 31),
+                    cache_dir=tmp_path,
+                    include_daily_current_month=False,
+                    chunk_size=30,
+                    decode_workers=2,
+                    decode_pool=pool,
+                )
+        finally:
+            pool.shutdown()
+
+        assert (result.files_cached, result.candles_seen, result.rows_inserted) == (3, 72, 72)
+        assert result.decode_seconds > 0 and result.write_seconds > 0
+        assert sorted(store.get_archive_manifest("binance", "BTC/USDT", "1h")) == [
+            ("monthly", label) for label in month_starts
+        ]
+        assert store.get_max_timestamp("binance", "BTC/USDT", "1h") == month_starts["2024-03"] + 23 * 3_600_000
+
+    def test_read_zip_klines_skips_header_and_bad_rows(self, tmp_path: Path) -> None:
+        """Verify the columnar decoder drops headers and malformed rows."""
+        path = tmp_path / "BTCUSDT-1m-2024-01.zip"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr(
+                "BTCUSDT-1m-2024-01.csv",
+                "open_time,open,high,low,close,volume\n"
+                "1704067200000,1.5,2,1,1.75,10\n"
+                "1704067260000,bad,2,1,1.75,10\n"
+                "1704067320000,1.25\n"
+                "1704067380000,1,2,0.5,1.5,20.25\n",
+            )
+
+        frame = _read_zip_klines(path)
+
+        assert frame["milliseconds"].tolist() == [1704067200000, 1704067380000]
+        assert frame["volume"].tolist() == [10.0, 20.25]
+        assert _iso8601_array(frame["milliseconds"].to_numpy()).tolist() == [
+            "2024-01-01T00:00:00Z",
+            "2024-01-01T00:03:00Z",
+        ]
+
+    @staticmethod
+    @contextmanager
+    def _archive_server(listing: Optional[bytes] = None) -> Iterator[List[str]]:
+        """Serve a Feb 2024 BTCUSDT 1h ZIP and an optional bucket listing; yield request paths."""
+        payload = io.BytesIO()
+        with zipfile.ZipFile(payload, "w") as zf:
+            zf.writestr("BTCUSDT-1h-2024-02.csv", "1706745600000,42000,42100,41900,42050,100.5,1706749199999\n")
+        requests: List[str] = []
+        connections = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                connections.append(self.client_address)
+
+            def do_GET(self) -> None:
+                requests.append(self.path)
+                if self.path.startswith("/listing"):
+                    body = listing or b""
+                else:
+                    body = payload.getvalue() if self.path.endswith("2024-02.zip") else b""
+                self.send_response(200 if body else 404)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        root = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with patch("data_fetcher.providers.binance_archive.BINANCE_ARCHIVE_BASE_URL", f"{root}/data/spot"), \
+                    patch("data_fetcher.providers.binance_archive.BINANCE_ARCHIVE_LISTING_URL", f"{root}/listing"):
+                yield requests
+        finally:
+            server.shutdown()
+            server.server_close()
+        # One keep-alive connection per download worker plus the planning thread.
+        assert len(connections) <= 3
+
+    @staticmethod
+    def _ingest(store: SQLiteStore, tmp_path: Path, **kwargs):
+        return ingest_binance_archives(
+            store=store,
+            symbol="BTC/USDT",
+            timeframe="1h",
+            since=date(2023, 1, 1),
+            until=date(2024, 2, 29),
+            cache_dir=tmp_path,
+            include_daily_current_month=False,
+            download_workers=2,
+            **kwargs,
+        )
+
+    def test_ingest_downloads_archives_over_pooled_client(self, store: SQLiteStore, tmp_path: Path) -> None:
+        """Verify parallel downloads keep the accounting and 404s are negative-cached."""
+        with self._archive_server() as requests:
+            result = self._ingest(store, tmp_path)
+            assert (result.files_downloaded, result.files_missing, result.files_cached) == (1, 13, 0)
+            assert result.rows_inserted == 1
+
+            requests.clear()
+            rerun = self._ingest(store, tmp_path, resume=False)
+            assert (rerun.files_cached, rerun.files_missing, rerun.files_skipped) == (1, 0, 13)
+            assert requests == []
+
+    def test_ingest_reuses_connections_across_calls(self, store: SQLiteStore, tmp_path: Path) -> None:
+        """Verify a shared client and download pool keep their connections from one call to the next."""
+        client = ArchiveHTTPClient()
+        download_pool = ThreadPoolExecutor(max_workers=2)
+        try:
+            with self._archive_server():
+                for cache in ("first", "second"):
+                    result = self._ingest(
+                        store, tmp_path / cache, resume=False, client=client, download_pool=download_pool
+                    )
+                    assert result.files_downloaded == 1
+            # A private download pool leaves no connections behind on the shared client.
+            with self._archive_server():
+                self._ingest(store, tmp_path / "third", resume=False, client=client)
+            assert all(thread.is_alive() for thread in client._connections)
+        finally:
+            download_pool.shutdown()
+            client.close()
+
+    def test_ingest_starts_at_first_listed_month(self, store: SQLiteStore, tmp_path: Path) -> None:
+        """Verify the bucket listing moves planning to the first archived month."""
+        listing = (
+            b'<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            b"<Contents><Key>data/spot/monthly/klines/BTCUSDT/1h/BTCUSDT-1h-2024-02.zip</Key></Contents>"
+            b"<Contents><Key>data/spot/monthly/klines/BTCUSDT/1h/BTCUSDT-1h-2024-02.zip.CHECKSUM</Key></Contents>"
+            b"</ListBucketResult>"
+        )
+        with self._archive_server(listing) as requests:
+            result = self._ingest(store, tmp_path)
+
+        assert (result.files_downloaded, result.files_missing) == (1, 0)
+        assert len(requests) == 2
 
 
 # ---------------------------------------------------------------------------
@@ -147,11 +374,12 @@ class TestBinanceArchive:
 
 class TestSQLiteStoreSchema:
     def test_schema_creation(self, temp_db: str) -> None:
-        """Verify the price_data table is created with the correct schema."""
+        """Verify the price_data view and candle table have the correct schema."""
         SQLiteStore(temp_db)  # triggers schema creation / dir creation
         conn = sqlite3.connect(temp_db)
         cursor = conn.execute("PRAGMA table_info(price_data)")
         columns = {row[1]: row[2] for row in cursor.fetchall()}
+        candle_types = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(candles)")}
         conn.close()
 
         assert "milliseconds" in columns
@@ -165,8 +393,188 @@ class TestSQLiteStoreSchema:
         assert "price" in columns
         assert "volume" in columns
         assert columns["milliseconds"] == "INTEGER"
-        assert columns["price"] == "REAL"
-        assert columns["volume"] == "REAL"
+        assert candle_types["price"] == "REAL"
+        assert candle_types["volume"] == "REAL"
+
+    def test_connection_is_reused_per_thread_with_profile_pragmas(
+        self, temp_db: str, sample_ohlcv_rows: List[tuple]
+    ) -> None:
+        """Verify calls share one tuned connection per thread until the store closes."""
+        with SQLiteStore(temp_db) as store:
+            with store._connect() as first, store._connect() as second:
+                assert first is second
+                assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+                assert first.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert store.insert_ohlcv(sample_ohlcv_rows[:2]) == 2
+            assert store.insert_ohlcv(sample_ohlcv_rows) == 1
+
+            other: List[sqlite3.Connection] = []
+
+            def open_connection() -> None:
+                with store._connect() as conn:
+                    other.append(conn)
+
+            worker = threading.Thread(target=open_connection)
+            worker.start()
+            worker.join()
+            assert other[0] is not first
+        assert store._connections == []
+
+        safe = SQLiteStore(temp_db, profile="safe")
+        with safe._connect() as conn:
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+        safe.close()
+        with pytest.raises(ValueError):
+            SQLiteStore(temp_db, profile="turbo")
+
+    def test_bulk_load_merges_staged_rows_and_rebuilds_indexes(
+        self, temp_db: str, sample_ohlcv_rows: List[tuple]
+    ) -> None:
+        """Verify bulk loads dedupe through staging and restore dropped v1 indexes on exit."""
+        _create_v1_db(temp_db)
+        store = SQLiteStore(temp_db)
+
+        def index_names() -> List[str]:
+            with store._connect() as conn:
+                rows = conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_price_data_%'"
+                ).fetchall()
+            return sorted(row[0] for row in rows)
+
+        store.insert_ohlcv(sample_ohlcv_rows[:1])
+        with store.bulk_load(drop_indexes=True):
+            assert index_names() == []
+            assert store.insert_ohlcv(list(reversed(sample_ohlcv_rows))) == 2
+            assert store.insert_ohlcv(sample_ohlcv_rows) == 0
+        assert index_names() == ["idx_price_data_symbol", "idx_price_data_time"]
+        assert store.get_inventory()[0].rows == 3
+        with store._connect() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM temp.price_data_staging").fetchone()[0] == 0
+
+    def test_new_databases_use_series_catalog(self, store: SQLiteStore, sample_ohlcv_rows: List[tuple]) -> None:
+        """Verify new databases key clustered candles by series id behind a price_data view."""
+        store.insert_ohlcv(sample_ohlcv_rows)
+        conn = sqlite3.connect(store.db_path)
+        kinds = dict(conn.execute("SELECT name, type FROM sqlite_master WHERE name IN ('price_data', 'candles')"))
+        candles_sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'candles'").fetchone()[0]
+        series = conn.execute("SELECT series_id, exchange, symbol, timeframe FROM series").fetchall()
+        candle_columns = [row[1] for row in conn.execute("PRAGMA table_info(candles)")]
+        timestamps = [row[0] for row in conn.execute("SELECT timestamp FROM price_data ORDER BY milliseconds")]
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.close()
+        assert kinds == {"price_data": "view", "candles": "table"}
+        assert "WITHOUT ROWID" in candles_sql
+        assert series == [(1, "binance", "BTC/USDT", "1h")]
+        assert candle_columns == ["series_id", "milliseconds", "open", "high", "low", "price", "volume"]
+        assert timestamps == [row[1] for row in sample_ohlcv_rows]
+        assert version == store.schema_version == 7
+
+        ccxt_rows = [(ms, f"{ts[:-1]}.000Z", ex, "ETH/USDT", *rest) for ms, ts, ex, _, *rest in sample_ohlcv_rows]
+        store.insert_ohlcv(ccxt_rows)
+        conn = sqlite3.connect(store.db_path)
+        ccxt_timestamps = [
+            row[0] for row in conn.execute("SELECT timestamp FROM price_data WHERE symbol = 'ETH/USDT' ORDER BY milliseconds")
+        ]
+        conn.close()
+        assert ccxt_timestamps == [row[1] for row in ccxt_rows]
+        assert store.get_inventory(symbol="ETH/USDT")[0].first_datetime_utc == ccxt_rows[0][1]
+
+        assert store.delete_for_key("binance", "BTC/USDT", "1h") == 3
+        assert store.get_max_timestamp("binance", "BTC/USDT", "1h") is None
+
+    def test_integer_encoding_round_trips_exactly(self, temp_db: str, sample_ohlcv_rows: List[tuple]) -> None:
+        """Verify encoded series store scaled integers, widen on demand and read back exact floats."""
+        store = SQLiteStore(temp_db, integer_encoding=True)
+        store.set_market_precision("binance", "BTC/USDT", 1, 3)
+        finer = [(1704078000000, "2024-01-01T03:00:00Z", "binance", "BTC/USDT", "1h",
+                  42150.01, 42160.25, 42100.1, 42120.33, 0.00012345)]
+        odd = [(1704081600000, "2024-01-01T04:00:00Z", "binance", "BTC/USDT", "1h",
+                42120.33, 42130.0, 42110.0, 42125.0, 1 / 3)]
+
+        assert store.insert_ohlcv(sample_ohlcv_rows) == 3
+        conn = sqlite3.connect(temp_db)
+        assert conn.execute("SELECT price_scale, volume_scale FROM series").fetchone() == (10, 1000)
+        assert conn.execute("SELECT price, volume FROM candles ORDER BY milliseconds").fetchone() == (420500.0, 100500.0)
+
+        assert store.insert_ohlcv(finer) == 1
+        assert store.insert_ohlcv(odd) == 1
+        assert conn.execute("SELECT price_scale, volume_scale FROM series").fetchone() == (100, None)
+        stored = conn.execute(
+            "SELECT open, high, low, price, volume FROM price_data ORDER BY milliseconds"
+        ).fetchall()
+        conn.close()
+        assert stored == [row[5:] for row in sample_ohlcv_rows + finer + odd]
+        assert store.insert_ohlcv(sample_ohlcv_rows + finer + odd) == 0
+
+    def test_integer_encoding_follows_rescale_by_another_store(
+        self, temp_db: str, sample_ohlcv_rows: List[tuple]
+    ) -> None:
+        """Verify a store encodes with the scales another writer left, not its cached ones."""
+        first = SQLiteStore(temp_db, integer_encoding=True)
+        first.set_market_precision("binance", "BTC/USDT", 1, 3)
+        second = SQLiteStore(temp_db, integer_encoding=True)
+        finer = (1704078000000, "", "binance", "BTC/USDT", "1h", 42150.01, 42160.25, 42100.1, 42120.33, 1 / 3)
+        later = (1704081600000, "", "binance", "BTC/USDT", "1h", 42120.5, 42130.0, 42110.0, 42125.5, 0.5)
+
+        first.insert_ohlcv(sample_ohlcv_rows[:1])
+        second.insert_ohlcv([finer])
+        first.insert_ohlcv([later])
+
+        stored = first.load_prices(["BTC/USDT"], "1h", "binance")
+        assert stored["price"].tolist() == [42050.0, 42120.33, 42125.5]
+        assert stored["volume"].tolist() == [100.5, 1 / 3, 0.5]
+
+    def test_series_catalog_tracks_writes(self, store: SQLiteStore, sample_ohlcv_rows: List[tuple]) -> None:
+        """Verify inserts, bulk loads and deletes keep the per-series summary current."""
+        eth_rows = [(ms, ts, ex, "ETH/USDT", *rest) for ms, ts, ex, _, *rest in sample_ohlcv_rows]
+
+        def summary(symbol: str) -> tuple:
+            with store._connect() as conn:
+                return tuple(conn.execute(
+                    "SELECT row_count, min_ms, max_ms, last_insert_ms IS NOT NULL FROM series WHERE symbol = ?",
+                    (symbol,),
+                ).fetchone())
+
+        store.insert_ohlcv(sample_ohlcv_rows[1:])
+        assert store.insert_ohlcv(sample_ohlcv_rows) == 1
+        with store.bulk_load():
+            assert store.insert_ohlcv(eth_rows + sample_ohlcv_rows) == 3
+            with store._connect() as conn:
+                # Clustered candles are inserted directly, not staged.
+                assert conn.execute("SELECT name FROM temp.sqlite_master").fetchall() == []
+        assert summary("BTC/USDT") == (3, 1704067200000, 1704074400000, 1)
+        assert summary("ETH/USDT") == (3, 1704067200000, 1704074400000, 1)
+        assert store.get_max_timestamp("binance", "BTC/USDT", "1h") == 1704074400000
+        inventory = store.get_inventory(symbol="BTC/USDT")
+        assert [(r.rows, r.first_datetime_utc, r.last_datetime_utc) for r in inventory] == [
+            (3, "2024-01-01T00:00:00Z", "2024-01-01T02:00:00Z")
+        ]
+        assert inventory[0].last_insert_ms is not None
+
+        assert store.delete_for_key("binance", "BTC/USDT", "1h") == 3
+        assert summary("BTC/USDT") == (0, None, None, 0)
+        assert [r.symbol for r in store.get_inventory()] == ["ETH/USDT"]
+        assert store.get_max_timestamp("binance", "BTC/USDT", "1h") is None
+
+    def test_migrate_converts_v1_in_chunks(self, temp_db: str, sample_ohlcv_rows: List[tuple]) -> None:
+        """Verify migrate copies every row into the series tables and drops v1 indexes."""
+        _create_v1_db(temp_db, list(reversed(sample_ohlcv_rows)))
+        store = SQLiteStore(temp_db)
+        assert store.schema_version == 1
+
+        progress: List[tuple] = []
+        assert store.migrate(chunk_rows=2, progress=lambda done, total: progress.append((done, total)))
+        assert progress == [(2, 3), (3, 3)]
+        assert not store.migrate()
+
+        reopened = SQLiteStore(temp_db)
+        assert reopened.schema_version == 7
+        assert reopened.get_inventory()[0].rows == 3
+        assert reopened.insert_ohlcv(sample_ohlcv_rows) == 0
+        conn = sqlite3.connect(temp_db)
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        conn.close()
+        assert "idx_price_data_time" not in names and {"series", "candles"} <= names
 
     def test_unique_constraint(self, store: SQLiteStore, sample_ohlcv_rows: List[tuple]) -> None:
         """Verify that inserting the same row twice is idempotent."""
@@ -237,6 +645,46 @@ class TestSQLiteStoreDelete:
         assert count == 0
 
 
+class TestSQLiteStoreListings:
+    def test_get_listings_freshness(self, store: SQLiteStore) -> None:
+        """Verify found listings are kept and failed probes expire."""
+        now_ms = 1704067200000
+        store.upsert_listings([
+            SymbolListing("binance", "BTC/USDT", "1h", 1502942400000, "since_zero", now_ms - 10 * 86_400_000),
+            SymbolListing("binance", "OLD/USDT", "1h", None, "failed", now_ms - 2 * 86_400_000),
+            SymbolListing("binance", "NEW/USDT", "1h", None, "failed", now_ms - 3_600_000),
+        ])
+
+        listings = store.get_listings("binance", "1h", now_ms=now_ms)
+
+        assert sorted(listings) == ["BTC/USDT", "NEW/USDT"]
+        assert listings["BTC/USDT"].earliest_ms == 1502942400000
+        assert store.get_listings("binance", "1h", ["BTC/USDT"], now_ms=now_ms).keys() == {"BTC/USDT"}
+        assert store.get_listings("binance", "4h", now_ms=now_ms) == {}
+
+
+    def test_missing_archives_expire(self, store: SQLiteStore) -> None:
+        """Verify old 404s are cached for a month and fresh periods only briefly."""
+        day = 86_400_000
+        now_ms = 1704067200000
+        store.record_missing_archives(
+            "binance",
+            "BTC/USDT",
+            "1h",
+            [("monthly", "2020-01", now_ms - 400 * day), ("monthly", "2023-12", now_ms - day)],
+            checked_at_ms=now_ms,
+        )
+
+        assert store.get_missing_archives("binance", "BTC/USDT", "1h", now_ms=now_ms + 60_000) == {
+            ("monthly", "2020-01"),
+            ("monthly", "2023-12"),
+        }
+        assert store.get_missing_archives("binance", "BTC/USDT", "1h", now_ms=now_ms + 2 * 3_600_000) == {
+            ("monthly", "2020-01"),
+        }
+        assert store.get_missing_archives("binance", "BTC/USDT", "1h", now_ms=now_ms + 31 * day) == set()
+
+
 class TestSQLiteStorePriceReads:
     def test_load_price_frame_filters_and_orders_rows(
         self, store: SQLiteStore, sample_ohlcv_rows: List[tuple]
@@ -377,6 +825,156 @@ class TestSQLiteStorePriceReads:
         assert df.loc[0, "exchange"] == "binance"
         assert df.loc[0, "timeframe"] == "1h"
 
+    def test_load_price_table_matches_load_prices(self, store: SQLiteStore) -> None:
+        rows = [
+            (1704070800000, "2024-01-01T01:00:00Z", "binance", "ETH/USDT", "1h", 100, 101, 99, 100.5, 10),
+            (1704067200000, "2024-01-01T00:00:00Z", "binance", "BTC/USDT", "1h", 200, 201, 199, 200.5, 20),
+            (1704067200000, "2024-01-01T00:00:00Z", "binance", "ETH/USDT", "1h", 99, 100, 98, 99.5, 9),
+            (1704067200000, "2024-01-01T00:00:00Z", "binance", "ETH/USDT", "1d", 99, 100, 98, 99.5, 9),
+        ]
+        store.insert_ohlcv(rows)
+
+        table = store.load_price_table(exchange="binance", timeframe="1h", output="pandas", include_key_columns=True)
+        expected = store.load_prices(exchange="binance", timeframe="1h", include_key_columns=True)
+
+        assert list(table.columns) == [
+            "milliseconds", "timestamp", "symbol", "open", "high", "low", "price", "volume", "exchange", "timeframe",
+        ]
+        assert table["milliseconds"].dtype == "int64" and table["price"].dtype == "float64"
+        assert isinstance(table["symbol"].dtype, pd.CategoricalDtype)
+        for column in ["milliseconds", "symbol", "price", "volume", "exchange", "timeframe"]:
+            assert table[column].tolist() == expected[column].tolist()
+        assert table["timestamp"].dt.strftime("%Y-%m-%dT%H:%M:%SZ").tolist() == expected["timestamp"].tolist()
+
+        ranged = store.load_price_table(["ETH/USDT"], "1h", "binance", start_ms=1704070800000, output="pandas")
+        assert ranged["open"].tolist() == [100.0]
+        assert store.load_price_table(symbols=[], output="pandas").empty
+        with pytest.raises(ValueError, match="timeframe is required"):
+            store.load_price_table(["ETH/USDT"], exchange="binance", output="pandas")
+
+    def test_load_price_table_returns_dictionary_encoded_arrow(
+        self, store: SQLiteStore, sample_ohlcv_rows: List[tuple]
+    ) -> None:
+        pa = pytest.importorskip("pyarrow")
+        store.insert_ohlcv(sample_ohlcv_rows)
+
+        table = store.load_price_table(["BTC/USDT"], "1h", "binance")
+
+        assert table.schema.field("milliseconds").type == pa.int64()
+        assert table.schema.field("price").type == pa.float64()
+        assert pa.types.is_dictionary(table.schema.field("symbol").type)
+        assert table.column("price").to_pylist() == [row[8] for row in sample_ohlcv_rows]
+
+    def test_iter_prices_yields_time_major_windows(self, store: SQLiteStore) -> None:
+        hour = 3_600_000
+        start = 1704067200000
+        rows = [
+            (start + i * hour, "", "binance", symbol, "1h", 1, 1, 1, float(i), 1)
+            for symbol in ["ETH/USDT", "BTC/USDT"]
+            for i in range(5)
+        ]
+        store.insert_ohlcv(rows)
+
+        for prefetch in (0, 2):
+            frames = list(
+                store.iter_prices(
+                    exchange="binance", timeframe="1h", start_ms=start + hour, window_ms=2 * hour, prefetch=prefetch
+                )
+            )
+            assert [len(frame) for frame in frames] == [4, 4]
+            assert frames[0][["milliseconds", "symbol"]].values.tolist() == [
+                [start + hour, "BTC/USDT"],
+                [start + hour, "ETH/USDT"],
+                [start + 2 * hour, "BTC/USDT"],
+                [start + 2 * hour, "ETH/USDT"],
+            ]
+            assert frames[1]["price"].tolist() == [3.0, 3.0, 4.0, 4.0]
+            assert list(frames[1]["symbol"].cat.categories) == ["BTC/USDT", "ETH/USDT"]
+
+        windows = store.iter_prices(exchange="binance", timeframe="1h", window_ms=hour)
+        assert len(next(windows)) == 2
+        windows.close()
+        store.insert_ohlcv([(start, "", "binance", "BTC/USDT", "1d", 1, 1, 1, 1, 1)])
+        with pytest.raises(ValueError, match="timeframe is required"):
+            next(store.iter_prices(exchange="binance"))
+
+    def test_load_price_matrix_aligns_symbols_on_timeframe_grid(self, store: SQLiteStore) -> None:
+        hour = 3_600_000
+        start = 1704067200000
+        store.insert_ohlcv([
+            (start + i * hour, "", "binance", "BTC/USDT", "1h", 1, 1, 1, 100.0 + i, 10.0)
+            for i in [0, 1, 3]
+        ] + [
+            (start + i * hour, "", "binance", "ETH/USDT", "1h", 1, 1, 1, 50.0 + i, 5.0)
+            for i in [1, 2]
+        ])
+
+        matrix = store.load_price_matrix(["ETH/USDT", "BTC/USDT", "SOL/USDT"], timeframe="1h", exchange="binance")
+        assert matrix.milliseconds.tolist() == [start + i * hour for i in range(4)]
+        assert matrix.symbols == ["ETH/USDT", "BTC/USDT", "SOL/USDT"]
+        np.testing.assert_array_equal(
+            matrix.values,
+            [[np.nan, 100.0, np.nan], [51.0, 101.0, np.nan], [52.0, 101.0, np.nan], [52.0, 103.0, np.nan]],
+        )
+
+        volume = store.load_price_matrix(field="volume", timeframe="1h", start_ms=start + 1, fill=0.0)
+        assert volume.symbols == ["BTC/USDT", "ETH/USDT"]
+        assert volume.values.tolist() == [[10.0, 5.0], [0.0, 5.0], [10.0, 0.0]]
+
+        raw = store.load_price_matrix(timeframe="1h", fill=None)
+        assert np.isnan(raw.values[2, 0])
+        with pytest.raises(ValueError, match="Unknown field"):
+            store.load_price_matrix(field="close")
+
+    def test_price_cache_serves_until_series_change(self, temp_db: str, sample_ohlcv_rows: List[tuple]) -> None:
+        cache = PriceCache()
+        store = SQLiteStore(temp_db, price_cache=cache)
+        eth_rows = [(ms, ts, ex, "ETH/USDT", *rest) for ms, ts, ex, _, *rest in sample_ohlcv_rows]
+        store.insert_ohlcv(sample_ohlcv_rows[:2] + eth_rows)
+
+        first = store.load_prices(["BTC/USDT", "ETH/USDT"], "1h", "binance")
+        first.loc[0, "price"] = -1.0
+        again = store.load_prices(["ETH/USDT", "BTC/USDT"], "1h", "binance")
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert again["price"].tolist() == [42050.0, 42150.0, 42050.0, 42150.0, 42200.0]
+
+        store.insert_ohlcv(sample_ohlcv_rows[2:])
+        assert len(store.load_prices(["BTC/USDT", "ETH/USDT"], "1h", "binance")) == 6
+        store.delete_for_key("binance", "ETH/USDT", "1h")
+        assert len(store.load_prices(["BTC/USDT", "ETH/USDT"], "1h", "binance")) == 3
+        assert (cache.hits, cache.misses) == (1, 3)
+
+        tiny = PriceCache(max_bytes=1)
+        tiny.put("key", ((1, 1),), again)
+        assert tiny.get("key", ((1, 1),)) is None
+
+    def test_price_cache_misses_for_recreated_database(self, temp_db: str, sample_ohlcv_rows: List[tuple]) -> None:
+        cache = PriceCache()
+        store = SQLiteStore(temp_db, price_cache=cache)
+        store.insert_ohlcv(sample_ohlcv_rows[:1])
+        assert store.load_prices(["BTC/USDT"], "1h", "binance")["price"].tolist() == [42050.0]
+        store.close()
+        for path in Path(temp_db).parent.glob(Path(temp_db).name + "*"):
+            path.unlink()
+
+        recreated = SQLiteStore(temp_db, price_cache=cache)
+        recreated.insert_ohlcv([(*sample_ohlcv_rows[0][:8], 999.0, sample_ohlcv_rows[0][9])])
+        assert recreated.load_prices(["BTC/USDT"], "1h", "binance")["price"].tolist() == [999.0]
+        assert (cache.hits, cache.misses) == (0, 2)
+
+    def test_price_cache_reads_snapshots_across_processes(
+        self, temp_db: str, tmp_path: Path, sample_ohlcv_rows: List[tuple]
+    ) -> None:
+        pytest.importorskip("pyarrow")
+        SQLiteStore(temp_db).insert_ohlcv(sample_ohlcv_rows)
+        writer = SQLiteStore(temp_db, price_cache=PriceCache(cache_dir=tmp_path))
+        expected = writer.load_prices(["BTC/USDT"], "1h", "binance")
+
+        reader_cache = PriceCache(cache_dir=tmp_path)
+        reader = SQLiteStore(temp_db, price_cache=reader_cache)
+        pd.testing.assert_frame_equal(reader.load_prices(["BTC/USDT"], "1h", "binance"), expected)
+        assert reader_cache.hits == 1
+
     def test_price_stores_close_value(self, store: SQLiteStore, sample_ohlcv_rows: List[tuple]) -> None:
         store.insert_ohlcv(sample_ohlcv_rows[:1])
 
@@ -484,6 +1082,40 @@ class TestValidation:
         assert r.gap_count >= 1
         assert r.status == "WARN"
 
+    def test_find_gaps_reports_missing_runs(self, store: SQLiteStore) -> None:
+        """Verify find_gaps returns each missing run bounded by stored candles."""
+        hour = 3_600_000
+        rows = [
+            (1704067200000 + h * hour, "", "binance", "BTC/USDT", "1h", 100, 101, 99, 100.5, 10)
+            for h in (0, 1, 4, 5, 9)
+        ]
+        store.insert_ohlcv(rows)
+
+        gaps = store.find_gaps("binance", "BTC/USDT", "1h")
+
+        assert [(g.after_ms, g.before_ms, g.missing_bars) for g in gaps] == [
+            (1704067200000 + hour, 1704067200000 + 4 * hour, 2),
+            (1704067200000 + 5 * hour, 1704067200000 + 9 * hour, 3),
+        ]
+        assert store.find_gaps("binance", "BTC/USDT", "1h", start_ms=1704067200000 + 4 * hour)[0].missing_bars == 3
+
+    def test_validate_workers_match_in_process_results(self, store: SQLiteStore) -> None:
+        """Verify series validated in worker processes report the same results, in order."""
+        hour = 3_600_000
+        for symbol, hours in [("BTC/USDT", (0, 1, 4, 5, 9)), ("ETH/USDT", (0, 2, 3)), ("SOL/USDT", (0, 1, 2))]:
+            store.insert_ohlcv(
+                [(1704067200000 + h * hour, "", "binance", symbol, "1h", 100, 101, 99, 100.5, 10) for h in hours]
+            )
+
+        results = store.validate(workers=1)
+
+        assert [(r.symbol, r.rows, r.gap_count, r.largest_gap_bars, r.status) for r in results] == [
+            ("BTC/USDT", 5, 5, 3, "WARN"),
+            ("ETH/USDT", 3, 1, 1, "WARN"),
+            ("SOL/USDT", 3, 0, 0, "PASS"),
+        ]
+        assert store.validate(workers=2) == results
+
     def test_validate_detects_non_positive_price(self, store: SQLiteStore) -> None:
         """Verify validation flags non-positive price."""
         rows = [
@@ -514,6 +1146,101 @@ class TestValidation:
 # ---------------------------------------------------------------------------
 
 
+class TestDeriveTimeframe:
+    @staticmethod
+    def _minute_rows(start_ms: int, minutes: range) -> List[tuple]:
+        return [
+            (start_ms + m * 60_000, "", "binance", "BTC/USDT", "1m", 100 + m, 101 + m, 99 + m, 100.5 + m, 1.0)
+            for m in minutes
+        ]
+
+    def test_derive_aggregates_complete_buckets_incrementally(self, store: SQLiteStore) -> None:
+        """Verify OHLCV aggregation, skipped trailing bucket, and incremental runs."""
+        start = 1704067200000  # 2024-01-01T00:00:00Z
+        store.insert_ohlcv(self._minute_rows(start, range(0, 150)))
+
+        assert store.derive_timeframe("binance", "BTC/USDT", "1m", "1h") == 2
+        conn = sqlite3.connect(store.db_path)
+        rows = conn.execute(
+            "SELECT milliseconds, timestamp, open, high, low, price, volume FROM price_data "
+            "WHERE timeframe = '1h' ORDER BY milliseconds"
+        ).fetchall()
+        conn.close()
+        assert rows == [
+            (start, "2024-01-01T00:00:00Z", 100, 160, 99, 159.5, 60.0),
+            (start + 3_600_000, "2024-01-01T01:00:00Z", 160, 220, 159, 219.5, 60.0),
+        ]
+
+        store.insert_ohlcv(self._minute_rows(start, range(150, 180)))
+        assert store.derive_timeframe("binance", "BTC/USDT", "1m", "1h", chunk_size=7) == 1
+        assert store.get_max_timestamp("binance", "BTC/USDT", "1h") == start + 2 * 3_600_000
+
+    def test_derive_rejects_unaligned_timeframes(self, store: SQLiteStore) -> None:
+        """Verify targets that are not whole base candles raise ValueError."""
+        with pytest.raises(ValueError):
+            store.derive_timeframe("binance", "BTC/USDT", "1h", "30m")
+        with pytest.raises(ValueError):
+            store.derive_timeframe("binance", "BTC/USDT", "3d", "1w")
+
+
+class TestSyncPlanner:
+    def test_plan_sync_prefers_archives_for_long_dense_ranges(self) -> None:
+        """Verify years of 1m candles go to archives with only today's tail on the API."""
+        from datetime import date
+        from data_fetcher.planner import plan_sync
+
+        since = 1577836800000  # 2020-01-01T00:00:00Z
+        until = 1704153600000 + 3_600_000  # 2024-01-02T01:00:00Z
+        plan = plan_sync("binance", "BTC/USDT", "1m", since, until, today=date(2024, 1, 2))
+
+        assert [e.source for e in plan.estimates] == ["api", "archive+api"]
+        assert plan.chosen.source == "archive+api"
+        assert plan.chosen.archive_until == date(2024, 1, 1)
+        assert plan.chosen.requests < plan.estimates[0].requests
+
+    def test_plan_sync_prefers_api_for_sparse_timeframes(self) -> None:
+        """Verify monthly candles and non-Binance exchanges stay on the API."""
+        from datetime import date
+        from data_fetcher.planner import plan_sync
+
+        since = 1502928000000  # 2017-08-17T00:00:00Z
+        until = 1704067200000  # 2024-01-01T00:00:00Z
+        plan = plan_sync("binance", "BTC/USDT", "1M", since, until, today=date(2024, 6, 1))
+        # The archive publishes monthly candles as 1mo, so 1M never plans archives.
+        assert [e.source for e in plan.estimates] == ["api"]
+        assert plan.chosen.requests == 1
+
+        plan = plan_sync("kraken", "BTC/USD", "1m", since, until)
+        assert [e.source for e in plan.estimates] == ["api"]
+
+
+    def test_plan_sync_uses_listing_manifest_and_missing_cache(self, store: SQLiteStore) -> None:
+        """Verify stored state trims the archive plan the way ingestion will."""
+        from datetime import date
+        from data_fetcher.planner import plan_sync
+
+        listed = 1686787200000  # 2023-06-15T00:00:00Z
+        store.upsert_listings([SymbolListing("binance", "BTC/USDT", "1h", listed, "since_zero", listed)])
+        store.record_archive_files(
+            [ArchiveFile("binance", "BTC/USDT", "1h", "monthly", "2023-06", 1, "sha", 384, listed)]
+        )
+        july_end_ms = 1690848000000  # 2023-08-01T00:00:00Z
+        store.record_missing_archives("binance", "BTC/USDT", "1h", [("monthly", "2023-07", july_end_ms)])
+
+        since = 1577836800000  # 2020-01-01T00:00:00Z
+        until = 1704153600000 + 3_600_000  # 2024-01-02T01:00:00Z
+        plan = plan_sync("binance", "BTC/USDT", "1h", since, until, today=date(2024, 1, 2), store=store)
+
+        assert plan.since_ms == listed
+        hybrid = plan.estimates[1]
+        # 2023-08 .. 2024-01 from archives; July's 744 candles and today's 2 from the API.
+        assert hybrid.requests == 6 + 1
+        assert plan.estimates[0].requests == 5  # 4826 hourly candles from the listing date
+
+        unplanned = plan_sync("binance", "BTC/USDT", "1h", since, until, today=date(2024, 1, 2))
+        assert unplanned.estimates[1].requests > hybrid.requests
+
+
 class TestSymbolFiltering:
     @patch("data_fetcher.providers.crypto.create_exchange")
     def test_get_symbols_quote_filter(self, mock_create: Mock) -> None:
@@ -625,6 +1352,82 @@ class TestFetchLoop:
         )
         assert [row[0] for row in candles] == [0, 3_600_000]
 
+    @patch("data_fetcher.providers.crypto.create_exchange")
+    def test_iter_ohlcv_pages_yields_each_page(self, mock_create: Mock) -> None:
+        """Verify the generator API hands back one page per request."""
+        mock_exchange = Mock()
+        mock_exchange.fetch_ohlcv.side_effect = [
+            [[i * 3600000, 100.0, 101.0, 99.0, 100.5, 10.0] for i in range(1000)],
+            [[(i + 1000) * 3600000, 101.0, 102.0, 100.0, 101.5, 15.0] for i in range(500)],
+        ]
+        mock_create.return_value = mock_exchange
+
+        from data_fetcher.providers.crypto import CryptoDataFetcher
+
+        fetcher = CryptoDataFetcher("test")
+        pages = list(fetcher.iter_ohlcv_pages("BTC/USDT", "1h", since=0, limit=1000))
+        assert [len(page) for page in pages] == [1000, 500]
+
+    @staticmethod
+    def _listing_exchange(listing_ms: int, interval_ms: int, windowed: bool) -> Mock:
+        """Mock exchange with contiguous candles from ``listing_ms`` onwards.
+
+        Windowed exchanges only answer within ``since + limit`` bars, like
+        Coinbase; the others return the first candles at or after ``since``.
+        Neither honors ``since=0``.
+        """
+        now_ms = 1767225600000
+
+        def fetch_ohlcv(symbol, timeframe, since=None, limit=None):
+            if since == 0:
+                return []
+            start = max(since, listing_ms)
+            start += -start % interval_ms
+            if windowed and start >= since + limit * interval_ms:
+                return []
+            stop = min(now_ms, start + limit * interval_ms)
+            return [[ts, 1.0, 1.0, 1.0, 1.0, 1.0] for ts in range(start, stop, interval_ms)]
+
+        mock_exchange = Mock()
+        mock_exchange.milliseconds.return_value = now_ms
+        mock_exchange.fetch_ohlcv.side_effect = fetch_ohlcv
+        return mock_exchange
+
+    @pytest.mark.parametrize("windowed", [False, True])
+    @patch("data_fetcher.providers.crypto.create_exchange")
+    def test_fetch_earliest_timestamp_binary_search(self, mock_create: Mock, windowed: bool) -> None:
+        """Verify the probe search finds a 2021 listing exactly in few requests."""
+        listing_ms = 1618228800000  # 2021-04-12T12:00:00Z
+        mock_exchange = self._listing_exchange(listing_ms, 3_600_000, windowed)
+        mock_create.return_value = mock_exchange
+
+        from data_fetcher.providers.crypto import CryptoDataFetcher
+
+        fetcher = CryptoDataFetcher("test")
+        ts, method = fetcher.fetch_earliest_timestamp("NEW/USDT", "1h")
+
+        assert (ts, method) == (listing_ms, "binary_search")
+        assert mock_exchange.fetch_ohlcv.call_count <= 20
+
+    @patch("data_fetcher.providers.crypto.create_exchange")
+    def test_shared_rate_limiter_disables_ccxt_throttle(self, mock_create: Mock) -> None:
+        """Verify fetchers sharing a limiter reserve request slots through it."""
+        mock_exchange = Mock()
+        mock_exchange.rateLimit = 50
+        mock_exchange.fetch_ohlcv.return_value = [[0, 100.0, 101.0, 99.0, 100.5, 10.0]]
+        mock_create.return_value = mock_exchange
+
+        from data_fetcher.providers.crypto import CryptoDataFetcher, RateLimiter
+
+        limiter = RateLimiter.for_exchange(mock_exchange)
+        assert limiter.interval_seconds == 0.05
+        limiter.wait = Mock()
+        fetcher = CryptoDataFetcher("test", rate_limiter=limiter)
+        fetcher.fetch_ohlcv("BTC/USDT", "1h", since=0, limit=1000)
+
+        assert mock_exchange.enableRateLimit is False
+        assert limiter.wait.call_count == 1
+
 
 # ---------------------------------------------------------------------------
 # Legacy CSV Cache Tests
@@ -642,6 +1445,30 @@ class DummyDataFetcher(BaseDataFetcher):
         return []
 
 
+class TestMarketsCache:
+    def test_create_exchange_reuses_cached_markets(self, tmp_path: Path) -> None:
+        """Verify markets are downloaded once and then loaded from disk."""
+        markets = {
+            "BTC/USDT": {
+                "id": "BTCUSDT", "symbol": "BTC/USDT", "base": "BTC", "quote": "USDT",
+                "active": True, "type": "spot", "spot": True, "precision": {}, "limits": {},
+            },
+        }
+
+        def fake_load_markets(exchange, reload=False, params={}):
+            exchange.set_markets(markets)
+            return exchange.markets
+
+        with patch.object(ccxt.binance, "load_markets", autospec=True, side_effect=fake_load_markets) as load:
+            create_exchange("binance", markets_cache_dir=tmp_path)
+            cached = create_exchange("binance", markets_cache_dir=tmp_path)
+            assert load.call_count == 1
+            assert cached.market("BTC/USDT")["id"] == "BTCUSDT"
+
+            create_exchange("binance", refresh_markets=True, markets_cache_dir=tmp_path)
+            assert load.call_count == 2
+
+
 class TestLegacyCsvCacheNaming:
     def test_build_actual_date_filename_uses_returned_data_dates(self) -> None:
         fetcher = DummyDataFetcher()
@@ -776,6 +1603,31 @@ class TestCLI:
         assert "2017-08-17T04:00:00.000Z" in result.stdout
         assert mock_exchange.fetch_ohlcv.call_count == 2
 
+    @patch("data_fetcher.providers.crypto.create_exchange")
+    def test_start_dates_command_reuses_listing_catalog(self, mock_create: Mock, temp_db: str) -> None:
+        """Verify start-dates with --db-path only probes symbols missing from the catalog."""
+        mock_exchange = Mock()
+        mock_exchange.markets = {}
+        mock_exchange.fetch_ohlcv.return_value = [
+            [1502942400000, 100.0, 101.0, 99.0, 100.5, 10.0],
+        ]
+        mock_exchange.milliseconds.return_value = 1704067200000
+        mock_exchange.iso8601.return_value = "2017-08-17T04:00:00.000Z"
+        mock_create.return_value = mock_exchange
+        args = ["start-dates", "--symbols", "BTC/USDT,ETH/USDT", "--db-path", temp_db]
+
+        first = runner.invoke(app, args)
+        assert first.exit_code == 0
+        assert mock_exchange.fetch_ohlcv.call_count == 2
+
+        second = runner.invoke(app, args)
+        assert second.exit_code == 0
+        assert "ETH/USDT" in second.stdout
+        assert mock_exchange.fetch_ohlcv.call_count == 2
+
+        runner.invoke(app, args + ["--refresh-listings"])
+        assert mock_exchange.fetch_ohlcv.call_count == 4
+
     @patch("data_fetcher.providers.crypto.create_exchange")
     def test_crypto_start_dates_command_discovers_symbols(self, mock_create: Mock) -> None:
         """Verify provider-scoped start-dates can discover symbols by filters."""
@@ -812,6 +1664,407 @@ class TestCLI:
         assert "BTC/EUR" not in result.stdout
         assert mock_exchange.fetch_ohlcv.call_count == 2
 
+    @patch("data_fetcher.providers.crypto.create_exchange")
+    def test_fetch_command_with_workers(self, mock_create: Mock, temp_db: str) -> None:
+        """Verify --workers fetches symbols concurrently into one store."""
+        def make_exchange(*_args, **_kwargs) -> Mock:
+            mock_exchange = Mock()
+            mock_exchange.markets = {}
+            mock_exchange.rateLimit = 0
+            mock_exchange.fetch_ohlcv.return_value = [
+                [1704067200000, 100.0, 101.0, 99.0, 100.5, 10.0],
+                [1704070800000, 101.0, 102.0, 100.0, 101.5, 15.0],
+            ]
+            mock_exchange.iso8601.side_effect = lambda ms: str(ms)
+            return mock_exchange
+
+        mock_create.side_effect = make_exchange
+
+        result = runner.invoke(
+            app,
+            [
+                "fetch",
+                "--symbols",
+                "BTC/USDT,ETH/USDT,SOL/USDT",
+                "--since",
+                "1704067200000",
+                "--until",
+                "1704070800000",
+                "--db-path",
+                temp_db,
+                "--sleep-seconds",
+                "0",
+                "--workers",
+                "3",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert result.stdout.count("Inserted 2 rows") == 3
+        inventory = SQLiteStore(temp_db).get_inventory()
+        assert sorted(r.symbol for r in inventory) == ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+
+    @patch("data_fetcher.providers.crypto.create_exchange")
+    def test_repair_command_fetches_only_gap_windows(self, mock_create: Mock, temp_db: str) -> None:
+        """Verify repair merges nearby gaps into one request and reports them closed."""
+        hour = 3_600_000
+        start = 1704067200000
+        SQLiteStore(temp_db).insert_ohlcv([
+            (start + h * hour, "", "binance", "BTC/USDT", "1h", 100, 101, 99, 100.5, 10)
+            for h in (0, 1, 2, 5, 6, 9)
+        ])
+        mock_exchange = Mock()
+        mock_exchange.markets = {}
+        mock_exchange.fetch_ohlcv.return_value = [
+            [start + h * hour, 100.0, 101.0, 99.0, 100.5, 10.0] for h in range(3, 9)
+        ]
+        mock_exchange.iso8601.side_effect = lambda ms: str(ms)
+        mock_create.return_value = mock_exchange
+
+        result = runner.invoke(app, ["repair", "--db-path", temp_db, "--sleep-seconds", "0"])
+
+        assert result.exit_code == 0
+        assert "2 gaps, 4 missing bars, 1 fetch windows" in result.stdout
+        assert result.stdout.count("closed") == 2
+        assert "Closed 2 of 2 gaps" in result.stdout
+        mock_exchange.fetch_ohlcv.assert_called_once_with(
+            "BTC/USDT", "1h", since=start + 2 * hour + 1, limit=7
+        )
+        assert SQLiteStore(temp_db).find_gaps("binance", "BTC/USDT", "1h") == []
+
+    def test_derive_command(self, temp_db: str) -> None:
+        """Verify derive builds each target timeframe from stored 1m candles."""
+        start = 1704067200000
+        SQLiteStore(temp_db).insert_ohlcv(TestDeriveTimeframe._minute_rows(start, range(0, 24 * 60)))
+
+        result = runner.invoke(app, ["derive", "--db-path", temp_db, "--targets", "1d,1h,4h"])
+
+        assert result.exit_code == 0
+        assert "binance BTC/USDT: 1h +24, 4h +6, 1d +1" in result.stdout
+        inventory = {r.timeframe: r.rows for r in SQLiteStore(temp_db).get_inventory()}
+        assert inventory == {"1m": 1440, "1h": 24, "4h": 6, "1d": 1}
+
+    @patch("data_fetcher.cli.ingest_binance_archives")
+    @patch("data_fetcher.providers.crypto.create_exchange")
+    def test_sync_command_runs_archive_then_api_tail(
+        self,
+        mock_create: Mock,
+        mock_ingest: Mock,
+        temp_db: str,
+    ) -> None:
+        """Verify sync prints both estimates and fetches only the tail after archives."""
+        from datetime import date
+        from data_fetcher.models import SourceEstimate, SyncPlan
+        from data_fetcher.providers.binance_archive import ArchiveIngestResult
+
+        minute = 60_000
+        since = 1704067200000  # 2024-01-01T00:00:00Z
+        archived_max = since + 2 * minute
+
+        def ingest(**kwargs: object) -> ArchiveIngestResult:
+            SQLiteStore(temp_db).insert_ohlcv([
+                (since + m * minute, "", "binance", "BTC/USDT", "1m", 100, 101, 99, 100.5, 10)
+                for m in range(3)
+            ])
+            return ArchiveIngestResult(symbol="BTC/USDT", rows_inserted=3, candles_seen=3)
+
+        mock_ingest.side_effect = ingest
+        mock_exchange = Mock()
+        mock_exchange.markets = {}
+        mock_exchange.fetch_ohlcv.return_value = [
+            [archived_max + minute, 100.0, 101.0, 99.0, 100.5, 10.0],
+        ]
+        mock_exchange.iso8601.side_effect = lambda ms: str(ms)
+        mock_exchange.parse8601.return_value = since
+        mock_create.return_value = mock_exchange
+
+        args = [
+            "sync", "--symbols", "BTC/USDT", "--timeframe", "1m",
+            "--since", "2024-01-01", "--until", str(archived_max + minute),
+            "--db-path", temp_db, "--sleep-seconds", "0",
+        ]
+        dry = runner.invoke(app, args + ["--dry-run"])
+        assert dry.exit_code == 0
+        assert "* api " in dry.stdout
+        assert "archive+api" in dry.stdout
+        assert mock_ingest.call_count == 0
+
+        archive = SourceEstimate("archive+api", 2, 1000, 0.1, archive_until=date(2024, 1, 1))
+        forced = SyncPlan("BTC/USDT", "1m", since, archived_max + minute, [archive], archive)
+        with patch("data_fetcher.cli.plan_sync", return_value=forced):
+            result = runner.invoke(app, args)
+
+        assert result.exit_code == 0, result.stdout
+        assert "Inserted 4 rows via archive+api" in result.stdout
+        mock_exchange.fetch_ohlcv.assert_called_once()
+        assert mock_exchange.fetch_ohlcv.call_args.kwargs["since"] == archived_max + 1
+
+    def test_migrate_command(self, temp_db: str, sample_ohlcv_rows: List[tuple]) -> None:
+        """Verify migrate upgrades a v1 database once and is a no-op afterwards."""
+        _create_v1_db(temp_db, sample_ohlcv_rows)
+
+        result = runner.invoke(app, ["migrate", "--db-path", temp_db, "--chunk-rows", "2"])
+        assert result.exit_code == 0
+        assert "schema v1" in result.stdout
+        assert "Copied 3/3 rows" in result.stdout
+        assert "Migrated to schema v7" in result.stdout
+
+        rerun = runner.invoke(app, ["migrate", "--db-path", temp_db])
+        assert "Already on the current schema." in rerun.stdout
+
+    @patch("data_fetcher.providers.crypto.create_exchange")
+    def test_fetch_command_commits_each_page(self, mock_create: Mock, temp_db: str) -> None:
+        """Verify fetch inserts page by page instead of once per symbol."""
+        mock_exchange = Mock()
+        mock_exchange.markets = {}
+        mock_exchange.fetch_ohlcv.side_effect = [
+            [[i * 3600000, 100.0, 101.0, 99.0, 100.5, 10.0] for i in range(1, 1001)],
+            [[(i + 1000) * 3600000, 101.0, 102.0, 100.0, 101.5, 15.0] for i in range(1, 501)],
+        ]
+        mock_exchange.iso8601.side_effect = lambda ms: str(ms)
+        mock_create.return_value = mock_exchange
+
+        with patch.object(SQLiteStore, "insert_ohlcv", autospec=True, side_effect=SQLiteStore.insert_ohlcv) as spy:
+            result = runner.invoke(
+                app,
+                [
+                    "fetch",
+                    "--symbols",
+                    "BTC/USDT",
+                    "--since",
+                    "1",
+                    "--until",
+                    "99999999999",
+                    "--db-path",
+                    temp_db,
+                    "--sleep-seconds",
+                    "0",
+                ],
+            )
+
+        assert result.exit_code == 0
+        assert [len(call.args[1]) for call in spy.call_args_list] == [1000, 500]
+        assert "Inserted 1500 rows (1500 candles fetched)" in result.stdout
+
+    @patch("data_fetcher.providers.crypto.create_exchange")
+    def test_fetch_workers_surface_write_errors(self, mock_create: Mock, temp_db: str) -> None:
+        """Verify a failing insert ends a --workers run with its error instead of hanging."""
+        mock_exchange = Mock()
+        mock_exchange.markets = {}
+        mock_exchange.rateLimit = 0
+        mock_exchange.fetch_ohlcv.return_value = [[1704067200000, 100.0, 101.0, 99.0, 100.5, 10.0]]
+        mock_exchange.iso8601.side_effect = lambda ms: str(ms)
+        mock_create.return_value = mock_exchange
+        symbols = ",".join(f"S{i}/USDT" for i in range(12))
+        outcome: List[object] = []
+
+        def invoke() -> None:
+            outcome.append(
+                runner.invoke(
+                    app,
+                    ["fetch", "--symbols", symbols, "--since", "1704067200000", "--db-path", temp_db,
+                     "--sleep-seconds", "0", "--workers", "2"],
+                )
+            )
+
+        with patch.object(SQLiteStore, "insert_ohlcv", side_effect=sqlite3.OperationalError("disk I/O error")):
+            thread = threading.Thread(target=invoke, daemon=True)
+            thread.start()
+            thread.join(timeout=30)
+
+        assert not thread.is_alive()
+        assert isinstance(outcome[0].exception, sqlite3.OperationalError)
+
+    @patch("data_fetcher.providers.crypto.create_exchange")
+    def test_fetch_overwrite_keeps_symbols_not_reached(
+        self, mock_create: Mock, temp_db: str, sample_ohlcv_rows: List[tuple]
+    ) -> None:
+        """Verify --overwrite deletes a symbol only when its refetch reports back."""
+        eth_rows = [(ms, ts, ex, "ETH/USDT", *rest) for ms, ts, ex, _, *rest in sample_ohlcv_rows]
+        SQLiteStore(temp_db).insert_ohlcv(sample_ohlcv_rows + eth_rows)
+        mock_exchange = Mock()
+        mock_exchange.markets = {}
+        # A malformed candle fails the symbol.
+        mock_exchange.fetch_ohlcv.return_value = [["bad", 100.0, 101.0, 99.0, 100.5, 10.0]]
+        mock_create.return_value = mock_exchange
+
+        result = runner.invoke(
+            app,
+            [
+                "fetch",
+                "--symbols",
+                "BTC/USDT,ETH/USDT",
+                "--since",
+                "1704067200000",
+                "--db-path",
+                temp_db,
+                "--sleep-seconds",
+                "0",
+                "--overwrite",
+                "--fail-fast",
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert "Deleted 3 existing rows (--overwrite)" in result.stdout
+        assert [(r.symbol, r.rows) for r in SQLiteStore(temp_db).get_inventory()] == [("ETH/USDT", 3)]
+
+    @patch("data_fetcher.providers.crypto.create_async_exchange")
+    @patch("data_fetcher.providers.crypto.create_exchange")
+    def test_fetch_command_async(
+        self, mock_create: Mock, mock_create_async: Mock, temp_db: str
+    ) -> None:
+        """Verify --async paginates through the ccxt.async_support client."""
+        mock_exchange = Mock()
+        mock_exchange.markets = {}
+        mock_exchange.iso8601.side_effect = lambda ms: str(ms)
+        mock_create.return_value = mock_exchange
+
+        async_exchange = Mock()
+        async_exchange.load_markets = AsyncMock()
+        async_exchange.close = AsyncMock()
+        async_exchange.fetch_ohlcv = AsyncMock(
+            return_value=[
+                [1704067200000, 100.0, 101.0, 99.0, 100.5, 10.0],
+                [1704070800000, 101.0, 102.0, 100.0, 101.5, 15.0],
+            ]
+        )
+        mock_create_async.return_value = async_exchange
+
+        result = runner.invoke(
+            app,
+            [
+                "fetch",
+                "--symbols",
+                "BTC/USDT,ETH/USDT",
+                "--since",
+                "1704067200000",
+                "--db-path",
+                temp_db,
+                "--sleep-seconds",
+                "0",
+                "--async",
+                "--workers",
+                "8",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert result.stdout.count("Inserted 2 rows") == 2
+        assert async_exchange.fetch_ohlcv.await_count == 2
+        async_exchange.close.assert_awaited_once()
+        assert mock_exchange.fetch_ohlcv.call_count == 0
+
+    @patch("data_fetcher.providers.crypto.read_markets_cache", return_value=({}, {}))
+    @patch("data_fetcher.providers.crypto.create_async_exchange")
+    @patch("data_fetcher.providers.crypto.create_exchange")
+    def test_fetch_command_async_refreshes_markets_and_closes_on_failure(
+        self, mock_create: Mock, mock_create_async: Mock, mock_cache: Mock, temp_db: str
+    ) -> None:
+        """Verify --async honours --refresh-markets and closes the client when loading markets fails."""
+        mock_exchange = Mock()
+        mock_exchange.markets = {}
+        mock_create.return_value = mock_exchange
+
+        async_exchange = Mock()
+        async_exchange.load_markets = AsyncMock(side_effect=RuntimeError("markets unavailable"))
+        async_exchange.close = AsyncMock()
+        mock_create_async.return_value = async_exchange
+
+        result = runner.invoke(
+            app,
+            [
+                "fetch",
+                "--symbols",
+                "BTC/USDT",
+                "--since",
+                "1704067200000",
+                "--db-path",
+                temp_db,
+                "--sleep-seconds",
+                "0",
+                "--async",
+                "--refresh-markets",
+            ],
+        )
+
+        assert result.exit_code != 0
+        async_exchange.load_markets.assert_awaited_once()
+        async_exchange.close.assert_awaited_once()
+
+    @patch("data_fetcher.providers.crypto.create_async_exchange")
+    @patch("data_fetcher.providers.crypto.create_exchange")
+    def test_fetch_command_async_fail_fast_cancels_waiting_symbols(
+        self, mock_create: Mock, mock_create_async: Mock, temp_db: str
+    ) -> None:
+        """Verify --fail-fast with --async stops symbols that have not started."""
+        mock_exchange = Mock()
+        mock_exchange.markets = {}
+        mock_create.return_value = mock_exchange
+
+        async_exchange = Mock()
+        async_exchange.load_markets = AsyncMock()
+        async_exchange.close = AsyncMock()
+        # A malformed candle fails the symbol; request errors only end paging.
+        async_exchange.fetch_ohlcv = AsyncMock(return_value=[["bad", 100.0, 101.0, 99.0, 100.5, 10.0]])
+        mock_create_async.return_value = async_exchange
+
+        result = runner.invoke(
+            app,
+            [
+                "fetch",
+                "--symbols",
+                "BTC/USDT,ETH/USDT,SOL/USDT",
+                "--since",
+                "1704067200000",
+                "--db-path",
+                temp_db,
+                "--sleep-seconds",
+                "0",
+                "--async",
+                "--fail-fast",
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert async_exchange.fetch_ohlcv.await_count == 1
+        assert "ETH/USDT" not in result.stdout
+
+    @patch("data_fetcher.providers.crypto.create_async_exchange")
+    @patch("data_fetcher.providers.crypto.create_exchange")
+    def test_start_dates_command_async(self, mock_create: Mock, mock_create_async: Mock) -> None:
+        """Verify start-dates --async keeps output in symbol order."""
+        mock_exchange = Mock()
+        mock_exchange.markets = {}
+        mock_exchange.iso8601.side_effect = lambda ms: f"iso-{ms}"
+        mock_create.return_value = mock_exchange
+
+        first_candles = {
+            "BTC/USDT": [[1502942400000, 1.0, 1.0, 1.0, 1.0, 1.0]],
+            "ETH/USDT": [[1502946000000, 1.0, 1.0, 1.0, 1.0, 1.0]],
+        }
+
+        async def fetch_ohlcv(symbol, timeframe, since=None, limit=None):
+            return first_candles[symbol]
+
+        async_exchange = Mock()
+        async_exchange.load_markets = AsyncMock()
+        async_exchange.close = AsyncMock()
+        async_exchange.milliseconds.return_value = 1704067200000
+        async_exchange.fetch_ohlcv = AsyncMock(side_effect=fetch_ohlcv)
+        mock_create_async.return_value = async_exchange
+
+        result = runner.invoke(
+            app,
+            ["start-dates", "--symbols", "BTC/USDT,ETH/USDT", "--async"],
+        )
+
+        assert result.exit_code == 0
+        lines = result.stdout.splitlines()[2:]
+        assert "BTC/USDT" in lines[0] and "iso-1502942400000" in lines[0]
+        assert "ETH/USDT" in lines[1] and "iso-1502946000000" in lines[1]
+        assert mock_exchange.fetch_ohlcv.call_count == 0
+
     @patch("data_fetcher.data.AlpacaDataFetcher")
     def test_alpaca_symbols_command(self, mock_fetcher_cls: Mock) -> None:
         """Verify provider-scoped Alpaca symbols command works."""
@@ -890,12 +2143,17 @@ class TestCLI:
     @patch("data_fetcher.cli.ingest_binance_archives")
     def test_bulk_fetch_command_explicit_symbols(self, mock_ingest: Mock, temp_db: str) -> None:
         """Verify bulk-fetch invokes archive ingestion for explicit symbols."""
-        mock_ingest.return_value = Mock(
+        from data_fetcher.providers.binance_archive import ArchiveIngestResult
+
+        mock_ingest.return_value = ArchiveIngestResult(
+            symbol="BTC/USDT",
             rows_inserted=2,
             candles_seen=2,
             files_downloaded=1,
-            files_cached=0,
-            files_missing=0,
+            download_bytes=2_000_000,
+            download_seconds=1.0,
+            decode_seconds=0.001,
+            write_seconds=0.01,
         )
 
         result = runner.invoke(
@@ -912,11 +2170,17 @@ class TestCLI:
                 "2024-01-31",
                 "--db-path",
                 temp_db,
+                "--download-workers",
+                "4",
+                "--decode-workers",
+                "1",
             ],
         )
 
         assert result.exit_code == 0
         assert mock_ingest.call_count == 2
+        assert mock_ingest.call_args.kwargs["decode_pool"] is None
+        assert "Throughput: download 8.0 MB/s, decode 2,000 candles/s, write 200 rows/s" in result.stdout
         assert "Done. Inserted 4 rows" in result.stdout
 
     @patch("data_fetcher.providers.crypto.create_exchange")